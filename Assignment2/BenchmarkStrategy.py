@@ -1,5 +1,6 @@
 from trading_lib.strategy import Strategy
-from trading_lib.models import MarketDataPoint, Action
+from trading_lib.models import MarketDataPoint
+from trading_lib.signals import BUY, SignalBuffer
 from typing import Set
 from datetime import datetime, timedelta
 
@@ -11,13 +12,11 @@ class BenchmarkStrategy(Strategy):
         super().__init__(quantity)
         self._symbols: Set[str] = set()
     
-    def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
+    def emit_signals(self, tick: MarketDataPoint, signals: SignalBuffer):
         """
         Buy each stock only once on the first tick we see for that symbol.
         """
+        # Already bought this stock otherwise
         if tick.symbol not in self._symbols:
             self._symbols.add(tick.symbol)
-            return [(tick.symbol, self.quantity, tick.price, Action.BUY)]
-        
-        # Already bought this stock
-        return []
\ No newline at end of file
+            signals.emit(tick.symbol, self.quantity, tick.price, BUY)
\ No newline at end of file
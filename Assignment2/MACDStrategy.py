@@ -1,9 +1,22 @@
 from typing import Dict, List
 
 from trading_lib.strategy import Strategy
-from trading_lib.models import MarketDataPoint, Action
+from trading_lib.models import MarketDataPoint
+from trading_lib.signals import BUY, SignalBuffer
 from datetime import datetime, timedelta
 
+class _MACDState:
+    """Per-symbol state, fetched with a single dict lookup per tick."""
+
+    __slots__ = ("prices", "macd_history", "prev_macd", "prev_signal")
+
+    def __init__(self, price: float):
+        self.prices: List[float] = [price]
+        self.macd_history: List[float] = []
+        self.prev_macd = 0.0
+        self.prev_signal = 0.0
+
+
 class MACDStrategy(Strategy):
     """
     Buy if MACD line crosses above signal line
@@ -14,10 +27,11 @@ class MACDStrategy(Strategy):
         self.short_window = short_window
         self.long_window = long_window
         self.signal_window = signal_window
-        self._prices: Dict[str, List[float]] = {}
-        self.macd_history: Dict[str, List[float]] = {}
-        self._prev_macd: Dict[str, float] = {}
-        self._prev_signal: Dict[str, float] = {}
+        self._state: Dict[str, _MACDState] = {}
+
+    @property
+    def macd_history(self) -> Dict[str, List[float]]:
+        return {sym: state.macd_history for sym, state in self._state.items()}
 
     def _calculate_ema(self, prices: List[float], window: int) -> float:
         if len(prices) < window:
@@ -46,50 +60,45 @@ class MACDStrategy(Strategy):
         # Calculate the signal line as the EMA of the MACD
         return self._calculate_ema(macd, self.signal_window)
 
-    def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
+    def emit_signals(self, tick: MarketDataPoint, signals: SignalBuffer):
         sym, price = tick.symbol, tick.price
         
-        if sym not in self._prices:
-            self._prices[sym] = [price]
-            self.macd_history[sym] = []
-            self._prev_macd[sym] = 0.0
-            self._prev_signal[sym] = 0.0
-            return []
+        state = self._state.get(sym)
+        if state is None:
+            self._state[sym] = _MACDState(price)
+            return
         
 
-        self._prices[sym].append(price)
+        state.prices.append(price)
         
-        if len(self._prices[sym]) < self.long_window:
-            self._prices[sym].append(price)
-            return []
+        if len(state.prices) < self.long_window:
+            state.prices.append(price)
+            return
         
-        self._prices[sym] = self._prices[sym][-self.long_window:]
+        state.prices = state.prices[-self.long_window:]
         
-        macd = self._calculate_macd(self._prices[sym])
-        self.macd_history[sym].append(macd)
+        macd = self._calculate_macd(state.prices)
+        state.macd_history.append(macd)
         
         # Wait for enough MACD values to calculate the signal line
-        if len(self.macd_history[sym]) < self.signal_window:
-            self.macd_history[sym].append(macd)
-            return []
+        if len(state.macd_history) < self.signal_window:
+            state.macd_history.append(macd)
+            return
         
         
-        signal = self._calculate_signal(self.macd_history[sym])
+        signal = self._calculate_signal(state.macd_history)
         
         # Only care about crosses above the signal line (no shorting)
-        cross_above = macd > signal and self._prev_macd[sym] <= self._prev_signal[sym]
-        
-        signals = []
+        cross_above = macd > signal and state.prev_macd <= state.prev_signal
+
         # Buy if the MACD line crosses above the signal line
         if cross_above:
-            signals.append((sym, self.quantity, price, Action.BUY))
+            signals.emit(sym, self.quantity, price, BUY)
         
-        self._prev_macd[sym] = macd
-        self._prev_signal[sym] = signal
+        state.prev_macd = macd
+        state.prev_signal = signal
         # Keep only the signal_window MACD values
-        self.macd_history[sym] = self.macd_history[sym][-self.signal_window:]
-        
-        return signals
+        state.macd_history = state.macd_history[-self.signal_window:]
     
 
 if __name__ == "__main__":
@@ -1,8 +1,25 @@
-from typing import Dict, List
+from typing import Dict, Optional
 from datetime import datetime, timedelta
 
 from trading_lib.strategy import Strategy
-from trading_lib.models import MarketDataPoint, Action
+from trading_lib.models import MarketDataPoint
+from trading_lib.signals import BUY, SignalBuffer
+
+class _MovingAverageState:
+    """Per-symbol state, fetched with a single dict lookup per tick."""
+
+    __slots__ = ("short_sma", "long_sma", "prev_short_ma", "prev_long_ma", "prev_short_gt_long")
+
+    def __init__(self, short_sma, long_sma):
+        self.short_sma = short_sma
+        self.long_sma = long_sma
+        # moving averages as of the previous tick; signals compare the averages
+        # of the prices seen before the current one
+        self.prev_short_ma: Optional[float] = None
+        self.prev_long_ma: Optional[float] = None
+        # track previous MA relationship to catch true crossovers
+        self.prev_short_gt_long = False
+
 
 class MovingAverageStrategy(Strategy):
     """
@@ -13,42 +30,38 @@ class MovingAverageStrategy(Strategy):
         super().__init__(quantity)
         self.short_window = short_window
         self.long_window = long_window
-        self._prices: Dict[str, List[float]] = {}
-        # track previous MA relationship to catch true crossovers
-        self._prev_short_gt_long: Dict[str, bool] = {}
+        self._state: Dict[str, _MovingAverageState] = {}
 
-    def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
+    def emit_signals(self, tick: MarketDataPoint, signals: SignalBuffer):
         sym, price = tick.symbol, tick.price
-        
-        if sym not in self._prices:
-            self._prices[sym] = [price]
-            self._prev_short_gt_long[sym] = False
-            return []
-        
-        prev_prices = self._prices[sym]
-        
+
+        self.indicators.update(tick)
+        state = self._state.get(sym)
+        if state is None:
+            state = self._state[sym] = _MovingAverageState(
+                self.indicators.indicator("sma", sym, self.short_window),
+                self.indicators.indicator("sma", sym, self.long_window),
+            )
+            state.prev_short_ma = state.short_sma.value
+            state.prev_long_ma = state.long_sma.value
+            return
+
+        short_ma, long_ma = state.prev_short_ma, state.prev_long_ma
+        state.prev_short_ma = state.short_sma.value
+        state.prev_long_ma = state.long_sma.value
+
         # Wait for enough prices to calculate moving averages
-        if len(prev_prices) < self.long_window:
-            self._prices[sym].append(price)
-            return []
-        
-        short_ma = sum(prev_prices[-self.short_window:]) / self.short_window
-        long_ma = sum(prev_prices[-self.long_window:]) / self.long_window
-        
-        prev_state = self._prev_short_gt_long[sym]
+        if long_ma is None:
+            return
+
+        prev_state = state.prev_short_gt_long
         curr_state = short_ma > long_ma
 
-        signals = []
         # trigger only on transition from False -> True (crossover up)
         if (not prev_state) and curr_state:
-            signals.append((sym, self.quantity, price, Action.BUY))
-        
-        self._prev_short_gt_long[sym] = curr_state
-
-        prev_prices.append(price)
-        self._prices[sym] = prev_prices[-self.long_window:]  # long_window is enough
+            signals.emit(sym, self.quantity, price, BUY)
         
-        return signals
+        state.prev_short_gt_long = curr_state
 
 
 if __name__ == "__main__":
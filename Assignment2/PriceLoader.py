@@ -1,33 +1,164 @@
+import hashlib
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List
+from typing import Callable, List, Optional
 
+import numpy as np
 import pandas as pd
 import requests
 import yfinance as yf
 
-from trading_lib.models import MarketDataPoint
+from trading_lib.data_loader import STORE_METADATA, store_partition_dir
+from trading_lib.tick_series import TickSeries
 
 
 SNP500_URL = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart"
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+MANIFEST_NAME = "manifest.json"
+# Bytes just before the indexed end of a file that are hashed to detect rewrites
+DIGEST_SPAN = 4096
+# Worth retrying: throttled or server-side failures. Other 4xx are permanent.
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def _naive_dates(index) -> np.ndarray:
+    """datetime64 values of a date index; timezone-aware dates keep their wall-clock time."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values
+
+
+def frame_to_ticks(df: pd.DataFrame, ticker: str, column: str = "Close") -> TickSeries:
+    """One ticker's price frame as a TickSeries, straight from the index and column arrays."""
+    prices = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64)
+    dates = _naive_dates(df.index)
+    valid = ~np.isnan(prices)
+    if not valid.all():
+        print(f"Warning: Skipping {int((~valid).sum())} rows of {ticker} without a numeric {column}")
+        dates, prices = dates[valid], prices[valid]
+    return TickSeries(dates, np.zeros(len(prices), dtype=np.uint16), prices, [ticker])
+
+
+def wide_frame_to_ticks(close_df: pd.DataFrame) -> TickSeries:
+    """
+    A wide close frame (one column per ticker, as from `yf.download`) as a
+    TickSeries in date order, tickers in column order within a date.
+    A `yf.download` frame with (field, ticker) columns is reduced to its
+    Close level first. Missing prices are dropped.
+    """
+    if isinstance(close_df.columns, pd.MultiIndex):
+        close_df = close_df["Close"]
+    values = close_df.to_numpy(dtype=np.float64)
+    # row-major nonzero walks each date's tickers before the next date
+    rows, cols = np.nonzero(~np.isnan(values))
+    code_type = np.uint16 if close_df.shape[1] < 2**16 else np.int32
+    return TickSeries(_naive_dates(close_df.index)[rows], cols.astype(code_type), values[rows, cols],
+                      [str(c) for c in close_df.columns])
+
+
+def _tail_digest(path: Path, size: int) -> str:
+    """SHA-256 of the `DIGEST_SPAN` bytes before offset `size` of `path`."""
+    with open(path, "rb") as f:
+        f.seek(max(0, size - DIGEST_SPAN))
+        return hashlib.sha256(f.read(min(size, DIGEST_SPAN))).hexdigest()
+
+
+class DownloadError(Exception):
+    """Raised when fetching a ticker fails; `retryable` marks failures worth another attempt."""
+
+    def __init__(self, ticker: str, reason: str, retryable: bool = True):
+        self.ticker = ticker
+        self.reason = reason
+        self.retryable = retryable
+        super().__init__(f"Failed to download {ticker}: {reason}")
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        assert rate > 0
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until it has accrued if the bucket is empty."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Reserve the token now, even if that leaves the bucket in debt,
+            # so waiting callers are served in the order they arrived
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+
+
+class DownloadManifest:
+    """JSON record of finished tickers in the output directory, rewritten atomically on every update."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: dict = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                self.entries = json.load(f)
+
+    def is_done(self, ticker: str, start_date: str, end_date: str) -> bool:
+        entry = self.entries.get(ticker)
+        return entry is not None and entry["start_date"] == start_date and entry["end_date"] == end_date
+
+    def mark_done(self, ticker: str, **info) -> None:
+        self.entries[ticker] = info
+        self.save()
+
+    def save(self) -> None:
+        # Write a temp file next to the manifest and swap it in, so an
+        # interrupted run never leaves a truncated manifest behind
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.entries, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
 
 
 class PriceLoader:
     """Loads historical price data from Yahoo Finance."""
 
-    def __init__(self, start_date: str, end_date: str, output_dir: str = "data/prices"):
+    def __init__(self, start_date: str, end_date: str, output_dir: str = "data/prices",
+                 base_url: str = YAHOO_CHART_URL):
         self.start_date = start_date
         self.end_date = end_date
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.base_url = base_url.rstrip("/")
         self.tickers: List[str] = []
 
     def _fetch_snp500_tickers(self) -> None:
         """Fetch list of S&P 500 tickers from Wikipedia."""
         # Add User-Agent header to avoid 403 error
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(SNP500_URL, headers=headers)
+        response = requests.get(SNP500_URL, headers=HEADERS)
         response.raise_for_status()
         
         tables = pd.read_html(response.text)
@@ -103,8 +234,8 @@ class PriceLoader:
 
 
             
-    def save_data_to_file(self, ticker: str, hist_prices: pd.DataFrame, filetype: str = "csv") -> None:
-        """Save ONE ticker's cleaned data (single 'Close' column)."""
+    def save_data_to_file(self, ticker: str, hist_prices: pd.DataFrame, filetype: str = "csv") -> bool:
+        """Save ONE ticker's cleaned data (single 'Close' column); returns whether the file was written."""
         if "Close" not in hist_prices.columns or hist_prices.shape[1] != 1:
             hist_prices = hist_prices.iloc[:, [0]].copy()
             hist_prices.columns = ["Close"]
@@ -120,8 +251,10 @@ class PriceLoader:
             else:
                 raise ValueError(f"Invalid filetype: {filetype}")
             print(f"Saved {ticker} → {output_file}")
+            return True
         except Exception as e:
             print(f"Error saving {ticker}: {e}")
+            return False
 
     def download_batch(self, batch: list[str], filetype="csv") -> None:
         try:
@@ -172,59 +305,277 @@ class PriceLoader:
 
         print("\n All batches complete")
 
-    def load_ticker_from_csv(self, ticker: str) -> List[MarketDataPoint]:
-        """Load ticker data from CSV file and convert to MarketDataPoint objects."""
-        csv_file = self.output_dir / f"{ticker}.csv"
-        
-        # Read CSV file
-        df = pd.read_csv(csv_file, index_col=0, parse_dates=True)
-        
-        hist_prices: List[MarketDataPoint] = []
-        
-        # Iterate through DataFrame rows and convert to MarketDataPoint
-        for index, row in df.iterrows():
+    def fetch_chart(self, ticker: str, timeout: float = 10.0, start_date: Optional[str] = None) -> pd.DataFrame:
+        """One request to the chart endpoint; daily closes indexed by exchange-local date."""
+        period1 = int(pd.Timestamp(start_date or self.start_date, tz="UTC").timestamp())
+        period2 = int(pd.Timestamp(self.end_date, tz="UTC").timestamp())
+        try:
+            response = requests.get(
+                f"{self.base_url}/{ticker}",
+                params={"period1": period1, "period2": period2, "interval": "1d"},
+                headers=HEADERS,
+                timeout=timeout,
+            )
+        except (requests.Timeout, requests.ConnectionError) as e:
+            raise DownloadError(ticker, f"{type(e).__name__}: {e}")
+        if response.status_code != 200:
+            raise DownloadError(ticker, f"HTTP {response.status_code}",
+                                retryable=response.status_code in RETRY_STATUS)
+
+        chart = response.json()["chart"]
+        if chart.get("error") or not chart.get("result"):
+            raise DownloadError(ticker, str(chart.get("error") or "empty result"), retryable=False)
+        result = chart["result"][0]
+        timestamps = result.get("timestamp") or []
+        closes = result["indicators"]["quote"][0].get("close") if timestamps else []
+        tz = result.get("meta", {}).get("exchangeTimezoneName", "UTC")
+        dates = pd.to_datetime(timestamps, unit="s", utc=True).tz_convert(tz).tz_localize(None).normalize()
+        return pd.DataFrame({"Close": pd.Series(closes, dtype=float).to_numpy()}, index=pd.Index(dates, name="Date"))
+
+    def fetch_with_retries(self, ticker: str, limiter: Optional[TokenBucket] = None, timeout: float = 10.0,
+                           retries: int = 3, backoff: float = 0.5, max_backoff: float = 30.0,
+                           start_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        `fetch_chart` with up to `retries` retries on timeouts, dropped
+        connections, 429 and 5xx responses. Retry n waits a random share of
+        `backoff * 2**n` seconds (full jitter, capped at `max_backoff`) so
+        throttled workers do not retry in lockstep. Every attempt takes a
+        token from `limiter` first.
+        """
+        for attempt in range(retries + 1):
+            if limiter is not None:
+                limiter.acquire()
             try:
-                mdp = MarketDataPoint(
-                    timestamp=pd.to_datetime(index),
-                    symbol=ticker,
-                    price=float(row["Close"]),
-                )
-                hist_prices.append(mdp)
-            except (ValueError, KeyError) as e:
-                print(f"Warning: Skipping row {index}: {e}")
+                return self.fetch_chart(ticker, timeout, start_date)
+            except DownloadError as e:
+                if not e.retryable or attempt == retries:
+                    raise
+                delay = random.uniform(0, min(max_backoff, backoff * 2 ** attempt))
+                print(f"Retrying {ticker} in {delay:.2f}s ({e.reason})")
+                time.sleep(delay)
+
+    def fetch_tail(self, ticker: str, last_date: str, limiter: Optional[TokenBucket] = None, timeout: float = 10.0,
+                   retries: int = 3, backoff: float = 0.5) -> pd.DataFrame:
+        """Closes after `last_date` up to `end_date`; empty if the stored history is already current."""
+        first = pd.Timestamp(last_date) + pd.Timedelta(days=1)
+        if first >= pd.Timestamp(self.end_date):
+            return pd.DataFrame({"Close": []}, index=pd.DatetimeIndex([], name="Date"))
+        tail = self.fetch_with_retries(ticker, limiter, timeout, retries, backoff, start_date=str(first.date()))
+        return tail[tail.index > pd.Timestamp(last_date)].dropna()
+
+    def append_to_file(self, ticker: str, tail: pd.DataFrame, stored_bytes: int, filetype: str = "csv") -> int:
+        """
+        Append `tail` to a ticker's saved history; returns the new file size.
+
+        CSV rows are written at `stored_bytes`, the size recorded in the
+        index, and the file is cut there, so a torn append from an
+        interrupted run is overwritten rather than kept. The index update
+        that follows is what commits the new rows. Parquet cannot be
+        appended to and is rewritten through a temp file instead.
+        """
+        output_file = self.output_dir / f"{ticker}.{filetype}"
+        if filetype == "csv":
+            with open(output_file, "r+b") as f:
+                f.seek(stored_bytes)
+                f.write(tail.to_csv(header=False).encode())
+                f.truncate()
+                f.flush()
+                os.fsync(f.fileno())
+        elif filetype == "parquet":
+            combined = pd.concat([pd.read_parquet(output_file), tail])
+            tmp = output_file.with_name(output_file.name + ".tmp")
+            combined.to_parquet(tmp)
+            os.replace(tmp, output_file)
+        else:
+            raise ValueError(f"Invalid filetype: {filetype}")
+        return output_file.stat().st_size
+
+    def _stored_entry(self, manifest: DownloadManifest, ticker: str, filetype: str) -> Optional[dict]:
+        """Index entry whose file can take an appended tail, or None if the ticker needs a full download."""
+        entry = manifest.entries.get(ticker)
+        if (entry is None or entry.get("status") != "saved" or entry.get("filetype") != filetype
+                or entry["start_date"] != self.start_date or "last_date" not in entry):
+            return None
+        output_file = self.output_dir / f"{ticker}.{filetype}"
+        if not output_file.exists() or output_file.stat().st_size < entry["bytes"] or "digest" not in entry:
+            return None
+        # Rewritten outside the loader (e.g. by download_ticker): the bytes
+        # before the indexed end no longer match. Extra bytes past it with
+        # the prefix intact are a torn append, which append_to_file overwrites.
+        if _tail_digest(output_file, entry["bytes"]) != entry["digest"]:
+            return None
+        return entry
+
+    def download_all_concurrent(self, filetype: str = "csv", max_workers: int = 8, requests_per_second: float = 5.0,
+                                timeout: float = 10.0, retries: int = 3, backoff: float = 0.5,
+                                incremental: bool = False) -> dict:
+        """
+        Download every ticker in `self.tickers` on a bounded thread pool.
+
+        Finished tickers, saved or skipped for low coverage, are recorded in
+        `manifest.json` in the output directory as they complete; tickers
+        already recorded there for the same date range are not requested
+        again, so an interrupted pull resumes where it stopped.
+
+        With `incremental`, the manifest doubles as an index of each saved
+        file's last date, size and a digest of its last bytes: a ticker saved from the same
+        `start_date` only fetches the days after its last date up to the
+        new `end_date`, and they are appended to the file (see
+        `append_to_file`); a file rewritten since it was indexed is
+        downloaded in full instead. Returns the tickers saved, appended to, skipped,
+        resumed and failed (with the reason).
+        """
+        manifest = DownloadManifest(self.output_dir / MANIFEST_NAME)
+        limiter = TokenBucket(requests_per_second)
+        summary = {"saved": [], "appended": [], "skipped": [], "resumed": [], "failed": {}}
+        pending = []
+        for ticker in self.tickers:
+            if manifest.is_done(ticker, self.start_date, self.end_date):
+                summary["resumed"].append(ticker)
+            else:
+                pending.append((ticker, self._stored_entry(manifest, ticker, filetype) if incremental else None))
+        print(f"Downloading {len(pending)} tickers ({len(summary['resumed'])} already done)...")
+
+        def fetch(ticker: str, entry: Optional[dict]):
+            if entry is not None:
+                return self.fetch_tail(ticker, entry["last_date"], limiter, timeout, retries, backoff)
+            return self.clean_up_price_data(ticker, self.fetch_with_retries(ticker, limiter, timeout, retries, backoff))
+
+        # Results are handled on this thread only, so files and the manifest need no lock
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(fetch, ticker, entry): (ticker, entry) for ticker, entry in pending}
+            for future in as_completed(futures):
+                ticker, entry = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"Error downloading {ticker}: {e}")
+                    summary["failed"][ticker] = str(e)
+                    continue
+
+                output_file = self.output_dir / f"{ticker}.{filetype}"
+                if entry is not None:
+                    tail = result
+                    info = dict(entry, end_date=self.end_date)
+                    if len(tail):
+                        try:
+                            size = self.append_to_file(ticker, tail, entry["bytes"], filetype)
+                        except Exception as e:
+                            print(f"Error appending to {ticker}: {e}")
+                            summary["failed"][ticker] = str(e)
+                            continue
+                        info.update(bytes=size, digest=_tail_digest(output_file, size),
+                                    rows=entry["rows"] + len(tail), last_date=str(tail.index[-1].date()))
+                    print(f"Appended {len(tail)} rows to {ticker}")
+                    summary["appended"].append(ticker)
+                    manifest.mark_done(ticker, **info)
+                    continue
+
+                low_cov, hist_prices = result
+                info = dict(start_date=self.start_date, end_date=self.end_date, rows=len(hist_prices),
+                            status="skipped" if low_cov else "saved")
+                if not low_cov:
+                    # Only a file that was actually written may be recorded as done
+                    if not self.save_data_to_file(ticker, hist_prices, filetype):
+                        summary["failed"][ticker] = f"could not save {ticker}.{filetype}"
+                        continue
+                    size = output_file.stat().st_size
+                    info.update(filetype=filetype, last_date=str(hist_prices.index[-1].date()),
+                                bytes=size, digest=_tail_digest(output_file, size))
+                summary["skipped" if low_cov else "saved"].append(ticker)
+                manifest.mark_done(ticker, **info)
+
+        print(f"Saved {len(summary['saved'])}, appended {len(summary['appended'])}, skipped {len(summary['skipped'])}, "
+              f"failed {len(summary['failed'])}, resumed {len(summary['resumed'])}")
+        return summary
+
+    def write_consolidated_store(self, prices: dict, store_dir: str = "data/price_store") -> dict:
+        """
+        Write `prices` (ticker -> single-column Close frame) as one
+        year-partitioned columnar store, read back with
+        `trading_lib.data_loader.load_price_store`.
+
+        Symbols are dictionary-encoded in sorted order and rows are sorted
+        by date then symbol, so a full load is one pass over the partitions
+        in year order. The store is built next to `store_dir` and swapped
+        in whole; returns its metadata.
+        """
+        names = sorted(prices)
+        dates, codes, closes = [], [], []
+        for code, ticker in enumerate(names):
+            close = pd.to_numeric(prices[ticker]["Close"], errors="coerce").dropna()
+            dates.append(pd.DatetimeIndex(close.index).tz_localize(None).normalize().values.astype("datetime64[D]"))
+            codes.append(np.full(len(close), code, dtype=np.uint16 if len(names) < 2**16 else np.int32))
+            closes.append(close.to_numpy(dtype=np.float64))
+        dates = np.concatenate(dates) if dates else np.empty(0, "datetime64[D]")
+        codes = np.concatenate(codes) if codes else np.empty(0, np.uint16)
+        closes = np.concatenate(closes) if closes else np.empty(0)
+        order = np.lexsort((codes, dates))
+        dates, codes, closes = dates[order], codes[order], closes[order]
+
+        store = Path(store_dir)
+        building = store.with_name(store.name + ".tmp")
+        shutil.rmtree(building, ignore_errors=True)
+        building.mkdir(parents=True)
+        metadata = {"symbols": names, "partitions": {}}
+        years = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+        bounds = np.flatnonzero(np.diff(years)) + 1
+        for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(years)]):
+            if lo == hi:
                 continue
-        
-        return hist_prices
-    
-    def load_ticker_from_parquet(self, ticker: str) -> List[MarketDataPoint]:
-        """Load ticker data from parquet file and convert to MarketDataPoint objects."""
+            year = int(years[lo])
+            partition = store_partition_dir(building, year)
+            partition.mkdir()
+            np.save(partition / "date.npy", dates[lo:hi])
+            np.save(partition / "symbol.npy", codes[lo:hi])
+            np.save(partition / "close.npy", closes[lo:hi])
+            metadata["partitions"][str(year)] = {
+                "rows": int(hi - lo),
+                "min_date": str(dates[lo]),
+                "max_date": str(dates[hi - 1]),
+                "symbols": int(len(np.unique(codes[lo:hi]))),
+            }
+        with open(building / STORE_METADATA, "w") as f:
+            json.dump(metadata, f, indent=1)
+
+        replaced = store.with_name(store.name + ".old")
+        if store.exists():
+            shutil.rmtree(replaced, ignore_errors=True)
+            os.replace(store, replaced)
+        os.replace(building, store)
+        shutil.rmtree(replaced, ignore_errors=True)
+        print(f"Wrote {len(dates)} rows for {len(names)} tickers in {len(metadata['partitions'])} partitions to {store}")
+        return metadata
+
+    def consolidate_saved_files(self, store_dir: str = "data/price_store", filetype: str = "csv") -> dict:
+        """`write_consolidated_store` of every per-ticker file saved in the output directory."""
+        prices = {}
+        for path in sorted(self.output_dir.glob(f"*.{filetype}")):
+            if filetype == "csv":
+                prices[path.stem] = pd.read_csv(path, index_col=0, parse_dates=True)
+            elif filetype == "parquet":
+                prices[path.stem] = pd.read_parquet(path)
+            else:
+                raise ValueError(f"Invalid filetype: {filetype}")
+        return self.write_consolidated_store(prices, store_dir)
+
+    def load_ticker_from_csv(self, ticker: str) -> TickSeries:
+        """Load ticker data from CSV file as a sequence of MarketDataPoint objects."""
+        csv_file = self.output_dir / f"{ticker}.csv"
+        df = pd.read_csv(csv_file, index_col=0, parse_dates=True)
+        return frame_to_ticks(df, ticker)
+
+    def load_ticker_from_parquet(self, ticker: str) -> TickSeries:
+        """Load ticker data from parquet file as a sequence of MarketDataPoint objects."""
         parquet_file = self.output_dir / f"{ticker}.parquet"
-        
-        # Read parquet file
         df = pd.read_parquet(parquet_file)
-        
-        hist_prices: List[MarketDataPoint] = []
-        
-        # Iterate through DataFrame rows and convert to MarketDataPoint
-        for index, row in df.iterrows():
-            try:
-                mdp = MarketDataPoint(
-                    timestamp=pd.to_datetime(index),
-                    symbol=ticker,
-                    price=float(row["Close"]),
-                )
-                hist_prices.append(mdp)
-            except (ValueError, KeyError) as e:
-                print(f"Warning: Skipping row {index}: {e}")
-                continue
-        
-        return hist_prices
+        return frame_to_ticks(df, ticker)
 
     
 if __name__ == "__main__":
     loader = PriceLoader(start_date="2005-01-01", end_date="2024-12-31")
     loader._fetch_snp500_tickers()
-    loader.download_all_tickers(filetype="csv", batch_size=50)
+    loader.download_all_concurrent(filetype="csv", incremental=True)
     print(f"Fetched and saved data for {len(loader.tickers)} tickers.")
 
     test_tickers = loader.tickers[:5]
@@ -1,8 +1,20 @@
-from typing import Dict, List
+from typing import Dict, Optional
 from datetime import datetime, timedelta
 
 from trading_lib.strategy import Strategy
-from trading_lib.models import MarketDataPoint, Action
+from trading_lib.models import MarketDataPoint
+from trading_lib.signals import BUY, SignalBuffer
+
+class _RSIState:
+    """Per-symbol state, fetched with a single dict lookup per tick."""
+
+    __slots__ = ("rsi", "prev_rsi")
+
+    def __init__(self, rsi):
+        self.rsi = rsi
+        # RSI as of the previous tick, i.e. over the prices before the current one
+        self.prev_rsi: Optional[float] = None
+
 
 class RSIStrategy(Strategy):
     """
@@ -11,64 +23,26 @@ class RSIStrategy(Strategy):
     def __init__(self, window: int = 14, quantity: int = 100):
         super().__init__(quantity)
         self.window = window
-        self._prices: Dict[str, List[float]] = {}
+        self._state: Dict[str, _RSIState] = {}
 
-    def _calculate_rsi(self, prices: List[float]) -> float:
-        if len(prices) < self.window + 1:
-            return 50.0  # Neutral RSI
-        
-        # Calculate gains and losses for the last window periods only
-        gains = []
-        losses = []
-        
-        for i in range(len(prices) - self.window, len(prices)):
-            change = prices[i] - prices[i - 1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-        
-        # Calculate average gain and loss
-        avg_gain = sum(gains) / len(gains)
-        avg_loss = sum(losses) / len(losses)
-        
-        # Avoid division by zero
-        if avg_loss == 0:
-            return 100.0
-        
-        # Calculate RSI
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
-    
-    def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
+    def emit_signals(self, tick: MarketDataPoint, signals: SignalBuffer):
         sym, price = tick.symbol, tick.price
 
-        if sym not in self._prices:
-            self._prices[sym] = [price]
-            return []
-        
-        prev_prices = self._prices[sym]
-        
-        if len(prev_prices) < self.window + 1:
-            self._prices[sym].append(price)
-            return []
-        
-        rsi = self._calculate_rsi(prev_prices)
-        
-        signals = []
-        if rsi < 30:
-            signals.append((sym, self.quantity, price, Action.BUY))
-        
-        prev_prices.append(price)
+        self.indicators.update(tick)
+        state = self._state.get(sym)
+        if state is None:
+            state = self._state[sym] = _RSIState(self.indicators.indicator("rsi", sym, self.window))
+            state.prev_rsi = state.rsi.value
+            return
+
+        prev_rsi = state.prev_rsi
+        state.prev_rsi = state.rsi.value
+
+        if prev_rsi is None:
+            return
 
-        self._prices[sym] = prev_prices[-(self.window + 1):]
-        
-        return signals
-        
+        if prev_rsi < 30:
+            signals.emit(sym, self.quantity, price, BUY)
 
 
 if __name__ == "__main__":
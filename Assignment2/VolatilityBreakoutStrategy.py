@@ -1,9 +1,22 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
 from trading_lib.strategy import Strategy
-from trading_lib.models import MarketDataPoint, Action
-import statistics
+from trading_lib.models import MarketDataPoint
+from trading_lib.signals import BUY, SignalBuffer
+
+class _VolatilityState:
+    """Per-symbol state, fetched with a single dict lookup per tick."""
+
+    __slots__ = ("volatility", "prev_price", "prev_volatility", "history")
+
+    def __init__(self, volatility, price: float):
+        self.volatility = volatility
+        # price and rolling volatility as of the previous tick
+        self.prev_price = price
+        self.prev_volatility: Optional[float] = volatility.value
+        self.history: List[float] = []
+
 
 class VolatilityBreakoutStrategy(Strategy):
     """
@@ -12,45 +25,34 @@ class VolatilityBreakoutStrategy(Strategy):
     def __init__(self, window: int = 20, quantity: int = 100):
         super().__init__(quantity)
         self.window = window
-        self.volatility_history: Dict[str, List[float]] = {}
-        self._prices: Dict[str, List[float]] = {}
-
-    def _calculate_volatility(self, prices: List[float]) -> float:
-        if len(prices) < self.window:
-            return 0.0
-        
-        returns = [(prices[i] / prices[i - 1]) - 1 for i in range(1, len(prices))]
+        self._state: Dict[str, _VolatilityState] = {}
 
-        return statistics.stdev(returns)
+    @property
+    def volatility_history(self) -> Dict[str, List[float]]:
+        return {sym: state.history for sym, state in self._state.items()}
 
-    def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
+    def emit_signals(self, tick: MarketDataPoint, signals: SignalBuffer):
         sym, price = tick.symbol, tick.price
-        
-        if sym not in self._prices:
-            self._prices[sym] = [price]
-            self.volatility_history[sym] = []
-            return []
-        
-        prev_prices = self._prices[sym]     
 
-        if len(prev_prices) < self.window + 1:
-            self._prices[sym].append(price)          
-            return []
-        
-        rolling_vol = self._calculate_volatility(prev_prices)
+        self.indicators.update(tick)
+        state = self._state.get(sym)
+        if state is None:
+            self._state[sym] = _VolatilityState(self.indicators.indicator("volatility", sym, self.window), price)
+            return
 
-        current_return = (price / prev_prices[-1]) - 1
-        
-        signals = []
-        if current_return > rolling_vol:
-            signals.append((sym, self.quantity, price, Action.BUY))
+        prev_price, rolling_vol = state.prev_price, state.prev_volatility
+        state.prev_price = price
+        state.prev_volatility = state.volatility.value
+
+        if rolling_vol is None:
+            return
 
-        prev_prices.append(price)
+        current_return = (price / prev_price) - 1
+
+        if current_return > rolling_vol:
+            signals.emit(sym, self.quantity, price, BUY)
 
-        self._prices[sym] = prev_prices[-(self.window + 1):]
-        self.volatility_history[sym].append(rolling_vol)
-        
-        return signals
+        state.history.append(rolling_vol)
     
 if __name__ == "__main__":
     # Use smaller window for testing
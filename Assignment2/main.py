@@ -22,7 +22,17 @@ def parse_args(args):
     parser.add_argument('-c', "--cash", type=float, default=1000000)
     parser.add_argument('-i', "--interval", type=str, default="1s",
                         choices=[e.value for e in RecordingInterval],
-                        help="Portfolio recording interval (tick, 1s, 1m, 1h, 1d, 1mo)")
+                        help="Portfolio recording interval (tick, 1s, 1m, 1h, 1d, 1w, 1mo, or multi for every tick in fixed memory)")
+    parser.add_argument('-p', "--precompute", action="store_true",
+                        help="Precompute indicators over the whole price series before running")
+    parser.add_argument("--indicator_cache", type=str, default=None,
+                        help="Directory to cache precomputed indicator arrays in")
+    parser.add_argument('-b', "--bootstrap", type=int, default=0,
+                        help="Number of block-bootstrap resamples for metric confidence intervals (0 disables)")
+    parser.add_argument("--bootstrap_workers", type=int, default=1,
+                        help="Processes to spread the bootstrap resamples across")
+    parser.add_argument("--no_charts", "--no-charts", action="store_true",
+                        help="Skip chart rendering (matplotlib is then never imported)")
 
     return parser.parse_args(args)
 
@@ -38,7 +48,12 @@ def main(args):
                   MACDStrategy(quantity=quantity), 
                   VolatilityBreakoutStrategy(quantity=quantity)]
 
-    StrategyComparator(output_path = "Assignment_2_Results").compare_strategies(
+    StrategyComparator(output_path = "Assignment_2_Results",
+                       precompute_indicators = parsed_args.precompute,
+                       indicator_cache_dir = parsed_args.indicator_cache,
+                       bootstrap_resamples = parsed_args.bootstrap,
+                       bootstrap_workers = parsed_args.bootstrap_workers,
+                       charts = not parsed_args.no_charts).compare_strategies(
         strategies, 
         parsed_args.cash, 
         parsed_args.failure_rate, 
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import gc
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Iterable
+
+from trading_lib.engine import ExecutionEngine
+from trading_lib.models import MarketDataPoint
+
+
+def summarize_ns(samples_ns: list[int]) -> dict:
+    """Median, interquartile range and minimum of timing samples, in seconds."""
+    ordered = sorted(samples_ns)
+    if len(ordered) >= 2:
+        q1, _, q3 = statistics.quantiles(ordered, n = 4, method = "inclusive")
+    else:
+        q1 = q3 = ordered[0]
+    return {
+        "repeats": len(ordered),
+        "wall_seconds": statistics.median(ordered) / 1e9,
+        "wall_iqr_seconds": (q3 - q1) / 1e9,
+        "wall_min_seconds": ordered[0] / 1e9,
+    }
+
+
+def benchmark(
+    make_engine: Callable[[], ExecutionEngine],
+    ticks: Iterable[MarketDataPoint],
+    repeats: int = 5,
+    warmup: int = 1,
+    seed: int = 0,
+    disable_gc: bool = False,
+) -> dict:
+    """
+    Time `engine.process_ticks(ticks)` over `warmup + repeats` independent trials.
+
+    Every trial gets a brand-new engine from `make_engine` (built outside the
+    timed region) and reseeds `random` with `seed`, so simulated execution
+    failures repeat exactly. Warmup trials are discarded. With `disable_gc`
+    the garbage collector is paused during each timed run (after a full
+    collection), removing collection pauses from the samples.
+
+    Returns the summary from `summarize_ns` plus the raw `samples_ns`.
+    """
+    assert repeats >= 1 and warmup >= 0
+    ticks = list(ticks)
+    samples_ns = []
+    for trial in range(warmup + repeats):
+        random.seed(seed)
+        engine = make_engine()
+        gc.collect()
+        gc_was_enabled = gc.isenabled()
+        if disable_gc:
+            gc.disable()
+        try:
+            start = time.perf_counter_ns()
+            engine.process_ticks(ticks)
+            elapsed = time.perf_counter_ns() - start
+        finally:
+            if disable_gc and gc_was_enabled:
+                gc.enable()
+        if trial >= warmup:
+            samples_ns.append(elapsed)
+
+    summary = summarize_ns(samples_ns)
+    summary["samples_ns"] = samples_ns
+    return summary
+
+
+def measure_run(engine: ExecutionEngine, ticks: list[MarketDataPoint], seed: int = 0) -> dict:
+    """CPU time, per-tick latency percentiles and net allocated blocks of one seeded run."""
+    random.seed(seed)
+    latencies_ns = []
+    step = engine.step
+    blocks_before = sys.getallocatedblocks()
+    cpu_start = time.process_time()
+    for tick in ticks:
+        start = time.perf_counter_ns()
+        step(tick)
+        latencies_ns.append(time.perf_counter_ns() - start)
+    cpu_seconds = time.process_time() - cpu_start
+    allocated_blocks = sys.getallocatedblocks() - blocks_before
+
+    result = {
+        "ticks": len(ticks),
+        "cpu_seconds": cpu_seconds,
+        "allocated_blocks": allocated_blocks,
+    }
+    if len(latencies_ns) >= 2:
+        percentiles = statistics.quantiles(latencies_ns, n = 100, method = "inclusive")
+        result.update(
+            latency_p50_us = percentiles[49] / 1000,
+            latency_p90_us = percentiles[89] / 1000,
+            latency_p99_us = percentiles[98] / 1000,
+            latency_max_us = max(latencies_ns) / 1000,
+        )
+    return result
+
+
+def traced_peak_mib(make_engine: Callable[[], ExecutionEngine], ticks: list[MarketDataPoint], seed: int = 0) -> float:
+    """Peak memory allocated while processing `ticks`, via tracemalloc (the ticks are excluded)."""
+    random.seed(seed)
+    engine = make_engine()
+    tracemalloc.start()
+    try:
+        engine.process_ticks(ticks)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2 ** 20
@@ -0,0 +1,317 @@
+"""Collapsed stacks and self-contained SVG flamegraphs.
+
+Stacks are kept in the collapsed ("folded") format used by flamegraph
+tools: one line per distinct stack, frames from the outermost inwards
+joined by ";", then a space and a value. They come either from a cProfile
+run (`collapse_pstats`, values in microseconds) or from `SamplingProfiler`,
+a background thread sampling another thread's stack (values are sample
+counts). `flamegraph_svg` renders them without any external tool, and
+`diff_flamegraph_svg` colors the frames of one profile by how much they
+grew (red) or shrank (blue) relative to another.
+
+    PYTHONPATH=.. python flamegraph.py collapse Results/X_cprofile.prof -o X.folded
+    PYTHONPATH=.. python flamegraph.py svg X.folded -o X.svg
+    PYTHONPATH=.. python flamegraph.py diff Naive.folded Optimized.folded -o diff.svg
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import pstats
+import sys
+import threading
+import zlib
+from collections import Counter
+from typing import Callable, Optional
+from xml.sax.saxutils import escape
+
+
+def _label(filename: str, lineno: int, name: str) -> str:
+    """Frame name shared by cProfile and sampled stacks: "func (file.py:line)"."""
+    if filename == "~":  # built-in functions in cProfile data
+        label = name.strip("<>")
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{lineno})"
+    return label.replace(";", ",")
+
+
+def collapse_pstats(prof, max_depth: int = 64, min_us: float = 0.5) -> dict[str, float]:
+    """
+    Collapsed stacks (microseconds) from a cProfile `.prof` file or `pstats.Stats`.
+
+    cProfile keeps only caller -> callee totals, so stacks are rebuilt by
+    walking down from the root functions and splitting each function's time
+    across its callers in proportion to the time each call path spent in
+    it. Recursive calls are cut at the first repeat of a function, and
+    branches below `min_us` are dropped.
+    """
+    stats = prof if isinstance(prof, pstats.Stats) else pstats.Stats(str(prof))
+    raw = stats.stats
+    callees: dict[tuple, list] = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    folded: dict[str, float] = {}
+
+    def walk(func, time_s: float, stack: list, on_stack: set):
+        _, _, tt, ct, _ = raw[func]
+        stack = stack + [_label(*func)]
+        scale = time_s / ct if ct > 0 else 0.0
+        self_us = tt * scale * 1e6
+        if self_us >= min_us:
+            key = ";".join(stack)
+            folded[key] = folded.get(key, 0.0) + self_us
+        if len(stack) >= max_depth:
+            return
+        on_stack = on_stack | {func}
+        for callee, edge_ct in callees.get(func, ()):
+            share = edge_ct * scale
+            if callee not in on_stack and share * 1e6 >= min_us:
+                walk(callee, share, stack, on_stack)
+
+    for func, (_, _, _, ct, callers) in raw.items():
+        if not callers:
+            walk(func, ct, [], set())
+    return folded
+
+
+class SamplingProfiler:
+    """Background thread sampling one thread's call stack every `interval` seconds.
+
+    Use as a context manager (or `start()`/`stop()`) on the thread to be
+    profiled. Frames of the code that started the profiler are left out of
+    the stacks. Sampling relies on the thread switch interval
+    (`sys.getswitchinterval()`, 5 ms by default) for the sampler to get the
+    GIL, so much shorter intervals do not add samples.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._target: Optional[int] = None
+        self._base_depth = 0
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _depth(frame) -> int:
+        depth = 0
+        while frame is not None:
+            depth += 1
+            frame = frame.f_back
+        return depth
+
+    def _begin(self, base_depth: int):
+        self._target = threading.get_ident()
+        self._base_depth = base_depth
+        self._done.clear()
+        self._thread = threading.Thread(target = self._run, name = "sampling-profiler", daemon = True)
+        self._thread.start()
+
+    def start(self):
+        self._begin(self._depth(sys._getframe(1)))
+
+    def stop(self):
+        self._done.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        self._begin(self._depth(sys._getframe(1)))
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            codes = codes[::-1][self._base_depth:]
+            # Nothing running yet, or the profiled thread is inside stop()
+            if not codes or codes[0].co_filename == __file__:
+                continue
+            self.stacks[";".join(_label(c.co_filename, c.co_firstlineno, c.co_name) for c in codes)] += 1
+
+    def collapsed(self) -> dict[str, float]:
+        return dict(self.stacks)
+
+
+def write_collapsed(folded: dict[str, float], path: str):
+    with open(path, "w") as f:
+        for stack in sorted(folded):
+            f.write(f"{stack} {round(folded[stack])}\n")
+
+
+def read_collapsed(path: str) -> dict[str, float]:
+    folded: dict[str, float] = {}
+    with open(path) as f:
+        for line in f:
+            stack, _, value = line.rstrip("\n").rpartition(" ")
+            if stack:
+                folded[stack] = folded.get(stack, 0.0) + float(value)
+    return folded
+
+
+class _Frame:
+    __slots__ = ("name", "value", "before", "children")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0.0
+        self.before = 0.0
+        self.children: dict[str, _Frame] = {}
+
+
+def _tree(folded: dict[str, float], before: Optional[dict[str, float]] = None) -> _Frame:
+    """Frame tree of `folded`; `before` totals are added along the paths that exist in it."""
+    root = _Frame("all")
+    for stack, value in folded.items():
+        node = root
+        node.value += value
+        for name in stack.split(";"):
+            node = node.children.setdefault(name, _Frame(name))
+            node.value += value
+    for stack, value in (before or {}).items():
+        node = root
+        node.before += value
+        for name in stack.split(";"):
+            node = node.children.get(name)
+            if node is None:
+                break
+            node.before += value
+    return root
+
+
+def _hot_color(name: str) -> str:
+    h = zlib.crc32(name.encode())
+    return f"rgb({205 + h % 50},{(h >> 8) % 230},{(h >> 16) % 55})"
+
+
+def _render(root: _Frame, title: str, subtitle: str, fill: Callable[[_Frame], str],
+            tip: Callable[[_Frame], str], width: int, frame_height: int) -> str:
+    def depth(node: _Frame) -> int:
+        return 1 + max((depth(c) for c in node.children.values()), default = 0)
+
+    top, pad = 44, 10
+    height = top + depth(root) * frame_height + pad
+    scale = (width - 2 * pad) / root.value if root.value else 0.0
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="Verdana, sans-serif" font-size="11">',
+        f'<rect width="{width}" height="{height}" fill="#f8f8f8"/>',
+        f'<text x="{width / 2}" y="20" text-anchor="middle" font-size="16">{escape(title)}</text>',
+        f'<text x="{width / 2}" y="36" text-anchor="middle" fill="#555">{escape(subtitle)}</text>',
+    ]
+
+    def draw(node: _Frame, x: float, level: int):
+        w = node.value * scale
+        if w < 0.1:
+            return
+        y = height - pad - (level + 1) * frame_height
+        text = ""
+        chars = int((w - 6) / 7)
+        if chars >= 3:
+            label = node.name if len(node.name) <= chars else node.name[:chars - 2] + ".."
+            text = f'<text x="{x + 3:.2f}" y="{y + frame_height - 4}">{escape(label)}</text>'
+        parts.append(
+            f'<g><title>{escape(tip(node))}</title>'
+            f'<rect x="{x:.2f}" y="{y}" width="{w:.2f}" height="{frame_height - 1}" '
+            f'fill="{fill(node)}" rx="2"/>{text}</g>'
+        )
+        for child in sorted(node.children.values(), key = lambda c: c.name):
+            draw(child, x, level + 1)
+            x += child.value * scale
+
+    draw(root, pad, 0)
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
+
+
+def flamegraph_svg(folded: dict[str, float], title: str = "Flame Graph", unit: str = "us",
+                   width: int = 1200, frame_height: int = 16) -> str:
+    """Self-contained SVG flamegraph of collapsed stacks; hover a frame for its total."""
+    root = _tree(folded)
+    total = root.value or 1.0
+
+    def tip(node: _Frame) -> str:
+        return f"{node.name} ({node.value:,.0f} {unit}, {node.value / total * 100:.2f}%)"
+
+    return _render(root, title, f"{root.value:,.0f} {unit} total", lambda n: _hot_color(n.name), tip,
+                   width, frame_height)
+
+
+def diff_flamegraph_svg(before: dict[str, float], after: dict[str, float], title: str = "Differential Flame Graph",
+                        unit: str = "us", width: int = 1200, frame_height: int = 16) -> str:
+    """
+    Flamegraph of `after`, each frame colored by its change from `before`.
+
+    `before` is scaled to the same total first, so colors show shifts in
+    where the time goes: red frames take a larger share than before, blue a
+    smaller one, white about the same. Frames that only exist in `before`
+    are not drawn; swap the arguments to see them.
+    """
+    before_total = sum(before.values())
+    after_total = sum(after.values())
+    factor = after_total / before_total if before_total else 0.0
+    root = _tree(after, {stack: value * factor for stack, value in before.items()})
+
+    def change(node: _Frame) -> float:
+        return (node.value - node.before) / max(node.value, node.before, 1e-12)
+
+    def fill(node: _Frame) -> str:
+        d = change(node)
+        fade = int(255 * (1 - min(abs(d), 1.0)))
+        return f"rgb(255,{fade},{fade})" if d > 0 else f"rgb({fade},{fade},255)"
+
+    def tip(node: _Frame) -> str:
+        return (f"{node.name} (before {node.before / factor if factor else 0:,.0f} {unit}, "
+                f"after {node.value:,.0f} {unit}, share {change(node) * 100:+.1f}%)")
+
+    subtitle = f"before {before_total:,.0f} {unit}, after {after_total:,.0f} {unit}; red grew, blue shrank"
+    return _render(root, title, subtitle, fill, tip, width, frame_height)
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(description = "Collapsed stacks and SVG flamegraphs")
+    commands = parser.add_subparsers(dest = "command", required = True)
+    collapse = commands.add_parser("collapse", help = "cProfile .prof file -> collapsed stacks")
+    collapse.add_argument("prof_path")
+    collapse.add_argument('-o', "--output", required = True)
+    svg = commands.add_parser("svg", help = "collapsed stacks (or a .prof file) -> SVG flamegraph")
+    svg.add_argument("path")
+    svg.add_argument('-o', "--output", required = True)
+    svg.add_argument("--title", default = "Flame Graph")
+    diff = commands.add_parser("diff", help = "differential flamegraph of two collapsed stack files")
+    diff.add_argument("before")
+    diff.add_argument("after")
+    diff.add_argument('-o', "--output", required = True)
+    diff.add_argument("--title", default = "Differential Flame Graph")
+    return parser.parse_args(args)
+
+
+def _load(path: str) -> dict[str, float]:
+    return collapse_pstats(path) if path.endswith(".prof") else read_collapsed(path)
+
+
+def main(args):
+    parsed_args = parse_args(args)
+    if parsed_args.command == "collapse":
+        write_collapsed(collapse_pstats(parsed_args.prof_path), parsed_args.output)
+    else:
+        if parsed_args.command == "svg":
+            svg = flamegraph_svg(_load(parsed_args.path), parsed_args.title)
+        else:
+            svg = diff_flamegraph_svg(_load(parsed_args.before), _load(parsed_args.after), parsed_args.title)
+        with open(parsed_args.output, "w") as f:
+            f.write(svg)
+    print(f"Written to {parsed_args.output}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
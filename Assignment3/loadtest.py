@@ -0,0 +1,212 @@
+"""Throughput load test for ExecutionEngine.
+
+Pushes synthetic ticks through an engine either as fast as possible or at
+a target arrival rate. At a target rate the feed is modelled as an open
+loop: tick i arrives at start + i / rate whether or not the engine has
+caught up, and waits in a FIFO queue until the engine is free. The time it
+waits is its queueing delay; once the engine is slower than the feed, the
+delay and the backlog keep growing, which marks the saturation point.
+
+    PYTHONPATH=.. python loadtest.py                       # max throughput
+    PYTHONPATH=.. python loadtest.py --rate 20000 50000    # fixed rates
+    PYTHONPATH=.. python loadtest.py --sweep -i tick -f 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from time import perf_counter_ns
+from typing import Callable, Iterable, Optional
+
+from trading_lib.data_generator import generate_ticks
+from trading_lib.engine import ExecutionEngine
+from trading_lib.latency import LatencyHistogram
+from trading_lib.models import MarketDataPoint, RecordingInterval
+from trading_lib.portfolio import Portfolio
+from trading_lib.signals import BUY, SELL, SignalBuffer
+from trading_lib.strategy import Strategy
+
+# Achieved throughput below this share of the target rate counts as saturated
+SATURATION_SHARE = 0.98
+SWEEP_SHARES = (0.25, 0.5, 0.75, 0.9, 1.0, 1.1)
+
+
+class SyntheticLoadStrategy(Strategy):
+    """Emits an order on a `density` share of ticks; a `rejection_rate` share of them fails validation.
+
+    Valid orders alternate between buying `quantity` and selling back what
+    is held per symbol. Rejected ones sell more than is held, so the
+    engine's insufficient-holdings check turns them down. Holdings are read
+    from `portfolio`, the engine's portfolio, so orders lost to the engine's
+    simulated `failure_rate` do not turn later sells into extra rejections;
+    without one the strategy assumes every order fills. Draws come from a
+    private RNG, independent of the engine's failures.
+    """
+
+    def __init__(self, density: float = 0.1, rejection_rate: float = 0.0, quantity: int = 1, seed: int = 0,
+                 portfolio: Optional[Portfolio] = None):
+        super().__init__(quantity)
+        assert 0 <= density <= 1 and 0 <= rejection_rate <= 1
+        self.density = density
+        self.rejection_rate = rejection_rate
+        self.portfolio = portfolio
+        self.invalid_orders = 0
+        self._rng = random.Random(seed)
+        self._held: dict[str, int] = {}
+
+    def emit_signals(self, tick: MarketDataPoint, signals: SignalBuffer):
+        rng = self._rng
+        if rng.random() >= self.density:
+            return
+        sym = tick.symbol
+        if self.portfolio is not None:
+            held = self.portfolio.get_holding(sym)["quantity"]
+        else:
+            held = self._held.get(sym, 0)
+        if rng.random() < self.rejection_rate:
+            signals.emit(sym, -(held + self.quantity), tick.price, SELL)
+            self.invalid_orders += 1
+        elif held:
+            signals.emit(sym, -held, tick.price, SELL)
+            self._held[sym] = 0
+        else:
+            signals.emit(sym, self.quantity, tick.price, BUY)
+            self._held[sym] = self.quantity
+
+
+def run_load_test(engine: ExecutionEngine, ticks: Iterable[MarketDataPoint], rate: Optional[float] = None) -> dict:
+    """
+    Feed `ticks` to `engine.step`, flat out or at `rate` ticks per second.
+
+    Returns the tick count, elapsed seconds, sustained throughput, the
+    service time (one `step`) and, at a target rate, queueing delay
+    summaries from `LatencyHistogram` (microseconds), the largest backlog
+    of arrived but unprocessed ticks and whether the engine saturated.
+    """
+    service = LatencyHistogram()
+    delay = LatencyHistogram()
+    step = engine.step
+    period_ns = 1e9 / rate if rate else 0.0
+    max_backlog = 0
+    count = 0
+    start_ns = perf_counter_ns()
+    for count, tick in enumerate(ticks, 1):
+        if rate:
+            arrival = start_ns + int((count - 1) * period_ns)
+            now = perf_counter_ns()
+            if now < arrival:
+                wait = arrival - now
+                # sleep most of a long gap, then spin for precision
+                if wait > 2_000_000:
+                    time.sleep((wait - 1_000_000) / 1e9)
+                while now < arrival:
+                    now = perf_counter_ns()
+            else:
+                max_backlog = max(max_backlog, int((now - start_ns) / period_ns) + 1 - (count - 1))
+            delay.record(now - arrival)
+        else:
+            now = perf_counter_ns()
+        step(tick)
+        service.record(perf_counter_ns() - now)
+    elapsed = (perf_counter_ns() - start_ns) / 1e9
+
+    throughput = count / elapsed if elapsed > 0 else 0.0
+    result = {
+        "ticks": count,
+        "target_rate": rate,
+        "elapsed_seconds": elapsed,
+        "throughput": throughput,
+        "service_us": service.summary(),
+    }
+    if rate:
+        result.update(
+            queue_delay_us = delay.summary(),
+            max_backlog = max_backlog,
+            saturated = throughput < SATURATION_SHARE * rate,
+        )
+    return result
+
+
+def find_saturation(
+    make_engine: Callable[[], ExecutionEngine], ticks: list, rates: Iterable[float], seed: int = 0
+) -> list[dict]:
+    """`run_load_test` at each rate, lowest first, on a fresh engine with `random` reseeded each time."""
+    results = []
+    for rate in sorted(rates):
+        random.seed(seed)
+        results.append(run_load_test(make_engine(), ticks, rate))
+    return results
+
+
+def format_results(results: list[dict]) -> str:
+    lines = [
+        "| Target (ticks/s) | Sustained (ticks/s) | Service p50/p99/p99.9 (us) | Queue delay p50/p99/max (us) | Max backlog | Saturated |",
+        "|---:|---:|---|---|---:|---|",
+    ]
+    for r in results:
+        s = r["service_us"]
+        service = f"{s['p50']:.1f} / {s['p99']:.1f} / {s['p99.9']:.1f}"
+        if r["target_rate"]:
+            d = r["queue_delay_us"]
+            lines.append(f"| {r['target_rate']:,.0f} | {r['throughput']:,.0f} | {service} "
+                         f"| {d['p50']:.1f} / {d['p99']:.1f} / {d['max']:.1f} | {r['max_backlog']} "
+                         f"| {'yes' if r['saturated'] else 'no'} |")
+        else:
+            lines.append(f"| max | {r['throughput']:,.0f} | {service} | n/a | n/a | n/a |")
+    return "\n".join(lines)
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(description = "Load test the execution engine with synthetic ticks")
+    parser.add_argument('-n', "--ticks", type = int, default = 50_000)
+    parser.add_argument('-k', "--symbols", type = int, default = 10)
+    parser.add_argument("--density", type = float, default = 0.1,
+                        help = "Share of ticks that emit an order")
+    parser.add_argument("--rejection_rate", type = float, default = 0.0,
+                        help = "Share of orders that fail validation")
+    parser.add_argument('-f', "--failure_rate", type = float, default = 0.0,
+                        help = "Engine's simulated execution failure rate")
+    parser.add_argument('-i', "--interval", type = str, default = "1s",
+                        choices = [e.value for e in RecordingInterval])
+    parser.add_argument('-c', "--cash", type = float, default = 1e9)
+    parser.add_argument("--rate", type = float, nargs = "+", default = None,
+                        help = "Target arrival rates in ticks/s (default: as fast as possible)")
+    parser.add_argument("--sweep", action = "store_true",
+                        help = "Measure max throughput, then run at fractions of it to find the saturation point")
+    parser.add_argument('-s', "--seed", type = int, default = 0)
+    return parser.parse_args(args)
+
+
+def main(args) -> list[dict]:
+    parsed_args = parse_args(args)
+    ticks = list(generate_ticks(parsed_args.ticks, parsed_args.symbols, seed = parsed_args.seed))
+
+    def make_engine() -> ExecutionEngine:
+        portfolio = Portfolio(cash = parsed_args.cash)
+        strategy = SyntheticLoadStrategy(parsed_args.density, parsed_args.rejection_rate, seed = parsed_args.seed,
+                                         portfolio = portfolio)
+        return ExecutionEngine(strategy, portfolio, parsed_args.failure_rate,
+                               recording_interval = RecordingInterval(parsed_args.interval), verbose = False)
+
+    random.seed(parsed_args.seed)
+    results = [run_load_test(make_engine(), ticks)]
+    rates = parsed_args.rate or []
+    if parsed_args.sweep:
+        rates = [share * results[0]["throughput"] for share in SWEEP_SHARES]
+    results += find_saturation(make_engine, ticks, rates, parsed_args.seed)
+
+    print(f"{parsed_args.ticks} ticks, {parsed_args.symbols} symbols, density {parsed_args.density}, "
+          f"rejection {parsed_args.rejection_rate}, failure rate {parsed_args.failure_rate}, interval {parsed_args.interval}")
+    print(format_results(results))
+    sustained = [r for r in results[1:] if not r["saturated"]]
+    saturated = [r for r in results[1:] if r["saturated"]]
+    if saturated:
+        print(f"Saturates at {saturated[0]['target_rate']:,.0f} ticks/s"
+              + (f"; highest sustained rate tested {sustained[-1]['target_rate']:,.0f} ticks/s" if sustained else ""))
+    return results
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
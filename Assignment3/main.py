@@ -23,9 +23,25 @@ def parse_args(args):
     parser.add_argument('-c', "--cash", type = float, default = 100000)
     parser.add_argument('-i', "--interval", type = str, default = "1s",
                         choices = [e.value for e in RecordingInterval],
-                        help="Portfolio recording interval (tick, 1s, 1m, 1h, 1d, 1mo)")
+                        help="Portfolio recording interval (tick, 1s, 1m, 1h, 1d, 1w, 1mo, or multi for every tick in fixed memory)")
     parser.add_argument('-g', "--generate", type = bool, default = False, 
                         help = "Generate test data for 1k, 10k, 100k ticks before executing strategies")
+    parser.add_argument("--no_charts", "--no-charts", action = "store_true",
+                        help = "Skip chart rendering (matplotlib is then never imported)")
+    parser.add_argument('-r', "--repeats", type = int, default = 5,
+                        help = "Timed benchmark repetitions per strategy and data size")
+    parser.add_argument('-w', "--warmup", type = int, default = 1,
+                        help = "Untimed warmup runs before the timed repetitions")
+    parser.add_argument('-s', "--seed", type = int, default = 0,
+                        help = "Seed for the simulated execution failures, reset before every run")
+    parser.add_argument("--disable_gc", action = "store_true",
+                        help = "Pause the garbage collector during timed runs")
+    parser.add_argument("--memory_mode", type = str, default = "peak", choices = ["peak", "tracemalloc"],
+                        help = "peak: peak RSS only; tracemalloc: also attribute live memory to source lines")
+    parser.add_argument("--sampling_interval", type = float, default = None,
+                        help = "Seconds between stack samples for an extra sampled flamegraph per strategy")
+    parser.add_argument("--snapshot_interval", type = int, default = 10000,
+                        help = "Ticks between tracemalloc snapshots in tracemalloc memory mode")
 
     return parser.parse_args(args)
 
@@ -57,12 +73,21 @@ def main(args):
     #         Path(data_path_for_size(data_size)))  
 
     for data_size in data_sizes:
-       StrategyProfiler(output_path = "Assignment_3_Results_" + data_size).profile_strategies(
+       StrategyProfiler(output_path = "Assignment_3_Results_" + data_size,
+                        charts = not parsed_args.no_charts,
+                        repeats = parsed_args.repeats,
+                        warmup = parsed_args.warmup,
+                        seed = parsed_args.seed,
+                        disable_gc = parsed_args.disable_gc,
+                        memory_mode = parsed_args.memory_mode,
+                        snapshot_interval = parsed_args.snapshot_interval,
+                        sampling_interval = parsed_args.sampling_interval).profile_strategies(
             strategies, 
             parsed_args.cash, 
             parsed_args.failure_rate, 
             RecordingInterval(parsed_args.interval), 
-            Path(data_path_for_size(data_size)))  
+            Path(data_path_for_size(data_size)),
+            dataset = data_size)  
 
 if __name__ == "__main__":
     main(sys.argv[1:])
\ No newline at end of file
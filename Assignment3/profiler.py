@@ -2,23 +2,67 @@ from trading_lib.strategy import Strategy
 from trading_lib.models import RecordingInterval, MarketDataPoint
 from trading_lib.engine import ExecutionEngine
 from trading_lib.portfolio import Portfolio
-from trading_lib.reporting import generate_performance_report, calc_performance_metrics
-from trading_lib.data_loader import load_market_data, load_market_data_yf
+from trading_lib.reporting import generate_performance_report, calc_performance_metrics, latency_table
+from trading_lib.data_loader import is_price_store, load_market_data, load_market_data_yf, load_price_store
 from Assignment3.reporting import write_report
+from Assignment3.results_store import ProfilingResultsStore
+from Assignment3.benchmark import benchmark, measure_run
+from Assignment3.flamegraph import SamplingProfiler, collapse_pstats, diff_flamegraph_svg, flamegraph_svg, write_collapsed
+from Assignment3.allocations import allocations_markdown, attribute_allocations, trace_allocations, trace_load
 
 import os
 from datetime import datetime
 import csv
 
+import copy
+import random
 import timeit
 import cProfile
-from memory_profiler import memory_usage
+import pstats
+from typing import Optional
 import sys
 from pathlib import Path
 
+def dataset_label(price_path) -> str:
+    """Dataset name for a price file or directory: data/market_data_1k.csv -> "1k"."""
+    name = Path(price_path).stem
+    return name[len("market_data_"):] if name.startswith("market_data_") else name
+
 class StrategyProfiler:
-    def __init__(self, output_path: str = ""):
+    def __init__(
+        self,
+        output_path: str = "",
+        charts: bool = True,
+        results_store: Optional[ProfilingResultsStore] = None,
+        repeats: int = 5,
+        warmup: int = 1,
+        seed: int = 0,
+        disable_gc: bool = False,
+        memory_mode: str = "peak",
+        snapshot_interval: int = 10_000,
+        sampling_interval: Optional[float] = None
+    ):
         self.output_path = output_path
+        self.charts = charts
+        # Benchmark settings: timed repetitions after warmup runs, all on fresh
+        # instances with `random` reseeded, optionally with the GC paused
+        self.repeats = repeats
+        self.warmup = warmup
+        self.seed = seed
+        self.disable_gc = disable_gc
+        # "peak" records peak RSS only; "tracemalloc" also snapshots every
+        # `snapshot_interval` ticks and attributes live memory to source lines
+        if memory_mode not in ("peak", "tracemalloc"):
+            raise ValueError(f"Unknown memory mode: {memory_mode}")
+        self.memory_mode = memory_mode
+        self.snapshot_interval = snapshot_interval
+        # Seconds between stack samples for the sampled flamegraph (None skips it)
+        self.sampling_interval = sampling_interval
+        # Collapsed cProfile stacks per strategy, for the differential flamegraphs
+        self.collapsed_stacks: dict[str, dict[str, float]] = {}
+        # Machine-readable results, one record per (strategy, dataset, run)
+        self.results_store = results_store if results_store is not None else ProfilingResultsStore()
+        self.dataset = ""
     
     def profile_strategies(
         self, 
@@ -26,14 +70,25 @@ class StrategyProfiler:
         cash: float, 
         failure_rate: float, 
         interval: RecordingInterval, 
-        price_path: str
+        price_path: str,
+        dataset: Optional[str] = None
     ):
+        # Label for the stored results, e.g. "1k" for data/market_data_1k.csv
+        self.dataset = dataset if dataset is not None else dataset_label(price_path)
         if os.path.isfile(price_path):
-            ticks = load_market_data(price_path)
+            load = lambda: load_market_data(price_path)
+        elif is_price_store(price_path):
+            load = lambda: load_price_store(price_path)
         elif os.path.isdir(price_path):
-            ticks = load_market_data_yf(price_path)
+            load = lambda: load_market_data_yf(price_path)
         else:
             raise ValueError(f"Invalid price path: {price_path}")
+
+        if self.memory_mode == "tracemalloc":
+            ticks, snapshots = trace_load(load)
+            self.write_allocation_report("data_load_allocations.md", f"Data Load Allocations | {self.dataset} ticks", snapshots)
+        else:
+            ticks = load()
     
         print(f"Loaded {len(ticks)} market data points.")
 
@@ -82,16 +137,60 @@ class StrategyProfiler:
     ):
         
         strategey_names = []
+        run_id = datetime.now().isoformat(timespec = "seconds")
         for strategy in strategies:
-            portfolio = Portfolio(cash=cash)
             strategy_name = strategy.__class__.__name__
             strategey_names.append(strategy_name)    
 
-            engine = ExecutionEngine(strategy, portfolio, failure_rate, recording_interval=interval)
+            # Every pass gets a fresh copy of the untouched strategy, so none of
+            # them starts from state or holdings left over by another
+            def make_engine(verbose: bool = False) -> ExecutionEngine:
+                return self.new_engine(strategy, cash, failure_rate, interval, verbose = verbose)
+
+            result = self.measure_run(make_engine(), ticks)
+            result.update(benchmark(
+                make_engine,
+                ticks,
+                repeats = self.repeats,
+                warmup = self.warmup,
+                seed = self.seed,
+                disable_gc = self.disable_gc,
+            ))
+            del result["samples_ns"]
+            print(f"{strategy_name}: median {result['wall_seconds']:.6f}s, IQR {result['wall_iqr_seconds']:.6f}s, "
+                  f"min {result['wall_min_seconds']:.6f}s over {result['repeats']} runs")
 
-            self.time_report_for_strategy(strategy_name, engine, ticks)
-            self.memory_report_for_strategy(strategy_name, engine, ticks)
+            random.seed(self.seed)
+            result["function_calls"], result["profiled_seconds"] = self.time_report_for_strategy(
+                strategy_name, make_engine(), ticks)
+            random.seed(self.seed)
+            self.latency_report_for_strategy(strategy_name, self.new_engine(
+                strategy, cash, failure_rate, interval, verbose = False, instrument = True), ticks)
+            if self.sampling_interval:
+                random.seed(self.seed)
+                self.sampled_flamegraph_for_strategy(strategy_name, make_engine(), ticks)
+            random.seed(self.seed)
+            result["peak_rss_mib"] = self.memory_report_for_strategy(
+                strategy_name, make_engine(), ticks)
+            if self.memory_mode == "tracemalloc":
+                random.seed(self.seed)
+                self.allocation_report_for_strategy(strategy_name, make_engine(), ticks)
+            result.update(
+                run_id = run_id,
+                recorded_at = datetime.now().isoformat(timespec = "seconds"),
+                strategy = strategy_name,
+                dataset = self.dataset,
+                prof_path = os.path.abspath(self.output_filename(strategy_name, "_cprofile.prof")),
+                seed = self.seed,
+                gc_disabled = int(self.disable_gc),
+            )
+            self.results_store.record(result)
             
+            # One more seeded run, with order logging, for the performance report
+            random.seed(self.seed)
+            engine = make_engine(verbose = True)
+            engine.process_ticks(ticks)
+            portfolio = engine.portfolio
             final_timestamp = ticks[-1].timestamp
             engine.record_final_state(final_timestamp)
 
@@ -101,29 +200,99 @@ class StrategyProfiler:
 
             self.print_portfolio_summary(portfolio, metrics, current_prices)
                 
-            generate_performance_report(metrics, periodic_returns, self.output_filename(strategy_name,"_performance.md"))
+            generate_performance_report(metrics, periodic_returns, self.output_filename(strategy_name,"_performance.md"), charts=self.charts)
             self.write_portfolio_history(engine.portfolio_history, strategy_name)
-        write_report(strategies = strategey_names)
+        self.diff_flamegraphs(strategey_names)
+        write_report(strategies = strategey_names, generate_plots_flag = self.charts, store = self.results_store)
+
+    def new_engine(self, strategy: Strategy, cash: float, failure_rate: float, interval: RecordingInterval, verbose: bool = True, instrument: bool = False) -> ExecutionEngine:
+        """Engine around a fresh copy of `strategy` and a new portfolio."""
+        return ExecutionEngine(copy.deepcopy(strategy), Portfolio(cash=cash), failure_rate, recording_interval=interval, verbose=verbose, instrument=instrument)
+
+    def measure_run(self, engine: ExecutionEngine, ticks: list[MarketDataPoint]) -> dict:
+        """CPU time, per-tick latency percentiles and net allocated blocks of one seeded run."""
+        return measure_run(engine, ticks, self.seed)
 
     def time_report_for_strategy(
         self,
         strategy_name: str,
         engine: ExecutionEngine,
         ticks: list[MarketDataPoint]
-    ):
+    ) -> tuple[int, float]:
+        """cProfile one run; returns (function calls, total profiled seconds)."""
         profiler = cProfile.Profile()
         profiler.enable()
         engine.process_ticks(ticks)
         profiler.disable()
         profiler.dump_stats(self.output_filename(strategy_name, "_cprofile.prof"))
         print(f"Time report written to: {self.output_filename(strategy_name, '_cprofile.prof')}")
+        stats = pstats.Stats(profiler)
+        self.collapsed_stacks[strategy_name] = collapse_pstats(stats)
+        self.write_flamegraph(strategy_name, "", self.collapsed_stacks[strategy_name], "us")
+        return stats.total_calls, stats.total_tt
+
+    def write_flamegraph(self, strategy_name: str, kind: str, folded: dict[str, float], unit: str):
+        """Write `<Strategy><kind>.folded` and `<Strategy><kind>_flamegraph.svg`."""
+        write_collapsed(folded, self.output_filename(strategy_name, kind + ".folded"))
+        output_file = self.output_filename(strategy_name, kind + "_flamegraph.svg")
+        title = f"{strategy_name} | {self.dataset} ticks" + (" (sampled)" if kind else "")
+        with open(output_file, "w") as f:
+            f.write(flamegraph_svg(folded, title, unit))
+        print(f"Flamegraph written to: {output_file}")
+
+    def sampled_flamegraph_for_strategy(
+        self,
+        strategy_name: str,
+        engine: ExecutionEngine,
+        ticks: list[MarketDataPoint]
+    ) -> dict[str, float]:
+        """Flamegraph of one run sampled by `SamplingProfiler`, which is lighter than cProfile."""
+        with SamplingProfiler(self.sampling_interval) as sampler:
+            engine.process_ticks(ticks)
+        folded = sampler.collapsed()
+        self.write_flamegraph(strategy_name, "_sampled", folded, "samples")
+        return folded
+
+    def diff_flamegraphs(self, strategy_names: list[str]):
+        """Differential flamegraph of every strategy against the first one."""
+        if not strategy_names or strategy_names[0] not in self.collapsed_stacks:
+            return
+        base = strategy_names[0]
+        for name in strategy_names[1:]:
+            if name not in self.collapsed_stacks:
+                continue
+            output_file = self.output_filename(f"{base}_vs_{name}", "_diff_flamegraph.svg")
+            with open(output_file, "w") as f:
+                f.write(diff_flamegraph_svg(self.collapsed_stacks[base], self.collapsed_stacks[name],
+                                            f"{base} -> {name} | {self.dataset} ticks"))
+            print(f"Differential flamegraph written to: {output_file}")
     
+    def latency_report_for_strategy(
+        self,
+        strategy_name: str,
+        engine: ExecutionEngine,
+        ticks: list[MarketDataPoint]
+    ) -> dict:
+        """Per-stage latency histograms of one instrumented run, written as Markdown."""
+        engine.process_ticks(ticks)
+        summary = engine.get_latency_summary()
+        output_file = self.output_filename(strategy_name, "_latency.md")
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        with open(output_file, "w") as f:
+            f.write(f"# Tick Latency for {strategy_name} | {self.dataset} ticks\n\n")
+            f.write(latency_table(summary))
+        print(f"Latency report written to: {output_file}")
+        return summary
+
     def memory_report_for_strategy(
         self,
         strategy_name: str,
         engine: ExecutionEngine,
         ticks: list[MarketDataPoint]
     ):
+        # memory_profiler is only needed here, so import it on first use
+        from memory_profiler import memory_usage
+
         mem = memory_usage((engine.process_ticks, (ticks,), {}), max_usage = True)
         output_file = self.output_filename(strategy_name, "_memory.md")
 
@@ -131,6 +300,27 @@ class StrategyProfiler:
         with open(output_file, "w") as f:
             f.write(str(mem) + " MiB")
         print(f"Memory report written to: {output_file}")
+        return mem
+
+    def allocation_report_for_strategy(
+        self,
+        strategy_name: str,
+        engine: ExecutionEngine,
+        ticks: list[MarketDataPoint]
+    ) -> list[dict]:
+        """Snapshot one run every `snapshot_interval` ticks; returns the top allocating lines."""
+        snapshots = trace_allocations(engine.step, ticks, self.snapshot_interval)
+        return self.write_allocation_report(
+            strategy_name + "_allocations.md", f"Allocations for {strategy_name} | {self.dataset} ticks", snapshots)
+
+    def write_allocation_report(self, file_name: str, title: str, snapshots: list) -> list[dict]:
+        rows = attribute_allocations(snapshots)
+        output_file = self.output_filename(file_name, "")
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        with open(output_file, "w") as f:
+            f.write(allocations_markdown(title, snapshots, rows))
+        print(f"Allocation report written to: {output_file}")
+        return rows
 
     def write_portfolio_history(self, portfolio_history: list[tuple[datetime, float, float]], strategy_name: str):
         output_file = strategy_name + "_portfolio_history.csv"
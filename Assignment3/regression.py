@@ -0,0 +1,246 @@
+"""Benchmark baselines per git revision and regression detection.
+
+Each run benchmarks the strategies on a deterministic generated dataset,
+records the results under the current git revision, and compares them with
+a baseline revision from the same results file:
+
+    PYTHONPATH=.. python regression.py                  # compare with the previous revision
+    PYTHONPATH=.. python regression.py --baseline 1a2b3c4
+
+The exit status is 1 when any strategy regressed beyond tolerance.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from datetime import datetime
+from typing import Iterable, Optional
+
+from Assignment3.benchmark import benchmark, measure_run, traced_peak_mib
+from Assignment3.results_store import BASE_DIR, ProfilingResultsStore
+from Assignment3.scaling import ENGINE_MODES, STRATEGIES, size_label
+from trading_lib.data_generator import generate_ticks
+from trading_lib.engine import ExecutionEngine
+from trading_lib.portfolio import Portfolio
+
+DEFAULT_BENCHMARK_STORE_PATH = os.path.join(BASE_DIR, "Assignment3", "benchmark_results.sqlite")
+
+# Relative slowdowns tolerated before a change counts as a regression
+WALL_TOLERANCE = 0.05
+LATENCY_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.10
+# Wall-time changes within this many IQRs of the noisier run are noise
+NOISE_IQRS = 2.0
+
+
+def git_revision(cwd: str = BASE_DIR) -> str:
+    """Short hash of HEAD, with "-dirty" when tracked files have uncommitted changes."""
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd = cwd,
+                                  capture_output = True, text = True, check = True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd = cwd,
+                                capture_output = True, text = True, check = True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return revision + "-dirty" if status.strip() else revision
+
+
+def run_benchmarks(
+    strategies: dict,
+    ticks: list,
+    dataset: str,
+    revision: str,
+    mode: str = "1s",
+    quantity: int = 10,
+    cash: float = 10_000_000,
+    repeats: int = 5,
+    warmup: int = 1,
+    seed: int = 0,
+    store: Optional[ProfilingResultsStore] = None,
+) -> dict[str, dict]:
+    """{strategy: result} for each strategy, recorded in `store` under `revision` when given."""
+    run_id = datetime.now().isoformat(timespec = "seconds")
+    results = {}
+    for name, factory in strategies.items():
+        def make_engine():
+            return ExecutionEngine(factory(quantity), Portfolio(cash = cash), verbose = False, **ENGINE_MODES[mode])
+
+        result = measure_run(make_engine(), ticks, seed)
+        result.update(benchmark(make_engine, ticks, repeats = repeats, warmup = warmup, seed = seed))
+        del result["samples_ns"]
+        result.update(
+            run_id = run_id,
+            recorded_at = datetime.now().isoformat(timespec = "seconds"),
+            revision = revision,
+            strategy = name,
+            dataset = dataset,
+            engine_mode = mode,
+            seed = seed,
+            gc_disabled = 0,
+            peak_traced_mib = traced_peak_mib(make_engine, ticks, seed),
+        )
+        print(f"{name}: {result['ticks'] / result['wall_seconds']:,.0f} ticks/s, "
+              f"p99 {result.get('latency_p99_us', float('nan')):.1f}us, {result['peak_traced_mib']:.2f} MiB")
+        results[name] = result
+        if store is not None:
+            store.record(result)
+    return results
+
+
+def baseline_results(
+    store: ProfilingResultsStore, revision: str, dataset: str, strategies: Iterable[str], mode: str
+) -> dict[str, dict]:
+    """Latest result per strategy recorded at `revision` on `dataset` in engine mode `mode`."""
+    results = {}
+    for name in strategies:
+        runs = store.runs(strategy = name, dataset = dataset, revision = revision, engine_mode = mode)
+        if runs:
+            results[name] = runs[-1]
+    return results
+
+
+def compare_results(
+    baseline: dict[str, dict],
+    current: dict[str, dict],
+    wall_tolerance: float = WALL_TOLERANCE,
+    latency_tolerance: float = LATENCY_TOLERANCE,
+    memory_tolerance: float = MEMORY_TOLERANCE,
+    noise_iqrs: float = NOISE_IQRS,
+) -> list[dict]:
+    """
+    One comparison per strategy present in both runs.
+
+    Wall time regresses when the median grows by more than `wall_tolerance`
+    of the baseline and by more than `noise_iqrs` times the larger of the two
+    IQRs, so a noisy machine does not fail the run. p99 tick latency and
+    peak traced memory regress when they grow by more than their tolerance.
+    """
+    comparisons = []
+    for name in current:
+        if name not in baseline:
+            continue
+        base, new = baseline[name], current[name]
+        regressions = []
+
+        slowdown = new["wall_seconds"] - base["wall_seconds"]
+        noise = noise_iqrs * max(base["wall_iqr_seconds"] or 0.0, new["wall_iqr_seconds"] or 0.0)
+        if slowdown > wall_tolerance * base["wall_seconds"] and slowdown > noise:
+            regressions.append("throughput")
+        for field, label, tolerance in (("latency_p99_us", "p99 latency", latency_tolerance),
+                                        ("peak_traced_mib", "memory", memory_tolerance)):
+            if base.get(field) and new.get(field) and new[field] > base[field] * (1 + tolerance):
+                regressions.append(label)
+
+        comparisons.append({
+            "strategy": name,
+            "baseline_ticks_per_second": base["ticks"] / base["wall_seconds"],
+            "ticks_per_second": new["ticks"] / new["wall_seconds"],
+            "baseline_latency_p99_us": base.get("latency_p99_us"),
+            "latency_p99_us": new.get("latency_p99_us"),
+            "baseline_peak_traced_mib": base.get("peak_traced_mib"),
+            "peak_traced_mib": new.get("peak_traced_mib"),
+            "regressions": regressions,
+        })
+    return comparisons
+
+
+def _change(before: Optional[float], after: Optional[float], spec: str) -> str:
+    if before is None or after is None:
+        return "n/a"
+    pct = (after / before - 1) * 100 if before else float("nan")
+    return f"{before:{spec}} -> {after:{spec}} ({pct:+.1f}%)"
+
+
+def format_diff_table(comparisons: list[dict], baseline: str, revision: str) -> str:
+    """Markdown table of throughput, p99 tick latency and peak memory per strategy."""
+    lines = [
+        f"Benchmark diff: {baseline} -> {revision}",
+        "",
+        "| Strategy | Ticks/s | p99 latency (us) | Peak traced (MiB) | Status |",
+        "|---|---|---|---|---|",
+    ]
+    for c in comparisons:
+        status = "REGRESSION: " + ", ".join(c["regressions"]) if c["regressions"] else "ok"
+        lines.append(
+            f"| {c['strategy']} "
+            f"| {_change(c['baseline_ticks_per_second'], c['ticks_per_second'], ',.0f')} "
+            f"| {_change(c['baseline_latency_p99_us'], c['latency_p99_us'], '.1f')} "
+            f"| {_change(c['baseline_peak_traced_mib'], c['peak_traced_mib'], '.2f')} "
+            f"| {status} |"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(description = "Benchmark strategies and compare against a baseline revision")
+    parser.add_argument('-b', "--baseline", type = str, default = None,
+                        help = "Revision to compare against (default: the most recent other revision recorded)")
+    parser.add_argument("--revision", type = str, default = None,
+                        help = "Label for this run (default: the current git revision)")
+    parser.add_argument("--strategies", nargs = "+", default = list(STRATEGIES), choices = list(STRATEGIES))
+    parser.add_argument('-m', "--mode", type = str, default = "1s", choices = list(ENGINE_MODES))
+    parser.add_argument('-t', "--ticks", type = int, default = 100_000)
+    parser.add_argument('-k', "--symbols", type = int, default = 1)
+    parser.add_argument('-r', "--repeats", type = int, default = 5)
+    parser.add_argument('-w', "--warmup", type = int, default = 1)
+    parser.add_argument('-s', "--seed", type = int, default = 0)
+    parser.add_argument("--tolerance", type = float, default = WALL_TOLERANCE,
+                        help = "Relative wall-time slowdown tolerated (also has to exceed the noise)")
+    parser.add_argument("--latency_tolerance", type = float, default = LATENCY_TOLERANCE)
+    parser.add_argument("--memory_tolerance", type = float, default = MEMORY_TOLERANCE)
+    parser.add_argument("--no_record", action = "store_true",
+                        help = "Compare without storing this run")
+    parser.add_argument("--store_path", type = str, default = DEFAULT_BENCHMARK_STORE_PATH)
+    return parser.parse_args(args)
+
+
+def main(args) -> int:
+    parsed_args = parse_args(args)
+    store = ProfilingResultsStore(parsed_args.store_path)
+    revision = parsed_args.revision or git_revision()
+    dataset = f"{size_label(parsed_args.ticks)}x{parsed_args.symbols}"
+    strategies = {name: STRATEGIES[name] for name in parsed_args.strategies}
+
+    baseline = parsed_args.baseline
+    if baseline is None:
+        # Only runs in the same engine mode are comparable
+        previous = [r for r in store.revisions(dataset, parsed_args.mode) if r != revision]
+        baseline = previous[-1] if previous else None
+
+    ticks = list(generate_ticks(parsed_args.ticks, parsed_args.symbols, seed = parsed_args.seed))
+    print(f"Benchmarking revision {revision} on {dataset} in {parsed_args.mode} mode")
+    current = run_benchmarks(
+        strategies, ticks, dataset, revision,
+        mode = parsed_args.mode,
+        repeats = parsed_args.repeats,
+        warmup = parsed_args.warmup,
+        seed = parsed_args.seed,
+        store = None if parsed_args.no_record else store,
+    )
+
+    if baseline is None:
+        print("No baseline revision recorded yet; this run is the first baseline.")
+        return 0
+    previous_results = baseline_results(store, baseline, dataset, strategies, parsed_args.mode)
+    if not previous_results:
+        print(f"No results recorded for baseline {baseline} on {dataset} in {parsed_args.mode} mode.")
+        return 0
+
+    comparisons = compare_results(
+        previous_results, current,
+        wall_tolerance = parsed_args.tolerance,
+        latency_tolerance = parsed_args.latency_tolerance,
+        memory_tolerance = parsed_args.memory_tolerance,
+    )
+    print(format_diff_table(comparisons, baseline, revision))
+    regressed = [c["strategy"] for c in comparisons if c["regressions"]]
+    if regressed:
+        print(f"Regression beyond tolerance in: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,147 +1,58 @@
 from __future__ import annotations
 
 import os
-import re
 import pstats
-import matplotlib.pyplot as plt
-import io
-import base64
 from typing import Iterable, Optional, Tuple
 from datetime import datetime
 
+from trading_lib.reporting import load_pyplot
+from Assignment3.results_store import ProfilingResultsStore
+
 
 # BASE_DIR = repo root (one level above this file's folder)
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
-def _results_dir_for_size(data_size: str) -> str:
-    # Check both possible locations: root level and Assignment3 subdirectory
-    root_path = os.path.join(BASE_DIR, f"Assignment_3_Results_{data_size}")
-    sub_path = os.path.join(BASE_DIR, "Assignment3", f"Assignment_3_Results_{data_size}")
-    
-    if os.path.exists(root_path):
-        return root_path
-    else:
-        return sub_path
-
 def _ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def get_prof_file_name(strategy_name: str, data_size: str) -> str:
-    return os.path.join(
-        _results_dir_for_size(data_size),
-        f"{strategy_name}_cprofile.prof",
-    )
-
-def _readable_prof_path(strategy_name: str, data_size: str) -> str:
-    return os.path.join(
-        _results_dir_for_size(data_size),
-        f"{strategy_name}_readable_prof.md",
-    )
+def _fmt(value, spec: str) -> str:
+    return format(value, spec) if isinstance(value, (int, float)) else ""
 
-def _memory_path(strategy_name: str, data_size: str) -> str:
-    return os.path.join(
-        _results_dir_for_size(data_size),
-        f"{strategy_name}_memory.md",
-    )
 
-def prof_to_readable(strategy_name: str, data_size: str) -> str:
+def prof_to_readable(result: dict) -> Optional[str]:
     """
-    Convert a .prof file to a readable Markdown dump limited to top 10 cumulative funcs
+    Convert a stored result's .prof file to a readable Markdown dump limited to top 10 cumulative funcs,
+    written next to the .prof file. Returns None if the .prof file is missing.
     """
-    prof_file = get_prof_file_name(strategy_name, data_size)
-    out_dir = _results_dir_for_size(data_size)
-    _ensure_dir(out_dir)
-
-    output_file = _readable_prof_path(strategy_name, data_size)
+    prof_file = result.get("prof_path")
+    if not prof_file or not os.path.exists(prof_file):
+        return None
 
+    output_file = prof_file.replace("_cprofile.prof", "_readable_prof.md")
     with open(output_file, "w", encoding="utf-8") as f:
-        f.write(f"# Profiling Summary for {strategy_name} | {data_size} ticks\n\n")
+        f.write(f"# Profiling Summary for {result['strategy']} | {result['dataset']} ticks\n\n")
         pstats.Stats(prof_file, stream=f).sort_stats("cumulative").print_stats(10)
 
     return output_file
 
-def _parse_prof_readable_md(md_path: str) -> dict:
-    """
-    Parse a *_readable_prof.md file to extract:
-      - function_calls (int)
-      - total_seconds (float)
-      - avg_ms_per_call (float)
-    Returns {} if not found/missing.
-    """
-    if not os.path.exists(md_path):
-        return {}
-
-    with open(md_path, "r", encoding="utf-8") as f:
-        text = f.read()
-
-    m = re.search(
-        r"(\d[\d,]*)\s+function\s+calls\s+in\s+([\d\.]+)\s+seconds",
-        text,
-        flags=re.IGNORECASE,
-    )
-    if not m:
-        return {}
-
-    calls = int(m.group(1).replace(",", ""))
-    secs = float(m.group(2))
-    avg_ms = (secs / calls) * 1000 if calls > 0 else None
-
-    return {
-        "function_calls": calls,
-        "total_seconds": secs,
-        "avg_ms_per_call": avg_ms,
-    }
-
-def _parse_memory_md(md_path: str) -> Optional[float]:
-    """
-    Parse a *_memory.md file to extract max memory usage in MiB.
-    Returns None if not found/missing.
-    """
-    if not os.path.exists(md_path):
-        return None
-
-    with open(md_path, "r", encoding="utf-8") as f:
-        text = f.read().strip()
-
-    m = re.search(r"([\d\.]+)\s*MiB", text, flags=re.IGNORECASE)
-    if not m:
-        return None
-
-    return float(m.group(1))
-
 def prof_runtime_summary(
     strategy_names: Iterable[str],
     data_sizes: Iterable[str],
     summary_filename: str = "profiling_runtime_summary.md",
     regenerate_readables: bool = True,
+    store: Optional[ProfilingResultsStore] = None,
 ) -> str:
     """
     For every (strategy, data_size):
-      - (Optionally) regenerate the readable cProfile MD via prof_to_readable
-      - Parse runtime metrics from *_readable_prof.md
+      - Read the latest runtime results from the profiling results store
+      - (Optionally) regenerate the readable cProfile MD next to its .prof file
       - Write a Markdown table comparing the metrics
 
     Returns: absolute path to the summary MD file.
     """
-    rows: list[Tuple[str, str, Optional[int], Optional[float], Optional[float]]] = []
-
-    for s in strategy_names:
-        for d in data_sizes:
-            if regenerate_readables:
-                try:
-                    prof_to_readable(s, d)
-                except FileNotFoundError:
-                    pass
-
-            md_path = _readable_prof_path(s, d)
-            metrics = _parse_prof_readable_md(md_path)
-
-            calls = metrics.get("function_calls")
-            secs = metrics.get("total_seconds")
-            avg_ms = metrics.get("avg_ms_per_call")
-
-            rows.append((s, d, calls, secs, avg_ms))
+    store = store if store is not None else ProfilingResultsStore()
+    results = store.latest_table(strategy_names, data_sizes)
 
     out_dir = os.path.join(BASE_DIR, "Assignment3")
     _ensure_dir(out_dir)
@@ -150,18 +61,30 @@ def prof_runtime_summary(
     with open(out_path, "w", encoding="utf-8") as f:
         f.write("# Runtime Profiling Summary\n\n")
         f.write(
-            "| Strategy | Data Size | Function Calls | Total Time (s) | Avg Time / Call (ms) |\n"
-            "|----------|-----------|----------------|----------------|---------------------|\n"
+            "| Strategy | Data Size | Median Wall (s) | IQR (s) | Min (s) | Runs | CPU Time (s) | p50 / Tick (µs) | p90 / Tick (µs) | p99 / Tick (µs) | Max / Tick (µs) | Function Calls |\n"
+            "|----------|-----------|-----------------|---------|---------|------|--------------|-----------------|-----------------|-----------------|-----------------|----------------|\n"
         )
-        for s, d, calls, secs, avg_ms in rows:
-            calls_str = f"{calls:,}" if isinstance(calls, int) else ""
-            secs_str = f"{secs:.6f}" if isinstance(secs, (int, float)) else ""
-            avg_ms_str = f"{avg_ms:.3f}" if isinstance(avg_ms, (int, float)) else ""
-            f.write(f"| {s} | {d} | {calls_str} | {secs_str} | {avg_ms_str} |\n")
+        for s in strategy_names:
+            for d in data_sizes:
+                r = results.get((s, d))
+                if r is None:
+                    f.write(f"| {s} | {d} | | | | | | | | | | |\n")
+                    continue
+                if regenerate_readables:
+                    prof_to_readable(r)
+                f.write(
+                    f"| {s} | {d} | {_fmt(r['wall_seconds'], '.6f')} | {_fmt(r['wall_iqr_seconds'], '.6f')} "
+                    f"| {_fmt(r['wall_min_seconds'], '.6f')} | {_fmt(r['repeats'], 'd')} | {_fmt(r['cpu_seconds'], '.6f')} "
+                    f"| {_fmt(r['latency_p50_us'], '.2f')} | {_fmt(r['latency_p90_us'], '.2f')} "
+                    f"| {_fmt(r['latency_p99_us'], '.2f')} | {_fmt(r['latency_max_us'], '.2f')} "
+                    f"| {_fmt(r['function_calls'], ',')} |\n"
+                )
 
         f.write(
-            "\n> Notes: Parsed from each `*_readable_prof.md` line matching "
-            "`<N> function calls in <S> seconds`. Average time per call is `S / N * 1000`.\n"
+            "\n> Notes: Latest run per strategy and data size from the profiling results store. "
+            "Wall times summarize repeated runs on fresh instances after warmup; "
+            "CPU time and per-tick latencies come from one separate timed run, "
+            "function calls from a cProfile run.\n"
         )
 
     return out_path
@@ -169,34 +92,32 @@ def prof_runtime_summary(
 def prof_memory_summary(
     strategy_names: Iterable[str],
     data_sizes: Iterable[str],
+    store: Optional[ProfilingResultsStore] = None,
 ) -> str:
     """
     For every (strategy, data_size):
-      - Parse memory metrics from *_memory.md
+      - Read the latest memory results from the profiling results store
       - Return a Markdown table as a string
 
     Returns: Markdown table string.
     """
-    rows: list[Tuple[str, str, Optional[float]]] = []
-
-    for s in strategy_names:
-        for d in data_sizes:
-            mem_path = _memory_path(s, d)
-            mem_mib = _parse_memory_md(mem_path)
-            rows.append((s, d, mem_mib))
+    store = store if store is not None else ProfilingResultsStore()
+    results = store.latest_table(strategy_names, data_sizes)
 
     lines = []
     lines.append("# Memory Profiling Summary\n\n")
     lines.append(
-        "| Strategy | Data Size | Max Memory Usage (MiB) |\n"
-        "|----------|-----------|----------------------|\n"
+        "| Strategy | Data Size | Peak RSS (MiB) | Net Allocated Blocks |\n"
+        "|----------|-----------|----------------|----------------------|\n"
     )
-    for s, d, mem_mib in rows:
-        mem_str = f"{mem_mib:.2f}" if isinstance(mem_mib, (int, float)) else ""
-        lines.append(f"| {s} | {d} | {mem_str} |\n")
+    for s in strategy_names:
+        for d in data_sizes:
+            r = results.get((s, d), {})
+            lines.append(f"| {s} | {d} | {_fmt(r.get('peak_rss_mib'), '.2f')} | {_fmt(r.get('allocated_blocks'), ',')} |\n")
 
     lines.append(
-        "\n> Notes: Parsed from each `*_memory.md` file showing peak memory usage.\n"
+        "\n> Notes: Peak process RSS sampled by memory_profiler during the run, and the net change "
+        "in allocated Python memory blocks (`sys.getallocatedblocks`) over the run.\n"
     )
 
     return "".join(lines)
@@ -204,33 +125,19 @@ def prof_memory_summary(
 def generate_plots(
     strategy_names: Iterable[str],
     data_sizes: Iterable[str],
-    out_dir: Optional[str] = None
+    out_dir: Optional[str] = None,
+    store: Optional[ProfilingResultsStore] = None,
 ) -> Tuple[str, str]:
     """
-    Generate runtime and memory usage plots comparing strategies as base64-encoded images.
-    Returns: tuple of (runtime_plot_base64_md, memory_plot_base64_md)
+    Generate runtime and memory usage plots comparing strategies from the profiling results store.
+    Returns: tuple of (runtime_plot_path, memory_plot_path), relative to the report directory
     """
-    # Collect data
-    runtime_data = []
-    memory_data = []
-    
-    for s in strategy_names:
-        for d in data_sizes:
-            # Runtime data
-            md_path = _readable_prof_path(s, d)
-            metrics = _parse_prof_readable_md(md_path)
-            secs = metrics.get("total_seconds")
-            
-            # Memory data
-            mem_path = _memory_path(s, d)
-            mem_mib = _parse_memory_md(mem_path)
-            
-            if secs is not None:
-                runtime_data.append((s, d, secs))
-            if mem_mib is not None:
-                memory_data.append((s, d, mem_mib))
+    store = store if store is not None else ProfilingResultsStore()
+    runtime_data = time_metrics(strategy_names, data_sizes, store)
+    memory_data = memory_metrics(strategy_names, data_sizes, store)
     
     # Prepare for plotting
+    plt = load_pyplot()
     data_size_list = list(data_sizes)
     
     # Runtime plot
@@ -250,7 +157,7 @@ def generate_plots(
             runtime_ax.plot(data_size_list, times, marker='o', label=strategy)
     
     runtime_ax.set_xlabel('Data Size')
-    runtime_ax.set_ylabel('Total Time (s)')
+    runtime_ax.set_ylabel('Wall Time (s)')
     runtime_ax.set_title('Runtime Performance Comparison')
     runtime_ax.legend()
     runtime_ax.grid(True, alpha=0.3)
@@ -279,7 +186,7 @@ def generate_plots(
             memory_ax.plot(data_size_list, memories, marker='o', label=strategy)
     
     memory_ax.set_xlabel('Data Size')
-    memory_ax.set_ylabel('Max Memory Usage (MiB)')
+    memory_ax.set_ylabel('Peak RSS (MiB)')
     memory_ax.set_title('Memory Usage Comparison')
     memory_ax.legend()
     memory_ax.grid(True, alpha=0.3)
@@ -307,26 +214,23 @@ def generate_plots(
    
     return rel_runtime, rel_memory
 
-def memory_metrics(strategies: list[str], data_sizes: list[str]) -> str:
-    memory_metrics = []
-    for s in strategies:
-        for d in data_sizes:
-            mem_path = _memory_path(s, d)
-            mem_mib = _parse_memory_md(mem_path)
-            if mem_mib is not None:
-                memory_metrics.append((s, d, mem_mib))
-    return memory_metrics
-
-def time_metrics(strategies: list[str], data_sizes: list[str]) -> str:
-    time_metrics = []
-    for s in strategies:
-        for d in data_sizes:
-            md_path = _readable_prof_path(s, d)
-            metrics = _parse_prof_readable_md(md_path)
-            secs = metrics.get("total_seconds")
-            if secs is not None:
-                time_metrics.append((s, d, secs))
-    return time_metrics
+def memory_metrics(
+    strategies: Iterable[str],
+    data_sizes: Iterable[str],
+    store: Optional[ProfilingResultsStore] = None,
+) -> list[tuple[str, str, float]]:
+    store = store if store is not None else ProfilingResultsStore()
+    results = store.latest_table(strategies, data_sizes)
+    return [(s, d, r["peak_rss_mib"]) for (s, d), r in results.items() if r["peak_rss_mib"] is not None]
+
+def time_metrics(
+    strategies: Iterable[str],
+    data_sizes: Iterable[str],
+    store: Optional[ProfilingResultsStore] = None,
+) -> list[tuple[str, str, float]]:
+    store = store if store is not None else ProfilingResultsStore()
+    results = store.latest_table(strategies, data_sizes)
+    return [(s, d, r["wall_seconds"]) for (s, d), r in results.items() if r["wall_seconds"] is not None]
 
 def total_for(strategy: str, metrics: list[tuple[str, str, float]]) -> float:
     return sum(v for s, _, v in metrics if s.lower() == strategy.lower())
@@ -383,20 +287,28 @@ def write_narrative(
     
 def write_report(
     strategies: list[str],
-    data_sizes: list[str] = ["1k", "10k", "100k"],
+    data_sizes: Optional[list[str]] = None,
     report_filename: str = "complexity_report.md",
     regenerate_readables: bool = True,
     generate_plots_flag: bool = True,
+    store: Optional[ProfilingResultsStore] = None,
 ) -> str:
     """
     Builds a single Markdown report that embeds the runtime and memory summary tables.
-    Optionally generates comparison plots.
+    Optionally generates comparison plots. All numbers are read from the profiling
+    results store; `data_sizes` defaults to every dataset recorded for the strategies.
     Returns the absolute path to the report.
     """
+    store = store if store is not None else ProfilingResultsStore()
+    if data_sizes is None:
+        data_sizes = list(dict.fromkeys(
+            r["dataset"] for s in strategies for r in store.runs(strategy=s)
+        ))
+
     runtime_table_path = prof_runtime_summary(
-        strategies, data_sizes, regenerate_readables=regenerate_readables
+        strategies, data_sizes, regenerate_readables=regenerate_readables, store=store
     )
-    memory_table_md = prof_memory_summary(strategies, data_sizes)
+    memory_table_md = prof_memory_summary(strategies, data_sizes, store=store)
 
     with open(runtime_table_path, "r") as f:
         runtime_table_md = f.read()
@@ -412,7 +324,7 @@ def write_report(
         try:
             # pass the Assignment3/plots dir so paths are consistent
             plots_dir = os.path.join(BASE_DIR, "Assignment3", "plots")
-            runtime_rel, memory_rel = generate_plots(strategies, data_sizes, out_dir=plots_dir)
+            runtime_rel, memory_rel = generate_plots(strategies, data_sizes, out_dir=plots_dir, store=store)
             runtime_plot_md = f"\n![Runtime Comparison]({runtime_rel})\n"
             memory_plot_md = f"\n![Memory Comparison]({memory_rel})\n"
         except Exception as e:
@@ -420,8 +332,8 @@ def write_report(
 
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    memory_stats = memory_metrics(strategies, data_sizes)
-    time_stats = time_metrics(strategies, data_sizes)
+    memory_stats = memory_metrics(strategies, data_sizes, store)
+    time_stats = time_metrics(strategies, data_sizes, store)
 
     narrative = write_narrative(
         memory_metrics=memory_stats,
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional
+
+# BASE_DIR = repo root (one level above this file's folder)
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_STORE_PATH = os.path.join(BASE_DIR, "Assignment3", "profiling_results.sqlite")
+
+# Column name -> SQLite type, in table order
+RESULT_COLUMNS = {
+    "run_id": "TEXT",
+    "recorded_at": "TEXT",
+    "strategy": "TEXT",
+    "dataset": "TEXT",
+    "ticks": "INTEGER",
+    "wall_seconds": "REAL",
+    "wall_iqr_seconds": "REAL",
+    "wall_min_seconds": "REAL",
+    "repeats": "INTEGER",
+    "seed": "INTEGER",
+    "gc_disabled": "INTEGER",
+    "cpu_seconds": "REAL",
+    "latency_p50_us": "REAL",
+    "latency_p90_us": "REAL",
+    "latency_p99_us": "REAL",
+    "latency_max_us": "REAL",
+    "peak_rss_mib": "REAL",
+    "allocated_blocks": "INTEGER",
+    "function_calls": "INTEGER",
+    "profiled_seconds": "REAL",
+    "prof_path": "TEXT",
+    # Scaling suite
+    "symbols": "INTEGER",
+    "engine_mode": "TEXT",
+    "peak_traced_mib": "REAL",
+    # Regression runner: git revision the run was made at
+    "revision": "TEXT",
+}
+
+
+class ProfilingResultsStore:
+    """SQLite store of profiling results, one row per (strategy, dataset, run).
+
+    Written by `StrategyProfiler` and read directly by the Assignment 3
+    reporting, so no numbers have to be parsed back out of Markdown.
+    Columns missing from a record are stored as NULL.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            columns = ", ".join(f"{name} {kind}" for name, kind in RESULT_COLUMNS.items())
+            conn.execute(f"CREATE TABLE IF NOT EXISTS results (id INTEGER PRIMARY KEY, {columns})")
+            # Columns added after a store was created
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+            for name, kind in RESULT_COLUMNS.items():
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE results ADD COLUMN {name} {kind}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record(self, result: dict) -> None:
+        unknown = set(result) - set(RESULT_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown result fields: {sorted(unknown)}")
+        names = list(result)
+        placeholders = ", ".join("?" for _ in names)
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO results ({', '.join(names)}) VALUES ({placeholders})",
+                [result[name] for name in names],
+            )
+
+    def runs(
+        self,
+        strategy: Optional[str] = None,
+        dataset: Optional[str] = None,
+        revision: Optional[str] = None,
+        engine_mode: Optional[str] = None,
+    ) -> list[dict]:
+        """All matching results, oldest first."""
+        query = "SELECT * FROM results"
+        clauses, params = [], []
+        for name, value in (("strategy", strategy), ("dataset", dataset), ("revision", revision),
+                            ("engine_mode", engine_mode)):
+            if value is not None:
+                clauses.append(f"{name} = ?")
+                params.append(value)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(query + " ORDER BY id", params)]
+
+    def revisions(self, dataset: Optional[str] = None, engine_mode: Optional[str] = None) -> list[str]:
+        """Recorded revisions, ordered by their most recent run (oldest first)."""
+        query = "SELECT revision FROM results WHERE revision IS NOT NULL"
+        params = []
+        for name, value in (("dataset", dataset), ("engine_mode", engine_mode)):
+            if value is not None:
+                query += f" AND {name} = ?"
+                params.append(value)
+        with self._connect() as conn:
+            rows = conn.execute(query + " GROUP BY revision ORDER BY MAX(id)", params)
+            return [row["revision"] for row in rows]
+
+    def latest(self, strategy: str, dataset: str) -> Optional[dict]:
+        """Most recent result for (strategy, dataset), or None."""
+        runs = self.runs(strategy, dataset)
+        return runs[-1] if runs else None
+
+    def latest_table(self, strategies: Iterable[str], datasets: Iterable[str]) -> dict:
+        """{(strategy, dataset): latest result} for every pair that has one."""
+        table = {}
+        for s in strategies:
+            for d in datasets:
+                result = self.latest(s, d)
+                if result is not None:
+                    table[(s, d)] = result
+        return table
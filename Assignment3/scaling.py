@@ -0,0 +1,287 @@
+"""Empirical scaling of strategies and engine modes across dataset shapes.
+
+Runs every shipped strategy in every engine mode over deterministic
+generated datasets along two axes: total ticks (at a fixed symbol count)
+and symbol count (at a fixed number of ticks). Wall time and peak traced
+memory are fitted to power laws, value ~ c * n ** k, in log-log space, and
+exponents above the expected one for the axis are flagged.
+
+    PYTHONPATH=.. python scaling.py --ticks 1000 10000 100000 --symbols 1 10 100
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+from Assignment2.BenchmarkStrategy import BenchmarkStrategy
+from Assignment2.MACDStrategy import MACDStrategy
+from Assignment2.MovingAverageStrategy import MovingAverageStrategy
+from Assignment2.RSIStrategy import RSIStrategy
+from Assignment2.VolatilityBreakoutStrategy import VolatilityBreakoutStrategy
+from Assignment3.benchmark import benchmark, traced_peak_mib
+from Assignment3.results_store import BASE_DIR, ProfilingResultsStore
+from Assignment3.strategies import NaiveMovingAverageStrategy, OptimizedMovingAverageStrategy
+from trading_lib.data_generator import generate_ticks
+from trading_lib.engine import ExecutionEngine
+from trading_lib.models import RecordingInterval
+from trading_lib.portfolio import Portfolio
+from trading_lib.strategies import MomentumStrategy, MovingAverageCrossoverStrategy
+
+DEFAULT_SCALING_STORE_PATH = os.path.join(BASE_DIR, "Assignment3", "scaling_results.sqlite")
+
+# Strategy name -> factory taking the order quantity
+STRATEGIES: dict[str, Callable[[int], object]] = {
+    "NaiveMovingAverageStrategy": lambda q: NaiveMovingAverageStrategy(quantity = q),
+    "OptimizedMovingAverageStrategy": lambda q: OptimizedMovingAverageStrategy(quantity = q),
+    "MovingAverageCrossoverStrategy": lambda q: MovingAverageCrossoverStrategy(quantity = q),
+    "MomentumStrategy": lambda q: MomentumStrategy(quantity = q),
+    "BenchmarkStrategy": lambda q: BenchmarkStrategy(quantity = q),
+    "MACDStrategy": lambda q: MACDStrategy(quantity = q),
+    "MovingAverageStrategy": lambda q: MovingAverageStrategy(quantity = q),
+    "RSIStrategy": lambda q: RSIStrategy(quantity = q),
+    "VolatilityBreakoutStrategy": lambda q: VolatilityBreakoutStrategy(quantity = q),
+}
+
+# Engine mode name -> ExecutionEngine keyword arguments
+ENGINE_MODES: dict[str, dict] = {
+    "tick": {"recording_interval": RecordingInterval.TICK},
+    "1s": {"recording_interval": RecordingInterval.SECOND},
+    "multi": {"recording_interval": RecordingInterval.MULTI_RESOLUTION},
+    "streaming": {"recording_interval": RecordingInterval.TICK, "keep_history": False},
+}
+
+DEFAULT_TICK_COUNTS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+DEFAULT_SYMBOL_COUNTS = (1, 10, 100, 1000)
+
+# (axis, measure) -> exponent expected when the cost is fine: time linear in
+# ticks and flat in symbols, memory at most linear in either (history rows,
+# per-symbol state)
+EXPECTED_EXPONENT = {
+    ("ticks", "time"): 1.0,
+    ("ticks", "memory"): 1.0,
+    ("symbols", "time"): 0.0,
+    ("symbols", "memory"): 1.0,
+}
+SUPER_LINEAR_TOLERANCE = 0.15
+
+
+def size_label(n: int) -> str:
+    """Short label for a count: 1000 -> "1k", 10_000_000 -> "10M"."""
+    for factor, suffix in ((1_000_000, "M"), (1_000, "k")):
+        if n >= factor and n % factor == 0:
+            return f"{n // factor}{suffix}"
+    return str(n)
+
+
+def fit_power_law(sizes: Iterable[float], values: Iterable[float]) -> tuple[float, float]:
+    """(exponent, r_squared) of a least-squares fit of log(value) on log(size).
+
+    Non-positive values cannot be fitted in log space and are skipped; with
+    fewer than two usable points the result is (nan, nan).
+    """
+    points = [(s, v) for s, v in zip(sizes, values) if s > 0 and v is not None and v > 0]
+    if len({s for s, _ in points}) < 2:
+        return float("nan"), float("nan")
+    x = np.log([s for s, _ in points])
+    y = np.log([v for _, v in points])
+    slope, intercept = np.polyfit(x, y, 1)
+    residual = y - (slope * x + intercept)
+    total = ((y - y.mean()) ** 2).sum()
+    r_squared = 1 - (residual ** 2).sum() / total if total > 0 else 1.0
+    return float(slope), float(r_squared)
+
+
+def run_scaling_suite(
+    strategies: Optional[dict] = None,
+    modes: Optional[dict] = None,
+    tick_counts: Iterable[int] = DEFAULT_TICK_COUNTS,
+    symbol_counts: Iterable[int] = DEFAULT_SYMBOL_COUNTS,
+    base_ticks: int = 100_000,
+    base_symbols: int = 1,
+    quantity: int = 10,
+    cash: float = 10_000_000,
+    repeats: int = 3,
+    warmup: int = 1,
+    seed: int = 0,
+    disable_gc: bool = False,
+    memory: bool = True,
+    store: Optional[ProfilingResultsStore] = None,
+) -> list[dict]:
+    """
+    Benchmark every (strategy, mode) pair at each point of both axes.
+
+    The ticks axis varies `tick_counts` at `base_symbols` symbols; the
+    symbols axis varies `symbol_counts` at `base_ticks` ticks. Each dataset
+    is generated once from `seed` and shared by all runs on it. Returns one
+    row per run with the axis, its size and the results; rows are also
+    recorded in `store` when given.
+    """
+    strategies = STRATEGIES if strategies is None else strategies
+    modes = ENGINE_MODES if modes is None else modes
+    points = [("ticks", n, n, base_symbols) for n in tick_counts]
+    points += [("symbols", k, base_ticks, k) for k in symbol_counts]
+    run_id = datetime.now().isoformat(timespec = "seconds")
+
+    rows = []
+    for axis, size, n_ticks, n_symbols in points:
+        ticks = list(generate_ticks(n_ticks, n_symbols, seed = seed))
+        dataset = f"{size_label(n_ticks)}x{n_symbols}"
+        print(f"Scaling: {dataset} ({axis} axis)")
+        for name, factory in strategies.items():
+            for mode, engine_kwargs in modes.items():
+                def make_engine():
+                    return ExecutionEngine(factory(quantity), Portfolio(cash = cash),
+                                           verbose = False, **engine_kwargs)
+
+                timing = benchmark(make_engine, ticks, repeats = repeats, warmup = warmup,
+                                   seed = seed, disable_gc = disable_gc)
+                row = {
+                    "axis": axis,
+                    "size": size,
+                    "strategy": name,
+                    "engine_mode": mode,
+                    "dataset": dataset,
+                    "ticks": n_ticks,
+                    "symbols": n_symbols,
+                    "wall_seconds": timing["wall_seconds"],
+                    "wall_iqr_seconds": timing["wall_iqr_seconds"],
+                    "wall_min_seconds": timing["wall_min_seconds"],
+                    "repeats": timing["repeats"],
+                    "peak_traced_mib": traced_peak_mib(make_engine, ticks, seed) if memory else None,
+                }
+                rows.append(row)
+                if store is not None:
+                    store.record({
+                        "run_id": run_id,
+                        "recorded_at": datetime.now().isoformat(timespec = "seconds"),
+                        "seed": seed,
+                        "gc_disabled": int(disable_gc),
+                        **{k: v for k, v in row.items() if k not in ("axis", "size")},
+                    })
+        del ticks
+    return rows
+
+
+def fit_scaling(rows: list[dict], tolerance: float = SUPER_LINEAR_TOLERANCE) -> list[dict]:
+    """Time and memory exponents per (strategy, mode, axis), flagged when above the expected exponent.
+
+    Time is fitted on the fastest repeat, the sample least disturbed by noise.
+    """
+    groups: dict[tuple, list[dict]] = {}
+    for row in rows:
+        groups.setdefault((row["strategy"], row["engine_mode"], row["axis"]), []).append(row)
+
+    fits = []
+    for (strategy, mode, axis), group in groups.items():
+        sizes = [r["size"] for r in group]
+        time_exp, time_r2 = fit_power_law(sizes, [r["wall_min_seconds"] for r in group])
+        mem_exp, mem_r2 = fit_power_law(sizes, [r["peak_traced_mib"] for r in group])
+        fits.append({
+            "strategy": strategy,
+            "engine_mode": mode,
+            "axis": axis,
+            "time_exponent": time_exp,
+            "time_r_squared": time_r2,
+            "memory_exponent": mem_exp,
+            "memory_r_squared": mem_r2,
+            "time_flagged": time_exp > EXPECTED_EXPONENT[(axis, "time")] + tolerance,
+            "memory_flagged": mem_exp > EXPECTED_EXPONENT[(axis, "memory")] + tolerance,
+        })
+    return fits
+
+
+def _flag(fit: dict) -> str:
+    flagged = [kind for kind in ("time", "memory") if fit[f"{kind}_flagged"]]
+    if not flagged:
+        return ""
+    what = "super-linear" if fit["axis"] == "ticks" else "grows with symbols"
+    return f"{what} ({', '.join(flagged)})"
+
+
+def write_scaling_report(rows: list[dict], fits: list[dict], output_path: str) -> str:
+    """Write scaling_report.md with the fitted exponents and the raw runs; returns its path."""
+    os.makedirs(output_path, exist_ok = True)
+    path = os.path.join(output_path, "scaling_report.md")
+    with open(path, "w") as f:
+        f.write("# Scaling Report\n\n")
+        f.write("Power-law fits, value ~ c * n^k, of the fastest repeat and of peak traced memory. "
+                "Time should be linear in ticks and flat in symbols, memory at most linear in either; "
+                f"exponents more than {SUPER_LINEAR_TOLERANCE} above that are flagged.\n\n")
+        f.write("| Strategy | Mode | Axis | Time k | Time R² | Memory k | Memory R² | Flag |\n")
+        f.write("|---|---|---|---:|---:|---:|---:|---|\n")
+        for fit in fits:
+            f.write(f"| {fit['strategy']} | {fit['engine_mode']} | {fit['axis']} "
+                    f"| {fit['time_exponent']:.2f} | {fit['time_r_squared']:.2f} "
+                    f"| {fit['memory_exponent']:.2f} | {fit['memory_r_squared']:.2f} | {_flag(fit)} |\n")
+
+        f.write("\n## Runs\n\n")
+        f.write("| Strategy | Mode | Dataset | Median (s) | IQR (s) | Ticks/s | Peak traced (MiB) |\n")
+        f.write("|---|---|---|---:|---:|---:|---:|\n")
+        for row in rows:
+            rate = row["ticks"] / row["wall_seconds"] if row["wall_seconds"] > 0 else float("nan")
+            peak = f"{row['peak_traced_mib']:.2f}" if row["peak_traced_mib"] is not None else "n/a"
+            f.write(f"| {row['strategy']} | {row['engine_mode']} | {row['dataset']} "
+                    f"| {row['wall_seconds']:.4f} | {row['wall_iqr_seconds']:.4f} | {rate:,.0f} | {peak} |\n")
+    return path
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(description = "Scaling benchmark across dataset sizes and symbol counts")
+    parser.add_argument('-t', "--ticks", type = int, nargs = "+", default = list(DEFAULT_TICK_COUNTS),
+                        help = "Tick counts for the ticks axis")
+    parser.add_argument('-k', "--symbols", type = int, nargs = "+", default = list(DEFAULT_SYMBOL_COUNTS),
+                        help = "Symbol counts for the symbols axis")
+    parser.add_argument("--base_ticks", type = int, default = 100_000,
+                        help = "Ticks per run on the symbols axis")
+    parser.add_argument("--base_symbols", type = int, default = 1,
+                        help = "Symbols per run on the ticks axis")
+    parser.add_argument("--strategies", nargs = "+", default = list(STRATEGIES), choices = list(STRATEGIES))
+    parser.add_argument("--modes", nargs = "+", default = list(ENGINE_MODES), choices = list(ENGINE_MODES))
+    parser.add_argument('-q', "--quantity", type = int, default = 10)
+    parser.add_argument('-c', "--cash", type = float, default = 10_000_000)
+    parser.add_argument('-r', "--repeats", type = int, default = 3)
+    parser.add_argument('-w', "--warmup", type = int, default = 1)
+    parser.add_argument('-s', "--seed", type = int, default = 0)
+    parser.add_argument("--disable_gc", action = "store_true")
+    parser.add_argument("--no_memory", action = "store_true",
+                        help = "Skip the tracemalloc run per point (memory exponents become n/a)")
+    parser.add_argument('-o', "--output_path", type = str, default = "Assignment_3_Scaling")
+    parser.add_argument("--store_path", type = str, default = DEFAULT_SCALING_STORE_PATH)
+    return parser.parse_args(args)
+
+
+def main(args) -> list[dict]:
+    parsed_args = parse_args(args)
+    rows = run_scaling_suite(
+        strategies = {name: STRATEGIES[name] for name in parsed_args.strategies},
+        modes = {name: ENGINE_MODES[name] for name in parsed_args.modes},
+        tick_counts = parsed_args.ticks,
+        symbol_counts = parsed_args.symbols,
+        base_ticks = parsed_args.base_ticks,
+        base_symbols = parsed_args.base_symbols,
+        quantity = parsed_args.quantity,
+        cash = parsed_args.cash,
+        repeats = parsed_args.repeats,
+        warmup = parsed_args.warmup,
+        seed = parsed_args.seed,
+        disable_gc = parsed_args.disable_gc,
+        memory = not parsed_args.no_memory,
+        store = ProfilingResultsStore(parsed_args.store_path),
+    )
+    fits = fit_scaling(rows)
+    path = write_scaling_report(rows, fits, parsed_args.output_path)
+    for fit in fits:
+        if fit["time_flagged"] or fit["memory_flagged"]:
+            print(f"FLAG {fit['strategy']} [{fit['engine_mode']}] {fit['axis']}: {_flag(fit)} "
+                  f"(time k={fit['time_exponent']:.2f}, memory k={fit['memory_exponent']:.2f})")
+    print(f"Scaling report written to {path}")
+    return fits
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -4,6 +4,7 @@ from collections import deque
 
 from trading_lib.strategy import Strategy
 from trading_lib.models import MarketDataPoint, Action
+from trading_lib.signals import BUY, SignalBuffer
 
 class NaiveMovingAverageStrategy(Strategy):
     """
@@ -86,9 +87,9 @@ class OptimizedMovingAverageStrategy(Strategy):
         self._short_sum: Dict[str, float] = {}
         self._long_sum: Dict[str, float] = {}
 
-    def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
+    def emit_signals(self, tick: MarketDataPoint, signals: SignalBuffer):
         """
-        Generate trading signals using incremental moving average updates.
+        Emit trading signals using incremental moving average updates.
         
         Time Complexity: O(1) per tick
           - deque.append with maxlen: O(1) - auto-removes oldest
@@ -98,6 +99,7 @@ class OptimizedMovingAverageStrategy(Strategy):
         Space Complexity: O(k) per symbol, where k = long_window
           - Fixed-size deque maintains exactly long_window elements
           - Constant space for running sums (2 floats)
+          - Signals go into the engine's reusable buffer, no per-tick list
         """
         sym, price = tick.symbol, tick.price
         
@@ -108,7 +110,7 @@ class OptimizedMovingAverageStrategy(Strategy):
             self._prev_short_gt_long[sym] = False  # O(1)
             self._short_sum[sym] = price  # O(1)
             self._long_sum[sym] = price  # O(1)
-            return []
+            return
         
         prices = self._prices[sym]
         len_prices = len(prices)
@@ -124,7 +126,7 @@ class OptimizedMovingAverageStrategy(Strategy):
                 self._short_sum[sym] = self._short_sum[sym] - oldest_short + price  # O(1)
 
             self._long_sum[sym] += price  # O(1)
-            return []
+            return
         
         # O(1) - accessing first and nth element in deque
         oldest_short = prices[-self.short_window - 1]  # O(k)
@@ -144,10 +146,7 @@ class OptimizedMovingAverageStrategy(Strategy):
         prev_state = self._prev_short_gt_long[sym]
         curr_state = short_ma > long_ma
 
-        signals = []
         if (not prev_state) and curr_state:
-            signals.append((sym, self.quantity, price, Action.BUY))  # O(1)
+            signals.emit(sym, self.quantity, price, BUY)  # O(1)
         
         self._prev_short_gt_long[sym] = curr_state  # O(1)
-        
-        return signals
\ No newline at end of file
@@ -0,0 +1,252 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+from Assignment2.PriceLoader import DownloadError, DownloadManifest, PriceLoader, TokenBucket
+
+
+START, END = "2024-01-01", "2024-03-01"
+
+
+def _chart(closes, start=START):
+    # 14:30 UTC is the NYSE open, as in real chart responses
+    days = pd.bdate_range(start, periods=len(closes)) + pd.Timedelta(hours=14, minutes=30)
+    return {"chart": {"error": None, "result": [{
+        "meta": {"exchangeTimezoneName": "America/New_York"},
+        "timestamp": [int(d.timestamp()) for d in days],
+        "indicators": {"quote": [{"close": closes}]},
+    }]}}
+
+
+class FakeYahoo(ThreadingHTTPServer):
+    """Canned chart responses; `failures[ticker]` is a list of statuses (or "slow") served before the data."""
+
+    def __init__(self, charts, failures=None):
+        self.charts = charts
+        self.failures = {t: list(f) for t, f in (failures or {}).items()}
+        self.requests = []
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), _Handler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v8/finance/chart"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        ticker = url.path.rsplit("/", 1)[-1]
+        query = parse_qs(url.query)
+        with server.lock:
+            server.requests.append((ticker, query))
+            failure = server.failures.get(ticker, [None]).pop(0) if server.failures.get(ticker) else None
+        if failure == "slow":
+            time.sleep(0.5)
+        elif failure:
+            self.send_response(failure)
+            self.end_headers()
+            return
+        if ticker not in server.charts:
+            self.send_response(404)
+            self.end_headers()
+            return
+        # Serve only the requested window, like the real endpoint
+        chart = json.loads(json.dumps(server.charts[ticker]))
+        result = chart["chart"]["result"][0]
+        period1, period2 = int(query["period1"][0]), int(query["period2"][0])
+        keep = [i for i, ts in enumerate(result["timestamp"]) if period1 <= ts < period2]
+        result["timestamp"] = [result["timestamp"][i] for i in keep]
+        quote = result["indicators"]["quote"][0]
+        quote["close"] = [quote["close"][i] for i in keep]
+        body = json.dumps(chart).encode()
+        with server.lock:
+            server.bytes_sent += len(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(charts, failures=None):
+        server = FakeYahoo(charts, failures)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fetch_chart_parses_closes(serve, tmp_path):
+    server = serve({"AAPL": _chart([1.0, None, 3.0])})
+    loader = PriceLoader(START, END, str(tmp_path), base_url=server.url)
+    df = loader.fetch_chart("AAPL")
+    assert list(df.index) == list(pd.bdate_range(START, periods=3)) and df.index.name == "Date"
+    assert df["Close"].iloc[0] == 1.0 and pd.isna(df["Close"].iloc[1])
+    assert server.requests[0][1]["interval"] == ["1d"]
+
+    with pytest.raises(DownloadError) as e:
+        loader.fetch_chart("NOPE")
+    assert not e.value.retryable
+
+
+def test_concurrent_download_retries_and_resumes(serve, tmp_path):
+    prices = [100.0 + i for i in range(43)]
+    charts = {t: _chart(prices) for t in ["AAA", "BBB", "CCC", "DDD"]}
+    charts["THIN"] = _chart(prices[:5])
+    server = serve(charts, failures={"BBB": [503, 429], "CCC": ["slow"], "DDD": [500] * 10})
+    loader = PriceLoader(START, END, str(tmp_path), base_url=server.url)
+    loader.tickers = ["AAA", "BBB", "CCC", "DDD", "THIN", "GONE"]
+
+    summary = loader.download_all_concurrent(max_workers=4, requests_per_second=1000, timeout=0.2,
+                                             retries=2, backoff=0.01)
+    assert sorted(summary["saved"]) == ["AAA", "BBB", "CCC"] and summary["skipped"] == ["THIN"]
+    assert set(summary["failed"]) == {"DDD", "GONE"} and "HTTP 404" in summary["failed"]["GONE"]
+    requested = [t for t, _ in server.requests]
+    assert requested.count("BBB") == 3 and requested.count("CCC") == 2
+    assert requested.count("DDD") == 3 and requested.count("GONE") == 1
+    assert loader.load_ticker_from_csv("BBB")[-1].price == 142.0
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert set(manifest) == {"AAA", "BBB", "CCC", "THIN"} and manifest["THIN"]["status"] == "skipped"
+
+    # Only the failed tickers are requested again
+    server.requests.clear()
+    server.failures.clear()
+    summary = loader.download_all_concurrent(requests_per_second=1000)
+    assert sorted(t for t, _ in server.requests) == ["DDD", "GONE"]
+    assert sorted(summary["resumed"]) == ["AAA", "BBB", "CCC", "THIN"] and summary["saved"] == ["DDD"]
+
+    # A different date range is not covered by the manifest
+    assert not DownloadManifest(tmp_path / "manifest.json").is_done("AAA", "2023-01-01", END)
+
+
+def test_token_bucket_rate():
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=10, capacity=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(12):
+        bucket.acquire()
+    # the burst of 2 is free, the other 10 arrive at 10 per second
+    assert now[0] == pytest.approx(1.0)
+
+
+def test_incremental_update_appends_tail(serve, tmp_path):
+    prices = [100.0 + i for i in range(300)]
+    server = serve({t: _chart(prices) for t in ["AAA", "BBB"]})
+    loader = PriceLoader(START, END, str(tmp_path), base_url=server.url)
+    loader.tickers = ["AAA", "BBB"]
+    loader.download_all_concurrent(requests_per_second=1000)
+    full_bytes = server.bytes_sent
+    before = (tmp_path / "AAA.csv").read_bytes()
+
+    # A few more days of history; a torn append from an earlier run is left in BBB's file
+    with open(tmp_path / "BBB.csv", "ab") as f:
+        f.write(b"2024-03-0")
+    server.requests.clear()
+    server.bytes_sent = 0
+    loader = PriceLoader(START, "2024-03-08", str(tmp_path), base_url=server.url)
+    loader.tickers = ["AAA", "BBB"]
+    summary = loader.download_all_concurrent(requests_per_second=1000, incremental=True)
+    assert sorted(summary["appended"]) == ["AAA", "BBB"] and summary["saved"] == []
+
+    # Only the days after the stored last date are requested and transferred
+    day_after_stored = pd.Timestamp("2024-03-01", tz="UTC").timestamp()
+    assert [int(q["period1"][0]) for _, q in server.requests] == [day_after_stored] * 2
+    assert server.bytes_sent < full_bytes / 3
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+
+    after = (tmp_path / "AAA.csv").read_bytes()
+    assert after.startswith(before) and len(after) == manifest["AAA"]["bytes"]
+    assert manifest["AAA"]["last_date"] == "2024-03-07" and manifest["AAA"]["end_date"] == "2024-03-08"
+    for ticker in ["AAA", "BBB"]:
+        df = pd.read_csv(tmp_path / f"{ticker}.csv", index_col=0, parse_dates=True)
+        assert list(df.index) == list(pd.bdate_range(START, "2024-03-07"))
+        assert df["Close"].tolist() == prices[:len(df)] and manifest[ticker]["rows"] == len(df)
+
+    # Already current: nothing is requested
+    server.requests.clear()
+    assert loader.download_all_concurrent(incremental=True)["resumed"] == ["AAA", "BBB"]
+    assert server.requests == []
+
+
+def test_failed_save_is_not_recorded(serve, tmp_path, monkeypatch):
+    prices = [100.0 + i for i in range(43)]
+    server = serve({t: _chart(prices) for t in ["AAA", "BBB"]})
+    loader = PriceLoader(START, END, str(tmp_path), base_url=server.url)
+    loader.tickers = ["AAA", "BBB"]
+
+    def fail_for_aaa(df, path, *args, **kwargs):
+        if str(path).endswith("AAA.csv"):
+            raise OSError("disk full")
+        return original(df, path, *args, **kwargs)
+
+    original = pd.DataFrame.to_csv
+    monkeypatch.setattr(pd.DataFrame, "to_csv", fail_for_aaa)
+    summary = loader.download_all_concurrent(requests_per_second=1000)
+    assert summary["saved"] == ["BBB"] and "AAA" in summary["failed"]
+    assert not (tmp_path / "AAA.csv").exists()
+    assert set(json.loads((tmp_path / "manifest.json").read_text())) == {"BBB"}
+
+    # The next run fetches it again
+    monkeypatch.undo()
+    server.requests.clear()
+    summary = loader.download_all_concurrent(requests_per_second=1000)
+    assert summary["saved"] == ["AAA"] and summary["resumed"] == ["BBB"]
+    assert [t for t, _ in server.requests] == ["AAA"]
+
+
+def test_incremental_update_detects_rewrites_and_failed_appends(serve, tmp_path, monkeypatch):
+    prices = [100.0 + i for i in range(300)]
+    server = serve({t: _chart(prices) for t in ["AAA", "BBB", "CCC"]})
+    loader = PriceLoader(START, END, str(tmp_path), base_url=server.url)
+    loader.tickers = ["AAA", "BBB", "CCC"]
+    loader.download_all_concurrent(requests_per_second=1000)
+    indexed = json.loads((tmp_path / "manifest.json").read_text())
+
+    # AAA rewritten larger outside the loader, e.g. by download_ticker over a longer range
+    rewritten = pd.DataFrame({"Close": [50.0 + i for i in range(60)]},
+                             index=pd.bdate_range("2023-12-01", periods=60, name="Date"))
+    loader.save_data_to_file("AAA", rewritten)
+    assert (tmp_path / "AAA.csv").stat().st_size > indexed["AAA"]["bytes"]
+
+    # CCC's append fails
+    original = PriceLoader.append_to_file
+
+    def fail_for_ccc(self, ticker, *args):
+        if ticker == "CCC":
+            raise OSError("disk full")
+        return original(self, ticker, *args)
+
+    monkeypatch.setattr(PriceLoader, "append_to_file", fail_for_ccc)
+    loader = PriceLoader(START, "2024-03-08", str(tmp_path), base_url=server.url)
+    loader.tickers = ["AAA", "BBB", "CCC"]
+    summary = loader.download_all_concurrent(requests_per_second=1000, incremental=True)
+    assert summary["saved"] == ["AAA"] and summary["appended"] == ["BBB"] and list(summary["failed"]) == ["CCC"]
+
+    df = pd.read_csv(tmp_path / "AAA.csv", index_col=0, parse_dates=True)
+    assert list(df.index) == list(pd.bdate_range(START, "2024-03-07")) and df["Close"].tolist() == prices[:len(df)]
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert manifest["CCC"] == indexed["CCC"]
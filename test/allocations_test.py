@@ -0,0 +1,37 @@
+from collections import deque
+
+import pytest
+
+from Assignment3.allocations import allocations_markdown, attribute_allocations, trace_allocations, trace_load
+from Assignment3.profiler import StrategyProfiler
+from Assignment3.results_store import ProfilingResultsStore
+
+
+def test_growth_is_attributed_to_the_leaking_line():
+    leaked, bounded = [], deque(maxlen=10)
+
+    def step(tick):
+        leaked.append(bytes(100) + bytes([tick % 256]))
+        bounded.append(bytes(100) + bytes([tick % 256]))
+
+    snapshots = trace_allocations(step, range(5_000), snapshot_interval=1_000)
+    assert [done for done, _ in snapshots] == [0, 1_000, 2_000, 3_000, 4_000, 5_000]
+
+    rows = attribute_allocations(snapshots)
+    top = rows[0]
+    assert top["filename"] == __file__ and top["blocks_per_10k_ticks"] == pytest.approx(10_000, rel=0.01)
+    assert top["live_blocks"] >= 5_000
+    bounded_line = top["lineno"] + 1
+    assert all(r["bytes_per_10k_ticks"] < top["bytes_per_10k_ticks"] / 100 for r in rows if r["lineno"] == bounded_line)
+    # the snapshots themselves are not attributed
+    assert all(r["live_bytes"] < 4096 for r in rows[1:])
+    assert "leaked.append" in allocations_markdown("Leak", snapshots, rows)
+
+
+def test_trace_load_and_memory_mode(tmp_path):
+    ticks, snapshots = trace_load(lambda: [str(i) * 20 for i in range(2_000)])
+    assert len(ticks) == 2_000 and [done for done, _ in snapshots] == [0, 2_000]
+    assert attribute_allocations(snapshots)[0]["live_blocks"] >= 2_000
+
+    with pytest.raises(ValueError):
+        StrategyProfiler(results_store=ProfilingResultsStore(str(tmp_path / "s.sqlite")), memory_mode="rss")
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+
+from Assignment3.benchmark import benchmark, summarize_ns
+from Assignment3.strategies import OptimizedMovingAverageStrategy
+from trading_lib.engine import ExecutionEngine
+from trading_lib.models import MarketDataPoint
+from trading_lib.portfolio import Portfolio
+
+
+def test_summarize_ns():
+    summary = summarize_ns([5_000, 1_000, 3_000, 2_000, 4_000])
+    assert summary["repeats"] == 5
+    assert summary["wall_seconds"] == 3e-6
+    assert summary["wall_min_seconds"] == 1e-6
+    assert summary["wall_iqr_seconds"] == 2e-6
+
+
+def test_fresh_instances_and_pinned_rng():
+    base_time = datetime(2025, 1, 1, 10, 0, 0)
+    ticks = [MarketDataPoint(base_time + timedelta(seconds=i), "AAPL", 100.0 + (i % 30))
+             for i in range(300)]
+    engines = []
+
+    def make_engine():
+        engine = ExecutionEngine(OptimizedMovingAverageStrategy(5, 10, quantity=1), Portfolio(cash=10_000),
+                                 failure_rate=0.5, verbose=False)
+        engines.append(engine)
+        return engine
+
+    result = benchmark(make_engine, ticks, repeats=3, warmup=2, seed=7, disable_gc=True)
+    assert result["repeats"] == 3 and len(result["samples_ns"]) == 3
+    assert len(engines) == 5 and len({id(e.strategy) for e in engines}) == 5
+    # same seed, same simulated failures: every trial ends in the same state
+    assert len({e.portfolio.get_cash() for e in engines}) == 1
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from trading_lib.bootstrap import _resample_metrics, block_bootstrap_indices, bootstrap_confidence_intervals
+from trading_lib import metrics
+
+
+def _equity(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    return 1000 * np.cumprod(1 + rng.normal(0.001, 0.01, size=n))
+
+
+def test_block_indices():
+    indices = block_bootstrap_indices(10, 4, 3, np.random.default_rng(0))
+    assert indices.shape == (4, 10)
+    # within a block consecutive indexes wrap around the series
+    assert ((indices[:, 1:3] - indices[:, 0:2]) % 10 == 1).all()
+
+
+def test_intervals_contain_estimate():
+    values = _equity()
+    intervals = bootstrap_confidence_intervals(values, n_resamples=1000, seed=1)
+    for name, (estimate, low, high) in intervals.items():
+        assert low <= high
+    assert intervals["sharpe_ratio"][0] == pytest.approx(metrics.sharpe_ratio(values))
+    low, high = intervals["sharpe_ratio"][1:]
+    assert low < intervals["sharpe_ratio"][0] < high
+    assert intervals["max_drawdown"][2] <= 0
+
+
+def test_seeded_and_parallel():
+    values = _equity()
+    first = bootstrap_confidence_intervals(values, n_resamples=400, seed=3)
+    assert first == bootstrap_confidence_intervals(values, n_resamples=400, seed=3)
+    parallel = bootstrap_confidence_intervals(values, n_resamples=400, seed=3, workers=2)
+    for name in first:
+        assert parallel[name][0] == first[name][0]
+        # different random streams, so only the intervals' overlap is stable
+        assert parallel[name][1] < first[name][2] and first[name][1] < parallel[name][2]
+
+
+def test_too_short():
+    with pytest.raises(ValueError):
+        bootstrap_confidence_intervals([100.0, 101.0])
+
+
+def test_chunked_resamples_match_one_matrix():
+    rets = metrics.returns(_equity(1_000))[1:]
+    whole = _resample_metrics(rets, 300, 10, 7, None, chunk_elements=300 * len(rets))
+    # 7 resamples per chunk, the last one partial
+    chunked = _resample_metrics(rets, 300, 10, 7, None, chunk_elements=7 * len(rets) + 5)
+    for name, samples in whole.items():
+        assert len(chunked[name]) == 300
+        np.testing.assert_allclose(chunked[name], samples)
@@ -0,0 +1,62 @@
+import cProfile
+import pstats
+import time
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from Assignment3.flamegraph import (
+    SamplingProfiler, collapse_pstats, diff_flamegraph_svg, flamegraph_svg, read_collapsed, write_collapsed,
+)
+
+
+def _inner(n):
+    return sum(i * i for i in range(n))
+
+
+def _outer():
+    return [_inner(20_000) for _ in range(20)]
+
+
+def _spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        _inner(1_000)
+
+
+def test_collapse_pstats_rebuilds_stacks(tmp_path):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    _outer()
+    profiler.disable()
+    stats = pstats.Stats(profiler)
+
+    folded = collapse_pstats(stats)
+    assert any(";_inner (flamegraph_test.py:" in stack and stack.startswith("_outer (") for stack in folded)
+    # self times add back up to the profiled total
+    assert sum(folded.values()) == pytest.approx(stats.total_tt * 1e6, rel=0.02)
+
+    path = str(tmp_path / "stacks.folded")
+    write_collapsed(folded, path)
+    assert read_collapsed(path) == pytest.approx({k: round(v) for k, v in folded.items()})
+
+
+def test_sampling_profiler_skips_caller_frames():
+    with SamplingProfiler(interval=0.001) as sampler:
+        _spin(0.3)
+    stacks = sampler.collapsed()
+    assert sum(stacks.values()) > 5
+    assert all(stack.startswith("_spin (flamegraph_test.py:") for stack in stacks)
+
+
+def test_flamegraph_svgs():
+    before = {"main;slow": 80.0, "main;fast": 20.0}
+    after = {"main;slow": 20.0, "main;fast": 80.0}
+    svg = ET.fromstring(flamegraph_svg(after, "Test"))
+    titles = [t.text for t in svg.iter("{http://www.w3.org/2000/svg}title")]
+    assert "fast (80 us, 80.00%)" in titles
+
+    diff = ET.fromstring(diff_flamegraph_svg(before, after))
+    fills = {g.find("{http://www.w3.org/2000/svg}title").text.split(" ")[0]: g.find("{http://www.w3.org/2000/svg}rect").get("fill")
+             for g in diff.iter("{http://www.w3.org/2000/svg}g")}
+    assert fills["fast"].startswith("rgb(255,") and fills["slow"].endswith(",255)")
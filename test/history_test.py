@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from trading_lib.history import ColumnarHistory
+from trading_lib.metrics import history_to_arrays
+
+
+def _rows(n, tz=None):
+    base_time = datetime(2025, 1, 1, 9, 30, tzinfo=tz)
+    return [(base_time + timedelta(seconds=i, microseconds=7), 1000.0 - i, i * 0.5) for i in range(n)]
+
+
+def test_behaves_like_list():
+    rows = _rows(10)
+    history = ColumnarHistory()
+    for row in rows:
+        history.append(row)
+    assert len(history) == 10
+    assert history == rows
+    assert history[3] == rows[3] and history[-1] == rows[-1]
+    assert history[2:5] == rows[2:5]
+
+
+def test_spills_to_disk(tmp_path):
+    rows = _rows(1000)
+    history = ColumnarHistory(memory_budget=100 * 24, spill_dir=str(tmp_path), chunk_size=64)
+    for row in rows:
+        history.append(row)
+    assert history.memory_bytes <= 100 * 24
+    assert list(history) == rows
+    assert history[10] == rows[10] and history[-1] == rows[-1]
+
+    timestamps, values = history_to_arrays(history)
+    assert values.tolist() == [cash + holdings for _, cash, holdings in rows]
+    assert timestamps[0] == np.datetime64("2025-01-01T09:30:00.000007")
+    history.close()
+
+
+def test_timezone_aware_rows():
+    tz = timezone(timedelta(hours=-5))
+    rows = _rows(3, tz=tz)
+    history = ColumnarHistory()
+    for row in rows:
+        history.append(row)
+    assert list(history) == rows
+    assert history[0][0].utcoffset() == timedelta(hours=-5)
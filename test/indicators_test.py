@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from trading_lib.indicators import IndicatorRegistry, RollingWindow, SimpleMovingAverage, ExponentialMovingAverage
+from trading_lib.engine import ExecutionEngine, process_ticks_lockstep
+from trading_lib.portfolio import Portfolio
+from trading_lib.models import MarketDataPoint
+
+from Assignment2.MovingAverageStrategy import MovingAverageStrategy
+
+
+def _ticks(prices, symbol="AAPL"):
+    base_time = datetime(2025, 1, 1, 10, 0, 0)
+    return [MarketDataPoint(timestamp=base_time + timedelta(seconds=i), symbol=symbol, price=price)
+            for i, price in enumerate(prices)]
+
+
+def test_sma():
+    sma = SimpleMovingAverage(3)
+    values = []
+    for price in [1, 2, 3, 4, 5]:
+        sma.update(price)
+        values.append(sma.value)
+    assert values == [None, None, 2.0, 3.0, 4.0]
+
+
+def test_ema():
+    ema = ExponentialMovingAverage(3)
+    for price in [10, 20, 30]:
+        ema.update(price)
+    # alpha = 0.5: 10 -> 15 -> 22.5
+    assert ema.value == pytest.approx(22.5)
+
+
+def test_registry_updates_once_per_tick():
+    registry = IndicatorRegistry()
+    for tick in _ticks([1, 2, 3, 4]):
+        registry.update(tick)
+        registry.update(tick)  # a second strategy asking about the same tick
+        registry.sma("AAPL", 2)
+    assert registry.sma("AAPL", 2) == 3.5
+    assert len(registry) == 1
+
+
+def test_registry_unknown_indicator():
+    with pytest.raises(ValueError):
+        IndicatorRegistry().get("vwap", "AAPL", 10)
+
+
+def test_shared_registry_matches_private():
+    prices = [100, 99, 98, 97, 96, 97, 98, 99, 100, 101, 102, 99, 97, 98, 103, 104]
+    ticks = _ticks(prices) + _ticks(prices[::-1], symbol="MSFT")
+    ticks.sort(key=lambda t: t.timestamp)
+
+    private = MovingAverageStrategy(short_window=3, long_window=5, quantity=10)
+    expected = [s for tick in ticks for s in private.generate_signals(tick)]
+
+    registry = IndicatorRegistry()
+    engines = []
+    for _ in range(2):
+        strategy = MovingAverageStrategy(short_window=3, long_window=5, quantity=10)
+        strategy.bind_indicators(registry)
+        engines.append(ExecutionEngine(strategy, Portfolio(cash=100000)))
+    process_ticks_lockstep(engines, ticks)
+
+    # SMA(3) and SMA(5) for two symbols, computed once for both strategies
+    assert len(registry) == 4
+    for engine in engines:
+        assert engine.portfolio.get_holding("AAPL")["quantity"] == 10 * sum(1 for s in expected if s[0] == "AAPL")
+
+
+def test_rolling_window():
+    window = RollingWindow(3)
+    for value in [1.0, 2.0]:
+        window.append(value)
+    assert not window.full
+    assert window.sum == 3.0
+    for value in [3.0, 4.0, 5.0, 6.0, 7.0]:
+        window.append(value)
+    assert window.full and len(window) == 3
+    assert window.sum == 18.0
+    assert (window[0], window[-1]) == (5.0, 7.0)
+    with pytest.raises(IndexError):
+        window[3]
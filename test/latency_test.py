@@ -0,0 +1,58 @@
+import random
+from datetime import datetime, timedelta
+
+from Assignment3.strategies import OptimizedMovingAverageStrategy
+from trading_lib.engine import LATENCY_STAGES, ExecutionEngine
+from trading_lib.latency import LatencyHistogram
+from trading_lib.models import MarketDataPoint, RecordingInterval
+from trading_lib.portfolio import Portfolio
+
+
+def test_histogram_percentiles_within_bucket_precision():
+    rng = random.Random(3)
+    values = [int(rng.lognormvariate(8, 1.5)) for _ in range(20_000)]
+    histogram = LatencyHistogram(sub_bucket_bits=5)
+    for v in values:
+        histogram.record(v)
+
+    ordered = sorted(values)
+    for p in (50, 90, 99, 99.9):
+        exact = ordered[int(-(-len(ordered) * p // 100)) - 1]
+        assert exact <= histogram.percentile(p) <= exact * (1 + 1 / 32) + 1
+    assert histogram.percentile(100) == histogram.max == max(values)
+    assert histogram.min == min(values) and histogram.count == len(values)
+    # a few hundred counters however many values
+    assert len(histogram.counts) < 32 * (max(values).bit_length() + 1)
+
+
+def test_histogram_small_values_are_exact_and_merge():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    for v in range(10):
+        a.record(v)
+    b.record(1_000_000)
+    a.merge(b)
+    assert a.count == 11 and a.percentile(50) == 5 and a.max == 1_000_000
+    assert a.summary(scale=1)["p99.9"] == 1_000_000
+
+
+def test_engine_instrumentation_is_opt_in():
+    base_time = datetime(2025, 1, 1, 10, 0, 0)
+    ticks = [MarketDataPoint(base_time + timedelta(seconds=i), "AAPL", 100.0 + (i % 30))
+             for i in range(500)]
+
+    def run(instrument):
+        engine = ExecutionEngine(OptimizedMovingAverageStrategy(5, 10, quantity=1), Portfolio(cash=10_000),
+                                 recording_interval=RecordingInterval.TICK, verbose=False, instrument=instrument)
+        engine.process_ticks(ticks)
+        return engine
+
+    plain, timed = run(False), run(True)
+    assert "step" not in vars(plain) and plain.get_latency_summary() == {}
+    assert timed.portfolio_history == plain.portfolio_history
+    assert timed.portfolio.get_cash() == plain.portfolio.get_cash()
+
+    summary = timed.get_latency_summary()
+    assert set(summary) == set(LATENCY_STAGES)
+    assert summary["tick"]["count"] == summary["signal"]["count"] == summary["recording"]["count"] == 500
+    assert 0 < summary["execution"]["count"] < 500
+    assert summary["tick"]["p50"] <= summary["tick"]["p99"] <= summary["tick"]["max"]
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from Assignment3.loadtest import SyntheticLoadStrategy, find_saturation, format_results, run_load_test
+from trading_lib.data_generator import generate_ticks
+from trading_lib.engine import ExecutionEngine
+from trading_lib.models import RecordingInterval
+from trading_lib.portfolio import Portfolio
+from trading_lib.signals import SignalBuffer
+
+
+def test_synthetic_strategy_density_and_rejections():
+    strategy = SyntheticLoadStrategy(density=0.2, seed=1)
+    signals, emitted = SignalBuffer(), 0
+    for tick in generate_ticks(10_000, num_symbols=5):
+        signals.clear()
+        strategy.emit_signals(tick, signals)
+        emitted += signals.count
+    assert emitted == pytest.approx(2_000, rel=0.1)
+
+    # every order rejected: nothing is ever bought or sold
+    engine = ExecutionEngine(SyntheticLoadStrategy(density=1.0, rejection_rate=1.0), Portfolio(cash=1_000),
+                             verbose=False)
+    engine.process_ticks(generate_ticks(500, num_symbols=5))
+    assert engine.portfolio.get_cash() == 1_000 and engine.portfolio.get_all_holdings() == {}
+
+
+class _CountingPortfolio(Portfolio):
+    def __init__(self, cash):
+        super().__init__(cash=cash)
+        self.rejected = 0
+
+    def can_execute_order(self, order):
+        ok = super().can_execute_order(order)
+        self.rejected += not ok
+        return ok
+
+
+def test_rejections_with_execution_failures():
+    random.seed(0)
+    portfolio = _CountingPortfolio(cash=1e9)
+    strategy = SyntheticLoadStrategy(density=0.5, rejection_rate=0.1, portfolio=portfolio)
+    engine = ExecutionEngine(strategy, portfolio, failure_rate=0.3, verbose=False)
+    engine.process_ticks(generate_ticks(20_000, num_symbols=5))
+    # failed buys leave nothing held, so only the deliberately invalid orders are rejected
+    assert strategy.invalid_orders == pytest.approx(1_000, rel=0.1)
+    assert portfolio.rejected == strategy.invalid_orders
+
+
+@pytest.mark.parametrize("interval", list(RecordingInterval))
+def test_load_test_every_interval(interval):
+    ticks = list(generate_ticks(2_000, num_symbols=3))
+
+    def make_engine():
+        return ExecutionEngine(SyntheticLoadStrategy(0.3, 0.2), Portfolio(cash=1e6), failure_rate=0.1,
+                               recording_interval=interval, verbose=False)
+
+    flat_out = run_load_test(make_engine(), ticks)
+    assert flat_out["ticks"] == 2_000 and flat_out["throughput"] > 0
+    assert flat_out["service_us"]["count"] == 2_000
+
+    paced, flooded = find_saturation(make_engine, ticks, [1e9, 20_000])
+    assert paced["target_rate"] == 20_000 and paced["queue_delay_us"]["count"] == 2_000
+    assert paced["elapsed_seconds"] >= 1_999 / 20_000
+    assert flooded["saturated"] and flooded["max_backlog"] > 1_000
+    assert "| max |" in format_results([flat_out, paced, flooded])
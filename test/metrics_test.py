@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from Assignment2.BenchmarkStrategy import BenchmarkStrategy
+from trading_lib import metrics
+from trading_lib.engine import ExecutionEngine
+from trading_lib.models import MarketDataPoint, RecordingInterval
+from trading_lib.portfolio import Portfolio
+from trading_lib.reporting import calculate_max_drawdown, calculate_sharpe_ratio
+
+PRICES = [100.0, 110.0, 99.0, 105.0, 120.0, 90.0, 95.0, 125.0]
+
+
+def test_matches_reporting():
+    # Real (timestamp, cash, holdings) rows: all cash goes into holdings on the first tick
+    start = datetime(2025, 1, 1, 10, 0, 0)
+    ticks = [MarketDataPoint(start + timedelta(seconds=i), "AAPL", p) for i, p in enumerate(PRICES)]
+    engine = ExecutionEngine(BenchmarkStrategy(quantity=10), Portfolio(cash=1000),
+                             recording_interval=RecordingInterval.TICK, verbose=False)
+    engine.process_ticks(ticks)
+    history = engine.get_portfolio_history()
+
+    _, values = metrics.history_to_arrays(history)
+    assert values.tolist() == [p * 10 for p in PRICES]
+    assert metrics.sharpe_ratio(values) == pytest.approx(calculate_sharpe_ratio(history))
+    assert metrics.max_drawdown(values) == pytest.approx(calculate_max_drawdown(history))
+    assert metrics.max_drawdown(values) == pytest.approx(-25.0)
+    assert metrics.total_return(values) == pytest.approx(25.0)
+
+
+def test_zero_value_returns_skipped():
+    values = [100.0, 0.0, 50.0, 55.0]
+    # 0 -> 50 is undefined and left out, like calculate_sharpe_ratio does
+    history = [(None, value, 0.0) for value in values]
+    assert np.isnan(metrics.returns(values)[1])
+    assert metrics.sharpe_ratio(values) == pytest.approx(calculate_sharpe_ratio(history))
+    assert metrics.max_drawdown(values) == -100.0
+
+
+def test_batched_rows_match_single():
+    rng = np.random.default_rng(0)
+    batch = 100 * np.cumprod(1 + rng.normal(0, 0.01, size=(5, 300)), axis=-1)
+    result = metrics.compute_metrics(batch, periods_per_year=252)
+    for i, row in enumerate(batch):
+        assert result["sharpe_ratio"][i] == pytest.approx(metrics.sharpe_ratio(row, 252))
+        assert result["sortino_ratio"][i] == pytest.approx(metrics.sortino_ratio(row, 252))
+        assert result["calmar_ratio"][i] == pytest.approx(metrics.calmar_ratio(row, 252))
+        assert result["max_drawdown"][i] == pytest.approx(metrics.max_drawdown(row))
+
+
+def test_rolling_sharpe():
+    rng = np.random.default_rng(1)
+    values = 100 * np.cumprod(1 + rng.normal(0, 0.01, size=60))
+    rolling = metrics.rolling_sharpe(values, 20)
+    assert np.isnan(rolling[:20]).all()
+    for end in (20, 35, 59):
+        assert rolling[end] == pytest.approx(metrics.sharpe_ratio(values[end - 20:end + 1]))
+    assert (metrics.rolling_sharpe(np.full(50, 100.0), 10)[10:] == 0).all()
+
+
+def test_period_returns():
+    start = datetime(2025, 1, 30)
+    timestamps = [start + timedelta(days=i) for i in range(4)]  # Jan 30, 31, Feb 1, 2
+    periods, rets = metrics.period_returns(timestamps, [100.0, 110.0, 121.0, 99.0], "M")
+    assert periods.astype(str).tolist() == ["2025-01", "2025-02"]
+    assert rets == pytest.approx([10.0, -10.0])
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from trading_lib import metrics
+from trading_lib.engine import ExecutionEngine
+from trading_lib.models import MarketDataPoint, RecordingInterval
+from trading_lib.multires_history import MultiResolutionHistory
+from trading_lib.portfolio import Portfolio
+from trading_lib.reporting import calculate_max_drawdown
+from Assignment2.BenchmarkStrategy import BenchmarkStrategy
+
+
+def _rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    values = 1000 * np.cumprod(1 + rng.normal(0, 0.01, size=n))
+    base_time = datetime(2025, 1, 1)
+    return [(base_time + timedelta(seconds=i), 100.0, float(v)) for i, v in enumerate(values)], values
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_max_drawdown_exact(seed):
+    rows, values = _rows(20_000, seed)
+    history = MultiResolutionHistory(segments_per_level=16, levels=3)
+    for row in rows:
+        history.append(row)
+    expected = metrics.max_drawdown(values + 100.0)
+    assert history.max_drawdown == pytest.approx(expected)
+    # the retained rows alone reproduce it too
+    _, retained = metrics.history_to_arrays(history)
+    assert metrics.max_drawdown(retained) == pytest.approx(expected)
+
+
+def test_memory_bounded():
+    history = MultiResolutionHistory(segments_per_level=16, levels=3)
+    sizes = []
+    for n in (1_000, 50_000):
+        rows, _ = _rows(n)
+        for row in rows:
+            history.append(row)
+        sizes.append(history.segment_count)
+        timestamps = [row[0] for row in history]
+        assert timestamps == sorted(timestamps)
+        assert history[-1] == rows[-1]  # newest rows stay exact
+    assert max(sizes) <= 3 * 16 + 1
+    assert history.recorded == 51_000
+
+
+def test_engine_multi_resolution_mode():
+    base_time = datetime(2025, 1, 1, 10, 0, 0)
+    ticks = [MarketDataPoint(base_time + timedelta(seconds=i), "AAPL", 100.0 + (i % 7) - (i % 13))
+             for i in range(5000)]
+    engine = ExecutionEngine(BenchmarkStrategy(quantity=10), Portfolio(cash=1000),
+                             recording_interval=RecordingInterval.MULTI_RESOLUTION)
+    engine.process_ticks(ticks)
+    history = engine.get_portfolio_history()
+    assert isinstance(history, MultiResolutionHistory)
+    assert history.recorded == 5000
+    assert history.max_drawdown == pytest.approx(engine.metrics.max_drawdown)
+
+
+def test_reported_drawdown_matches_full_history():
+    base_time = datetime(2025, 1, 1, 10, 0, 0)
+    prices = 100 * np.cumprod(1 + np.random.default_rng(3).normal(0, 0.01, size=20_000))
+    ticks = [MarketDataPoint(base_time + timedelta(seconds=i), "AAPL", float(p)) for i, p in enumerate(prices)]
+    drawdowns = []
+    for interval in (RecordingInterval.TICK, RecordingInterval.MULTI_RESOLUTION):
+        engine = ExecutionEngine(BenchmarkStrategy(quantity=10), Portfolio(cash=1000), failure_rate=0.0,
+                                 recording_interval=interval, verbose=False)
+        engine.process_ticks(ticks)
+        drawdowns.append(calculate_max_drawdown(engine.get_portfolio_history()))
+        history_rows = len(engine.get_portfolio_history())
+    assert history_rows < len(ticks) // 4
+    assert drawdowns[1] == pytest.approx(drawdowns[0])
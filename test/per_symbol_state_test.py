@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+import random
+
+import pytest
+
+from trading_lib.models import MarketDataPoint
+
+from Assignment2.MACDStrategy import MACDStrategy
+from Assignment2.MovingAverageStrategy import MovingAverageStrategy
+from Assignment2.RSIStrategy import RSIStrategy
+from Assignment2.VolatilityBreakoutStrategy import VolatilityBreakoutStrategy
+
+
+def _walk(symbol, n, seed):
+    rng = random.Random(seed)
+    base_time = datetime(2025, 1, 1)
+    price = 100.0
+    ticks = []
+    for i in range(n):
+        price = round(price * (1 + rng.gauss(0, 0.01)), 2)
+        ticks.append(MarketDataPoint(timestamp=base_time + timedelta(seconds=i), symbol=symbol, price=price))
+    return ticks
+
+
+@pytest.mark.parametrize("make", [MACDStrategy, MovingAverageStrategy, RSIStrategy, VolatilityBreakoutStrategy])
+def test_interleaved_symbols_match_separate_runs(make):
+    feeds = [_walk(sym, 400, seed) for seed, sym in enumerate(["AAPL", "MSFT", "IBM"])]
+
+    separate = []
+    for feed in feeds:
+        strategy = make(quantity=10)
+        for tick in feed:
+            separate.extend(strategy.generate_signals(tick))
+
+    strategy = make(quantity=10)
+    interleaved = []
+    for ticks in zip(*feeds):
+        for tick in ticks:
+            interleaved.extend(strategy.generate_signals(tick))
+
+    assert len(separate) > 0
+    assert sorted(interleaved) == sorted(separate)
+
+
+def test_macd_history_is_bounded():
+    strategy = MACDStrategy(short_window=3, long_window=5, signal_window=3, quantity=100)
+    for tick in _walk("AAPL", 200, 7):
+        strategy.generate_signals(tick)
+    assert len(strategy.macd_history["AAPL"]) == 3
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+import random
+
+import numpy as np
+import pytest
+
+from trading_lib.indicators import INDICATORS
+from trading_lib.precompute import PRECOMPUTED_INDICATORS, PrecomputedIndicators, ema
+from trading_lib.models import MarketDataPoint
+
+from Assignment2.MovingAverageStrategy import MovingAverageStrategy
+from Assignment2.VolatilityBreakoutStrategy import VolatilityBreakoutStrategy
+
+
+def _random_walk(n, seed=1):
+    rng = random.Random(seed)
+    prices = [100.0]
+    for _ in range(n - 1):
+        prices.append(round(prices[-1] * (1 + rng.gauss(0, 0.01)), 2))
+    return prices
+
+
+def _ticks(symbols=("AAPL", "MSFT"), n=3000):
+    base_time = datetime(2025, 1, 1)
+    walks = {sym: _random_walk(n, seed=i) for i, sym in enumerate(symbols)}
+    return [MarketDataPoint(timestamp=base_time + timedelta(seconds=i * len(symbols) + j), symbol=sym, price=walks[sym][i])
+            for i in range(n) for j, sym in enumerate(symbols)]
+
+
+@pytest.mark.parametrize("name,window", [("sma", 20), ("ema", 12), ("rsi", 14), ("volatility", 20)])
+def test_matches_incremental_indicators(name, window):
+    prices = _random_walk(2000)
+    live = INDICATORS[name](window)
+    expected = []
+    for price in prices:
+        live.update(price)
+        expected.append(np.nan if live.value is None else live.value)
+
+    values = PRECOMPUTED_INDICATORS[name](np.array(prices), window)
+    np.testing.assert_allclose(values, expected, rtol=1e-9, atol=1e-9)
+
+
+def test_ema_spans_several_blocks():
+    prices = _random_walk(5000)
+    values = ema(np.array(prices), 2)  # short window -> many short blocks
+    expected = prices[0]
+    for price in prices[1:]:
+        expected = (2 / 3) * price + (1 / 3) * expected
+    assert values[-1] == pytest.approx(expected)
+
+
+def test_strategy_signals_match_live_registry():
+    ticks = _ticks()
+    for make in (MovingAverageStrategy, VolatilityBreakoutStrategy):
+        live = make(quantity=10)
+        precomputed = make(quantity=10)
+        precomputed.bind_indicators(PrecomputedIndicators(ticks))
+
+        for tick in ticks:
+            assert precomputed.generate_signals(tick) == live.generate_signals(tick)
+
+
+def test_disk_cache(tmp_path):
+    ticks = _ticks(n=200)
+    first = PrecomputedIndicators(ticks, cache_dir=str(tmp_path))
+    first.update(ticks[0])
+    first.sma("AAPL", 20)
+    assert len(list(tmp_path.glob("*_sma_20.npy"))) == 1
+
+    second = PrecomputedIndicators(ticks, cache_dir=str(tmp_path))
+    for tick in ticks:
+        second.update(tick)
+        first.update(tick)
+        assert second.sma(tick.symbol, 20) == first.sma(tick.symbol, 20)
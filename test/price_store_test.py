@@ -0,0 +1,53 @@
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from Assignment2.PriceLoader import PriceLoader
+from trading_lib.data_loader import is_price_store, load_market_data_yf, load_price_store
+
+
+def _saved_prices(tmp_path):
+    loader = PriceLoader("2022-11-01", "2025-01-01", str(tmp_path / "prices"))
+    ranges = {"MSFT": ("2022-11-01", "2024-12-31"), "AAPL": ("2023-06-01", "2024-12-31"), "IBM": ("2022-11-01", "2023-12-29")}
+    for code, (ticker, (start, end)) in enumerate(ranges.items()):
+        dates = pd.bdate_range(start, end, name="Date")
+        close = 100.0 * (code + 1) + np.arange(len(dates)) / 4
+        loader.save_data_to_file(ticker, pd.DataFrame({"Close": close}, index=dates))
+    return loader
+
+
+def test_consolidated_store_matches_per_ticker_files(tmp_path):
+    loader = _saved_prices(tmp_path)
+    store = tmp_path / "store"
+    metadata = loader.consolidate_saved_files(str(store))
+    assert is_price_store(store) and not is_price_store(loader.output_dir)
+    assert metadata["symbols"] == ["AAPL", "IBM", "MSFT"]
+    assert list(metadata["partitions"]) == ["2022", "2023", "2024"]
+    assert metadata["partitions"]["2024"]["symbols"] == 2
+    assert metadata["partitions"]["2023"]["min_date"] == "2023-01-02"
+    assert np.load(store / "year=2023" / "symbol.npy").dtype == np.uint16
+
+    ticks = load_price_store(store)
+    expected = load_market_data_yf(loader.output_dir)
+    key = lambda t: (t.timestamp, t.symbol)
+    assert ticks == sorted(expected, key=key)
+
+    # Pruned to one partition, then filtered by date and symbol
+    window = load_price_store(store, start="2024-03-01", end=datetime(2024, 3, 31), symbols=["IBM", "MSFT", "XYZ"])
+    assert window == [t for t in ticks if t.symbol == "MSFT" and datetime(2024, 3, 1) <= t.timestamp <= datetime(2024, 3, 31)]
+    assert load_price_store(store, symbols=["IBM"]) == [t for t in ticks if t.symbol == "IBM"]
+
+
+def test_rewriting_the_store_replaces_it(tmp_path):
+    loader = _saved_prices(tmp_path)
+    store = tmp_path / "store"
+    loader.consolidate_saved_files(str(store))
+    (loader.output_dir / "IBM.csv").unlink()
+    loader.consolidate_saved_files(str(store))
+
+    metadata = json.loads((store / "_metadata.json").read_text())
+    assert metadata["symbols"] == ["AAPL", "MSFT"] and metadata["partitions"]["2022"]["symbols"] == 1
+    assert {t.symbol for t in load_price_store(store)} == {"AAPL", "MSFT"}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["prices", "store"]
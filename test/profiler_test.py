@@ -6,6 +6,7 @@ from pathlib import Path
 import pstats
 
 from Assignment3.profiler import StrategyProfiler
+from Assignment3.results_store import ProfilingResultsStore
 from Assignment3.strategies import NaiveMovingAverageStrategy
 from trading_lib.models import RecordingInterval
 from trading_lib.data_generator import generate_market_csv
@@ -23,7 +24,8 @@ def _run_and_assert_outputs(out_dir: Path):
         num_ticks=1_000,
     )
 
-    StrategyProfiler(output_path=str(out_dir)).profile_strategies(
+    store = ProfilingResultsStore(str(out_dir / "profiling_results.sqlite"))
+    StrategyProfiler(output_path=str(out_dir), results_store=store).profile_strategies(
         strategies=[NaiveMovingAverageStrategy(quantity=10)],
         cash=100_000,
         failure_rate=0.0,
@@ -49,6 +51,16 @@ def _run_and_assert_outputs(out_dir: Path):
     ps = pstats.Stats(str(prof_files[0]))
     assert len(ps.stats) > 0, "cProfile stats are empty/unreadable"
 
+    # machine-readable record
+    result = store.latest(strategy_name, "test")
+    assert result is not None, "Profiling result was not stored"
+    assert result["ticks"] == 1_000
+    assert result["wall_seconds"] > 0 and result["cpu_seconds"] >= 0
+    assert result["repeats"] == 5 and result["wall_min_seconds"] <= result["wall_seconds"]
+    assert result["latency_p50_us"] <= result["latency_p99_us"] <= result["latency_max_us"]
+    assert result["peak_rss_mib"] > 0
+    assert result["function_calls"] > 0
+
 
 def test_profiler_writes_expected_artifacts(tmp_path):
     """Pytest entrypoint: uses tmp_path for hermetic outputs."""
@@ -0,0 +1,49 @@
+from Assignment3.regression import baseline_results, compare_results, format_diff_table, git_revision, main
+from Assignment3.results_store import ProfilingResultsStore
+
+
+def _result(wall, iqr, p99=10.0, mib=1.0):
+    return {"ticks": 1000, "wall_seconds": wall, "wall_iqr_seconds": iqr,
+            "latency_p99_us": p99, "peak_traced_mib": mib}
+
+
+def test_compare_results_is_noise_aware():
+    baseline = {"steady": _result(1.0, 0.01), "noisy": _result(1.0, 0.2), "fat": _result(1.0, 0.01)}
+    current = {"steady": _result(1.2, 0.01), "noisy": _result(1.2, 0.2), "fat": _result(1.0, 0.01, mib=2.0)}
+    regressions = {c["strategy"]: c["regressions"] for c in compare_results(baseline, current)}
+    # a 20% slowdown fails when runs are steady, not when it is within twice the IQR
+    assert regressions == {"steady": ["throughput"], "noisy": [], "fat": ["memory"]}
+
+    table = format_diff_table(compare_results(baseline, current), "abc", "def")
+    assert "| steady | 1,000 -> 833 (-16.7%)" in table and "REGRESSION: memory" in table
+
+
+def test_results_per_revision(tmp_path):
+    assert git_revision()
+    store_path = str(tmp_path / "bench.sqlite")
+    common = ["-t", "300", "-r", "1", "-w", "0", "--strategies", "OptimizedMovingAverageStrategy",
+              "--store_path", store_path]
+    assert main(common + ["--revision", "r1"]) == 0
+    assert main(common + ["--revision", "r2", "--tolerance", "100", "--latency_tolerance", "100",
+                          "--memory_tolerance", "100"]) == 0
+
+    store = ProfilingResultsStore(store_path)
+    assert store.revisions("300x1") == ["r1", "r2"]
+    assert store.runs(revision="r2")[0]["latency_p99_us"] > 0
+
+
+def test_baseline_is_per_engine_mode(tmp_path):
+    store_path = str(tmp_path / "bench.sqlite")
+    common = ["-t", "300", "-r", "1", "-w", "0", "--strategies", "OptimizedMovingAverageStrategy",
+              "--store_path", store_path]
+    assert main(common + ["--revision", "r1", "--mode", "tick"]) == 0
+    # a 1s-mode run has no baseline yet, however the tick run compares
+    assert main(common + ["--revision", "r2", "--mode", "1s", "--tolerance", "0", "--latency_tolerance", "0",
+                          "--memory_tolerance", "0"]) == 0
+
+    store = ProfilingResultsStore(store_path)
+    assert store.revisions("300x1") == ["r1", "r2"]
+    assert store.revisions("300x1", "tick") == ["r1"] and store.revisions("300x1", "1s") == ["r2"]
+    strategies = ["OptimizedMovingAverageStrategy"]
+    assert baseline_results(store, "r1", "300x1", strategies, "1s") == {}
+    assert baseline_results(store, "r1", "300x1", strategies, "tick")["OptimizedMovingAverageStrategy"]["engine_mode"] == "tick"
@@ -0,0 +1,50 @@
+from datetime import datetime
+
+import numpy as np
+
+from trading_lib.reporting import downsample_minmax, generate_performance_reports
+
+
+def test_downsample_keeps_extremes_in_order():
+    rng = np.random.default_rng(0)
+    y = np.cumsum(rng.normal(size=100_003))
+    x = np.arange(len(y))
+    xs, ys = downsample_minmax(x, y, 500)
+
+    assert len(ys) <= 2 * 500 + 2
+    assert (np.diff(xs) > 0).all()
+    assert (xs[0], xs[-1]) == (0, len(y) - 1)
+    assert ys.max() == y.max() and ys.min() == y.min()
+    np.testing.assert_array_equal(ys, y[xs])
+
+
+def test_downsample_short_series_unchanged():
+    xs, ys = downsample_minmax([1, 2, 3], [10.0, 5.0, 7.0], 500)
+    assert xs.tolist() == [1, 2, 3] and ys.tolist() == [10.0, 5.0, 7.0]
+
+
+def _report_inputs(final_value):
+    history = [(datetime(2025, 1, 1, 10, 0, i), 1000.0, float(i)) for i in range(10)]
+    metrics = {"total_return": 1.0, "pnl": 10.0, "sharpe_ratio": 0.3, "max_drawdown": -1.0,
+               "final_value": final_value, "starting_value": 1000.0}
+    return metrics, history
+
+
+def test_reports_cached_by_content(tmp_path, capsys):
+    reports = []
+    for name in ("First", "Second"):
+        metrics, history = _report_inputs(1010.0)
+        reports.append((metrics, history, str(tmp_path / f"{name}_performance.md")))
+    generate_performance_reports(reports, workers=2)
+    assert (tmp_path / "First_equity_curve.png").exists()
+    assert (tmp_path / "Second_equity_curve.png").exists()
+    assert "(First_equity_curve.png)" in (tmp_path / "First_performance.md").read_text()
+    capsys.readouterr()
+
+    generate_performance_reports(reports, workers=2)
+    assert capsys.readouterr().out.count("unchanged") == 2
+
+    metrics, history = _report_inputs(1020.0)
+    generate_performance_reports([(metrics, history, reports[0][2])], workers=1)
+    assert "generated" in capsys.readouterr().out
+    assert "$1,020.00" in (tmp_path / "First_performance.md").read_text()
@@ -0,0 +1,47 @@
+import math
+
+from Assignment3.results_store import ProfilingResultsStore
+from Assignment3.scaling import ENGINE_MODES, STRATEGIES, fit_power_law, fit_scaling, run_scaling_suite, size_label
+from trading_lib.data_generator import generate_ticks
+
+
+def test_generate_ticks_is_deterministic():
+    ticks = list(generate_ticks(9, num_symbols=3, seed=4))
+    assert ticks == list(generate_ticks(9, num_symbols=3, seed=4))
+    assert ticks != list(generate_ticks(9, num_symbols=3, seed=5))
+    assert [t.symbol for t in ticks[:4]] == ["SYM0000", "SYM0001", "SYM0002", "SYM0000"]
+    # one timestamp per round of symbols
+    assert len({t.timestamp for t in ticks}) == 3
+
+
+def test_fit_power_law():
+    sizes = [1_000, 10_000, 100_000]
+    exponent, r_squared = fit_power_law(sizes, [2e-9 * n ** 2 for n in sizes])
+    assert math.isclose(exponent, 2.0) and math.isclose(r_squared, 1.0)
+    assert math.isnan(fit_power_law([1_000], [1.0])[0])
+    assert size_label(10_000_000) == "10M" and size_label(1_000) == "1k" and size_label(1_500) == "1500"
+
+
+def test_fit_scaling_flags_super_linear():
+    rows = []
+    for n in (1_000, 10_000, 100_000):
+        for name, seconds in (("linear", 1e-6 * n), ("quadratic", 1e-9 * n ** 2)):
+            rows.append({"strategy": name, "engine_mode": "tick", "axis": "ticks", "size": n,
+                         "wall_min_seconds": seconds, "peak_traced_mib": 1e-4 * n})
+    flagged = {fit["strategy"]: fit["time_flagged"] for fit in fit_scaling(rows)}
+    assert flagged == {"linear": False, "quadratic": True}
+
+
+def test_run_scaling_suite(tmp_path):
+    store = ProfilingResultsStore(str(tmp_path / "scaling.sqlite"))
+    rows = run_scaling_suite(
+        strategies={"OptimizedMovingAverageStrategy": STRATEGIES["OptimizedMovingAverageStrategy"]},
+        modes={"streaming": ENGINE_MODES["streaming"]},
+        tick_counts=(200, 400), symbol_counts=(1, 4), base_ticks=400,
+        repeats=1, warmup=0, store=store,
+    )
+    assert [(r["axis"], r["ticks"], r["symbols"]) for r in rows] == [
+        ("ticks", 200, 1), ("ticks", 400, 1), ("symbols", 400, 1), ("symbols", 400, 4)]
+    assert all(r["peak_traced_mib"] > 0 for r in rows)
+    stored = store.runs(strategy="OptimizedMovingAverageStrategy", dataset="400x4")
+    assert stored[0]["engine_mode"] == "streaming" and stored[0]["symbols"] == 4
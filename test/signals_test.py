@@ -0,0 +1,42 @@
+from datetime import datetime
+
+import pytest
+
+from trading_lib.models import Action, MarketDataPoint
+from trading_lib.signals import BUY, HOLD, SELL, SignalBuffer
+from trading_lib.strategy import Strategy
+
+
+def test_signal_buffer_reuse():
+    signals = SignalBuffer(capacity=1)
+    signals.emit("AAPL", 10, 100.0, BUY)
+    signals.emit("MSFT", -5, 200.0, SELL)  # grows past the initial capacity
+    assert len(signals) == 2
+    assert signals.to_tuples() == [("AAPL", 10, 100.0, Action.BUY), ("MSFT", -5, 200.0, Action.SELL)]
+
+    signals.clear()
+    assert signals.to_tuples() == []
+    signals.emit("GOOG", 1, 50.0, HOLD)
+    assert signals.to_tuples() == [("GOOG", 1, 50.0, Action.HOLD)]
+
+
+def test_strategy_adapters():
+    class ListStrategy(Strategy):
+        def generate_signals(self, tick):
+            return [(tick.symbol, self.quantity, tick.price, Action.SELL)]
+
+    class BufferStrategy(Strategy):
+        def emit_signals(self, tick, signals):
+            signals.emit(tick.symbol, self.quantity, tick.price, SELL)
+
+    tick = MarketDataPoint(datetime(2025, 1, 1), "AAPL", 100.0)
+    for strategy in (ListStrategy(10), BufferStrategy(10)):
+        signals = SignalBuffer()
+        strategy.emit_signals(tick, signals)
+        assert signals.to_tuples() == strategy.generate_signals(tick) == [("AAPL", 10, 100.0, Action.SELL)]
+
+
+def test_strategy_must_implement_signals():
+    with pytest.raises(TypeError):
+        class EmptyStrategy(Strategy):
+            pass
@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous budget for the cumulative import time of the CLI entry modules;
+# importing matplotlib alone takes several times longer
+STARTUP_BUDGET_US = 250_000
+
+
+def _import_times(module: str) -> dict:
+    """Cumulative import time in microseconds per module, from `python -X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            times[name.strip()] = int(cumulative)
+        except ValueError:
+            continue  # header line
+    return times
+
+
+@pytest.mark.parametrize("module", ["trading_lib.StrategyComparator", "Assignment3.profiler"])
+def test_no_heavy_imports_at_startup(module):
+    times = _import_times(module)
+    heavy = [name for name in times if name.split(".")[0] in ("matplotlib", "memory_profiler", "numpy")]
+    assert heavy == []
+    assert times[module] < STARTUP_BUDGET_US
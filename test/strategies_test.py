@@ -113,4 +113,27 @@ def test_momentum(
 
     assert len(signals) == 2
     assert signals[0] == ("AAPL", 0, 102, Action.HOLD) # momentum_pct = 2%, so signal, no holding period
-    assert signals[1] == ("AAPL", 10, 106, Action.BUY) # momentum_pct = 3.92%, buy signal, holding period starts
\ No newline at end of file
+    assert signals[1] == ("AAPL", 10, 106, Action.BUY) # momentum_pct = 3.92%, buy signal, holding period starts
+
+def test_symbols_do_not_mix():
+    base_time = datetime(year=2025, month=9, day=21, hour=19, minute=54)
+    aapl = [100, 101, 102, 106, 108, 110, 104, 99, 98, 97]
+    msft = [300, 290, 280, 285, 295, 310, 320, 305, 290, 280]
+
+    for make in (
+        lambda: strategies.MovingAverageCrossoverStrategy(short_window=3, long_window=5, quantity=10),
+        lambda: strategies.MomentumStrategy(lookback=3, holding_period=2, quantity=10),
+    ):
+        separate = []
+        for symbol, prices in (("AAPL", aapl), ("MSFT", msft)):
+            strategy = make()
+            for price in prices:
+                separate.extend(strategy.generate_signals(MarketDataPoint(base_time, symbol, price)))
+
+        strategy = make()
+        interleaved = []
+        for i in range(len(aapl)):
+            interleaved.extend(strategy.generate_signals(MarketDataPoint(base_time, "AAPL", aapl[i])))
+            interleaved.extend(strategy.generate_signals(MarketDataPoint(base_time, "MSFT", msft[i])))
+
+        assert sorted(interleaved) == sorted(separate)
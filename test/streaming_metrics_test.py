@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from trading_lib.engine import ExecutionEngine
+from trading_lib.models import MarketDataPoint, RecordingInterval
+from trading_lib.portfolio import Portfolio
+from trading_lib.reporting import calculate_max_drawdown, calculate_sharpe_ratio
+from trading_lib.streaming_metrics import StreamingMetrics
+from Assignment2.BenchmarkStrategy import BenchmarkStrategy
+
+
+def test_matches_batch_metrics():
+    base_time = datetime(2025, 1, 1)
+    values = [100.0, 110.0, 99.0, 105.0, 120.0, 90.0, 95.0, 125.0]
+    metrics = StreamingMetrics()
+    for i, value in enumerate(values):
+        metrics.update(base_time + timedelta(days=i), value)
+
+    assert metrics.total_return == pytest.approx(25.0)
+    # 120 -> 90 -> 95 -> 125: under water for two periods, two days after the peak
+    assert metrics.max_periods_under_water == 2
+    assert metrics.max_time_under_water == timedelta(days=2)
+    assert metrics.drawdown == 0.0
+
+
+def test_matches_reporting_on_engine_history():
+    # Holdings swing while cash stays flat, so cash alone would show no drawdown
+    base_time = datetime(2025, 1, 1, 10, 0, 0)
+    prices = [100.0, 120.0, 80.0, 90.0, 130.0, 70.0, 110.0]
+    ticks = [MarketDataPoint(base_time + timedelta(seconds=i), "AAPL", price) for i, price in enumerate(prices)]
+    engine = ExecutionEngine(BenchmarkStrategy(quantity=10), Portfolio(cash=1000),
+                             recording_interval=RecordingInterval.TICK, verbose=False)
+    engine.process_ticks(ticks)
+
+    history = engine.get_portfolio_history()
+    snapshot = engine.get_metrics()
+    assert snapshot["sharpe_ratio"] == pytest.approx(calculate_sharpe_ratio(history))
+    assert snapshot["max_drawdown"] == pytest.approx(calculate_max_drawdown(history))
+    assert calculate_max_drawdown(history) == pytest.approx((700 - 1300) / 1300 * 100)
+
+
+def test_engine_without_history():
+    base_time = datetime(2025, 1, 1, 10, 0, 0)
+    ticks = [MarketDataPoint(base_time + timedelta(seconds=i), "AAPL", price)
+             for i, price in enumerate([100.0, 90.0, 95.0, 80.0, 110.0])]
+    engine = ExecutionEngine(BenchmarkStrategy(quantity=10), Portfolio(cash=1000),
+                             recording_interval=RecordingInterval.TICK, keep_history=False)
+    engine.process_ticks(ticks)
+
+    assert engine.get_portfolio_history() == []
+    snapshot = engine.get_metrics()
+    assert snapshot["periods"] == 5
+    assert snapshot["total_return"] == pytest.approx(10.0)  # 1000 -> 1100
+    assert snapshot["max_drawdown"] == pytest.approx(-20.0)  # 1000 -> 800
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Assignment2.PriceLoader import PriceLoader, frame_to_ticks, wide_frame_to_ticks
+from trading_lib.engine import ExecutionEngine
+from trading_lib.models import MarketDataPoint
+from trading_lib.portfolio import Portfolio
+from trading_lib.strategy import Strategy
+from trading_lib.tick_series import TickSeries
+
+
+def test_frame_to_ticks_matches_row_by_row(tmp_path):
+    dates = pd.bdate_range("2024-01-01", periods=200, name="Date")
+    df = pd.DataFrame({"Close": 100 + np.arange(200) / 8}, index=dates)
+    expected = [MarketDataPoint(d.to_pydatetime(), "AAPL", float(c)) for d, c in zip(dates, df["Close"])]
+
+    ticks = frame_to_ticks(df, "AAPL")
+    assert len(ticks) == 200 and ticks == expected
+    assert ticks[-1] == expected[-1] and ticks[5:8] == expected[5:8] and isinstance(ticks[5:8], TickSeries)
+    assert type(ticks[0].timestamp) is datetime and type(ticks[0].price) is float
+    with pytest.raises(IndexError):
+        ticks[200]
+
+    loader = PriceLoader("2024-01-01", "2024-12-31", str(tmp_path))
+    loader.save_data_to_file("AAPL", df)
+    assert loader.load_ticker_from_csv("AAPL") == expected
+
+    # tz-aware dates keep their wall-clock time; non-numeric prices are skipped
+    aware = pd.DataFrame({"Close": ["1.5", "n/a", "2.5"]}, index=dates[:3].tz_localize("America/New_York"))
+    assert frame_to_ticks(aware, "IBM") == [MarketDataPoint(datetime(2024, 1, 1), "IBM", 1.5),
+                                            MarketDataPoint(datetime(2024, 1, 3), "IBM", 2.5)]
+
+
+def test_load_ticker_from_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    dates = pd.bdate_range("2024-01-01", periods=20, name="Date")
+    df = pd.DataFrame({"Close": 100 + np.arange(20) / 8}, index=dates)
+    loader = PriceLoader("2024-01-01", "2024-12-31", str(tmp_path))
+    loader.save_data_to_file("AAPL", df, "parquet")
+    assert loader.load_ticker_from_parquet("AAPL") == frame_to_ticks(df, "AAPL")
+
+
+def test_wide_frame_to_ticks():
+    dates = pd.bdate_range("2024-01-01", periods=3)
+    wide = pd.DataFrame({"MSFT": [1.0, 2.0, 3.0], "AAPL": [np.nan, 5.0, 6.0]}, index=dates)
+    expected = [MarketDataPoint(d.to_pydatetime(), s, float(wide.at[d, s]))
+                for d in dates for s in ["MSFT", "AAPL"] if not np.isnan(wide.at[d, s])]
+    assert wide_frame_to_ticks(wide) == expected
+
+    # yf.download layout: (field, ticker) columns
+    download = pd.concat({"Close": wide, "Open": wide * 0}, axis=1)
+    ticks = wide_frame_to_ticks(download)
+    assert ticks == expected and ticks.symbols == ("MSFT", "AAPL")
+
+
+def test_engine_runs_on_tick_series():
+    class Recorder(Strategy):
+        def __init__(self):
+            super().__init__(1)
+            self.seen = []
+
+        def emit_signals(self, tick, signals):
+            self.seen.append(tick)
+
+    dates = pd.date_range("2024-01-01", periods=100_001, freq="min")
+    ticks = frame_to_ticks(pd.DataFrame({"Close": np.linspace(1, 2, len(dates))}, index=dates), "SPY")
+    strategy = Recorder()
+    ExecutionEngine(strategy, Portfolio(cash=100), verbose=False).process_ticks(ticks)
+    assert strategy.seen == ticks.to_list()
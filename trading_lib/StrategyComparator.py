@@ -1,17 +1,37 @@
 from trading_lib.strategy import Strategy
 from trading_lib.models import RecordingInterval, MarketDataPoint
-from trading_lib.engine import ExecutionEngine
+from trading_lib.engine import ExecutionEngine, process_ticks_lockstep
+from trading_lib.indicators import IndicatorRegistry
 from trading_lib.portfolio import Portfolio
-from trading_lib.reporting import generate_performance_report, calc_performance_metrics
-from trading_lib.data_loader import load_market_data, load_market_data_yf
+from trading_lib.reporting import generate_performance_reports, calc_performance_metrics
+from trading_lib.data_loader import is_price_store, load_market_data, load_market_data_yf, load_price_store
 
 import os
 from datetime import datetime
+from typing import Optional
 import csv
 
 class StrategyComparator:
-    def __init__(self, output_path: str = ""):
+    def __init__(
+        self,
+        output_path: str = "",
+        precompute_indicators: bool = False,
+        indicator_cache_dir: Optional[str] = None,
+        bootstrap_resamples: int = 0,
+        bootstrap_workers: int = 1,
+        charts: bool = True,
+        chart_workers: Optional[int] = None
+    ):
         self.output_path = output_path
+        # Compute indicators over the whole price series up front (offline backtests only)
+        self.precompute_indicators = precompute_indicators
+        self.indicator_cache_dir = indicator_cache_dir
+        # Block-bootstrap confidence intervals for the metrics (0 disables them)
+        self.bootstrap_resamples = bootstrap_resamples
+        self.bootstrap_workers = bootstrap_workers
+        self.charts = charts
+        # Processes rendering the strategies' charts (None: one per chart, up to the CPU count)
+        self.chart_workers = chart_workers
     
     def compare_strategies(
         self, 
@@ -23,6 +43,8 @@ class StrategyComparator:
     ):
         if os.path.isfile(price_path):
             ticks = load_market_data(price_path)
+        elif is_price_store(price_path):
+            ticks = load_price_store(price_path)
         elif os.path.isdir(price_path):
             ticks = load_market_data_yf(price_path)
         else:
@@ -49,6 +71,15 @@ class StrategyComparator:
         print(f"{'='*60}")
         print(f"Sharpe Ratio:        {metrics['sharpe_ratio']:.2f}")
         print(f"Max Drawdown:        {metrics['max_drawdown']:.2f}%")
+
+        intervals = metrics.get("confidence_intervals")
+        if intervals:
+            print(f"\n{'='*60}")
+            print(f"BOOTSTRAP 95% CONFIDENCE INTERVALS (total portfolio value)")
+            print(f"{'='*60}")
+            print(f"Sharpe Ratio:        {intervals['sharpe_ratio'][1]:.4f} to {intervals['sharpe_ratio'][2]:.4f}")
+            print(f"Total Return:        {intervals['total_return'][1]:.2f}% to {intervals['total_return'][2]:.2f}%")
+            print(f"Max Drawdown:        {intervals['max_drawdown'][1]:.2f}% to {intervals['max_drawdown'][2]:.2f}%")
         
         if holdings:
             print(f"\n{'='*60}")
@@ -68,19 +99,37 @@ class StrategyComparator:
         ticks: list[MarketDataPoint]
     ):
         
+        # One registry for the whole run, so the strategies advance in lockstep.
+        # A series two strategies request with the same (indicator, params) is
+        # computed once per tick; the default Assignment 2 strategies request
+        # disjoint series (SMA 20/50, RSI 14, volatility 20; MACD and the
+        # benchmark keep their own state), so there it saves nothing.
+        if self.precompute_indicators:
+            # NumPy-backed modules are imported on demand to keep startup fast
+            from trading_lib.precompute import PrecomputedIndicators
+            indicators = PrecomputedIndicators(ticks, cache_dir=self.indicator_cache_dir)
+        else:
+            indicators = IndicatorRegistry()
+        engines = []
         for strategy in strategies:
-            portfolio = Portfolio(cash=cash)
+            strategy.bind_indicators(indicators)
+            engines.append(ExecutionEngine(strategy, Portfolio(cash=cash), failure_rate, recording_interval=interval))
+
+        process_ticks_lockstep(engines, ticks)
+
+        final_timestamp = max(tick.timestamp for tick in ticks)
+        reports = []
+        for strategy, engine in zip(strategies, engines):
+            portfolio = engine.portfolio
             strategy_name = strategy.__class__.__name__
 
-            engine = ExecutionEngine(strategy, portfolio, failure_rate, recording_interval=interval)
-            engine.process_ticks(ticks)
-            
-            final_timestamp = max(tick.timestamp for tick in ticks)
             engine.record_final_state(final_timestamp)
 
             current_prices = engine.get_current_prices()
             periodic_returns = engine.get_portfolio_history()
             metrics = calc_performance_metrics(portfolio, cash, ticks, current_prices, periodic_returns)
+            if self.bootstrap_resamples > 0:
+                self.add_confidence_intervals(metrics, periodic_returns)
 
             self.print_portfolio_summary(portfolio, metrics, current_prices)
             
@@ -88,12 +137,27 @@ class StrategyComparator:
             if self.output_path != "":
                 output_file = self.output_path + "/" + output_file
                 
-            generate_performance_report(metrics, periodic_returns, output_file)
+            reports.append((metrics, periodic_returns, output_file))
             self.write_portfolio_history(engine.portfolio_history, strategy_name)
 
+        # Unchanged reports are skipped and charts are rendered in parallel
+        generate_performance_reports(reports, charts=self.charts, workers=self.chart_workers)
+
+    def add_confidence_intervals(self, metrics: dict, portfolio_history: list[tuple[datetime, float, float]]):
+        from trading_lib.metrics import history_to_arrays
+        from trading_lib.bootstrap import bootstrap_confidence_intervals
+
+        _, values = history_to_arrays(portfolio_history)
+        try:
+            metrics["confidence_intervals"] = bootstrap_confidence_intervals(
+                values, self.bootstrap_resamples, workers=self.bootstrap_workers)
+        except ValueError as e:
+            print(f"Skipping bootstrap confidence intervals: {e}")
+
     def write_portfolio_history(self, portfolio_history: list[tuple[datetime, float, float]], strategy_name: str):
         output_file = strategy_name + "_portfolio_history.csv"
         if self.output_path != "":
+            os.makedirs(self.output_path, exist_ok=True)
             output_file = self.output_path + "/" + output_file
         with open(output_file, "w") as csv.csvfile:
             csv_writer = csv.writer(csv.csvfile)
@@ -0,0 +1,125 @@
+"""Block-bootstrap confidence intervals for strategy metrics.
+
+Periodic returns are resampled in circular blocks, which keeps short-range
+autocorrelation, and each resample is compounded into a growth curve.
+Resamples are drawn and scored a chunk of rows at a time with whole-matrix
+NumPy reductions, so there is no per-resample Python loop and memory stays
+bounded by `CHUNK_ELEMENTS` however many resamples or returns there are.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from trading_lib import metrics
+
+BOOTSTRAP_METRICS = ("sharpe_ratio", "total_return", "max_drawdown")
+# Elements per (resamples, returns) matrix in one chunk: 32 MiB of float64
+CHUNK_ELEMENTS = 1 << 22
+
+
+def block_bootstrap_indices(n: int, n_resamples: int, block_size: int, rng: np.random.Generator) -> np.ndarray:
+    """(n_resamples, n) indexes into a length-n series, made of circular blocks."""
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(n_resamples, n_blocks))
+    offsets = np.arange(block_size)
+    indices = (starts[:, :, None] + offsets) % n
+    return indices.reshape(n_resamples, n_blocks * block_size)[:, :n]
+
+
+def _score(sampled: np.ndarray, periods_per_year: Optional[float]) -> Dict[str, np.ndarray]:
+    """Metrics for each row of a (resamples, returns) matrix."""
+    # Resampled returns never follow a zero value, so the statistics can be
+    # taken straight from them instead of re-deriving returns from equity
+    mean = sampled.mean(axis=1)
+    std = sampled.std(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sharpe = np.where(std > 0, mean / std, 0.0)
+    if periods_per_year:
+        sharpe = sharpe * np.sqrt(periods_per_year)
+
+    growth = np.cumprod(1 + sampled, axis=1)
+    peak = np.maximum(np.maximum.accumulate(growth, axis=1), 1.0)
+    drawdown = np.minimum((growth / peak - 1).min(axis=1), 0.0) * 100
+    return {
+        "sharpe_ratio": sharpe,
+        "total_return": (growth[:, -1] - 1) * 100,
+        "max_drawdown": drawdown,
+    }
+
+
+def _resample_metrics(
+    rets: np.ndarray,
+    n_resamples: int,
+    block_size: int,
+    seed,
+    periods_per_year: Optional[float],
+    chunk_elements: int = CHUNK_ELEMENTS,
+) -> Dict[str, np.ndarray]:
+    """Metrics for `n_resamples` resampled return series (top-level so workers can pickle it).
+
+    Resamples are processed `chunk_elements // len(rets)` rows at a time.
+    The chunks draw from one generator in order, so the results do not
+    depend on the chunk size.
+    """
+    rng = np.random.default_rng(seed)
+    rows = max(1, chunk_elements // len(rets))
+    parts = []
+    for start in range(0, n_resamples, rows):
+        count = min(rows, n_resamples - start)
+        parts.append(_score(rets[block_bootstrap_indices(len(rets), count, block_size, rng)], periods_per_year))
+    if not parts:
+        return {name: np.empty(0) for name in BOOTSTRAP_METRICS}
+    return {name: np.concatenate([part[name] for part in parts]) for name in BOOTSTRAP_METRICS}
+
+
+def bootstrap_confidence_intervals(
+    values: np.ndarray,
+    n_resamples: int = 2000,
+    block_size: Optional[int] = None,
+    confidence: float = 0.95,
+    periods_per_year: Optional[float] = None,
+    seed: Optional[int] = None,
+    workers: int = 1,
+) -> Dict[str, Tuple[float, float, float]]:
+    """(estimate, low, high) for Sharpe ratio, total return and max drawdown.
+
+    `values` is the recorded equity series. Returns after a zero value are
+    dropped before resampling. `block_size` defaults to n ** (1/3). With
+    `workers > 1` the resamples are split across processes, each seeded from
+    `seed`, so results are reproducible for a given worker count.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rets = metrics.returns(values)
+    rets = rets[~np.isnan(rets)]
+    if len(rets) < 2:
+        raise ValueError("Need at least two returns to bootstrap")
+    if block_size is None:
+        block_size = max(1, round(len(rets) ** (1 / 3)))
+    block_size = min(block_size, len(rets))
+
+    seeds = np.random.SeedSequence(seed).spawn(max(1, workers))
+    if workers > 1:
+        chunks = [len(part) for part in np.array_split(np.arange(n_resamples), workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(
+                _resample_metrics,
+                [rets] * workers, chunks,
+                [block_size] * workers, seeds, [periods_per_year] * workers,
+            ))
+        samples = {name: np.concatenate([part[name] for part in parts]) for name in BOOTSTRAP_METRICS}
+    else:
+        samples = _resample_metrics(rets, n_resamples, block_size, seeds[0], periods_per_year)
+
+    estimates = {
+        "sharpe_ratio": metrics.sharpe_ratio(values, periods_per_year),
+        "total_return": metrics.total_return(values),
+        "max_drawdown": metrics.max_drawdown(values),
+    }
+    tail = (1 - confidence) / 2 * 100
+    intervals = {}
+    for name in BOOTSTRAP_METRICS:
+        low, high = np.percentile(samples[name], [tail, 100 - tail])
+        intervals[name] = (float(estimates[name]), float(low), float(high))
+    return intervals
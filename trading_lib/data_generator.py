@@ -3,9 +3,12 @@ import datetime
 import random
 import time
 from dataclasses import dataclass
+from typing import Iterator
 
 import os
 
+from trading_lib import models
+
 
 @dataclass(frozen=True)
 class MarketDataPoint:
@@ -73,6 +76,39 @@ def generate_market_csv(
             writer.writerow([tick.timestamp.isoformat(), tick.symbol, tick.price])
 
 
+def generate_ticks(
+    num_ticks: int,
+    num_symbols: int = 1,
+    start_price: float = 150.0,
+    volatility: float = 0.01,
+    seed: int = 0,
+    start: datetime.datetime = datetime.datetime(2025, 1, 1),
+    step: datetime.timedelta = datetime.timedelta(seconds=1),
+) -> Iterator[models.MarketDataPoint]:
+    """
+    Deterministic in-memory ticks for benchmarks: no clock, no sleeps, no files.
+
+    Symbols "SYM0000", "SYM0001", ... are interleaved round-robin and share a
+    timestamp per round, which advances by `step`. Each symbol follows its own
+    Gaussian random walk from `start_price`; the same `seed` always yields the
+    same ticks.
+
+    :param num_ticks: Total number of ticks across all symbols.
+    :param num_symbols: Number of distinct symbols.
+    :yield: trading_lib.models.MarketDataPoint(timestamp, symbol, price)
+    """
+    rng = random.Random(seed)
+    symbols = [f"SYM{i:04d}" for i in range(num_symbols)]
+    prices = [start_price] * num_symbols
+    timestamp = start
+    for i in range(num_ticks):
+        k = i % num_symbols
+        if i and k == 0:
+            timestamp += step
+        prices[k] = round(prices[k] * (1 + rng.gauss(0, volatility)), 2)
+        yield models.MarketDataPoint(timestamp, symbols[k], prices[k])
+
+
 if __name__ == "__main__":
     # Example: generate 500 ticks for AAPL starting at $150.00 into a file
 
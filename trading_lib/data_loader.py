@@ -1,7 +1,8 @@
 import csv
+import json
 from datetime import datetime
 from pathlib import Path
-from typing import List, Iterator
+from typing import List, Iterator, Optional
 import os
 
 from trading_lib.models import MarketDataPoint
@@ -112,6 +113,79 @@ def stream_market_data_csv(path: str) -> Iterator[MarketDataPoint]:
             except ValueError as e:
                 raise ValueError(f"Error parsing line {reader.line_num}: {e}") from e
 
+# Consolidated price store: one directory per year holding aligned .npy
+# columns (date as datetime64[D], symbol as an index into the symbol
+# dictionary, close as float64), rows sorted by date then symbol, and a
+# metadata file with the dictionary and each partition's date range.
+STORE_METADATA = "_metadata.json"
+
+
+def store_partition_dir(store_dir: Path, year) -> Path:
+    return Path(store_dir) / f"year={year}"
+
+
+def is_price_store(path) -> bool:
+    return os.path.isfile(os.path.join(path, STORE_METADATA))
+
+
+def read_store_metadata(store_dir: Path) -> dict:
+    with open(Path(store_dir) / STORE_METADATA) as f:
+        return json.load(f)
+
+
+def load_price_store(store_dir: Path, start=None, end=None, symbols: Optional[List[str]] = None) -> List[MarketDataPoint]:
+    """
+    Loads market data from a consolidated price store in timestamp order.
+
+    Partitions whose date range misses [`start`, `end`] are not opened;
+    the rest are read one column file at a time and filtered by date and
+    `symbols` before any MarketDataPoint is built.
+    """
+    import numpy as np
+
+    metadata = read_store_metadata(store_dir)
+    names = np.array(metadata["symbols"], dtype=object)
+    first = str(np.datetime64(start, "D")) if start is not None else None
+    last = str(np.datetime64(end, "D")) if end is not None else None
+    codes = None
+    if symbols is not None:
+        lookup = {name: code for code, name in enumerate(metadata["symbols"])}
+        codes = np.array([lookup[s] for s in symbols if s in lookup], dtype=np.int64)
+
+    market_data: List[MarketDataPoint] = []
+    scanned = 0
+    for year, stats in sorted(metadata["partitions"].items()):
+        # ISO dates compare correctly as strings
+        if (first is not None and stats["max_date"] < first) or (last is not None and stats["min_date"] > last):
+            continue
+        scanned += 1
+        partition = store_partition_dir(store_dir, year)
+        dates = np.load(partition / "date.npy")
+        symbol_codes = np.load(partition / "symbol.npy")
+        closes = np.load(partition / "close.npy")
+
+        keep = np.ones(len(dates), dtype=bool)
+        if first is not None:
+            keep &= dates >= np.datetime64(first)
+        if last is not None:
+            keep &= dates <= np.datetime64(last)
+        if codes is not None:
+            keep &= np.isin(symbol_codes, codes)
+        if not keep.all():
+            dates, symbol_codes, closes = dates[keep], symbol_codes[keep], closes[keep]
+
+        market_data.extend(map(
+            MarketDataPoint,
+            dates.astype("datetime64[us]").tolist(),
+            names[symbol_codes].tolist(),
+            closes.tolist(),
+        ))
+
+    print(f"Loaded {len(market_data)} data points from {scanned} of {len(metadata['partitions'])} "
+          f"partitions in '{store_dir}'")
+    return market_data
+
+
 if __name__ == "__main__":
     # Example usage
     example = read_yf_price_file("data/prices/IBM.csv")
@@ -1,11 +1,20 @@
 import random
 from datetime import datetime
-from typing import List, Tuple, Optional, Iterable
+from time import perf_counter_ns
+from typing import List, Optional, Iterable
 
-from trading_lib.models import Action, MarketDataPoint, Order, OrderStatus, RecordingInterval
+from trading_lib.models import MarketDataPoint, Order, OrderStatus, RecordingInterval
 from trading_lib.portfolio import Portfolio
 from trading_lib.strategy import Strategy
 from trading_lib.exceptions import ExecutionError, OrderError
+from trading_lib.signals import HOLD, SignalBuffer
+from trading_lib.streaming_metrics import StreamingMetrics
+from trading_lib.history import ColumnarHistory
+from trading_lib.multires_history import MultiResolutionHistory
+from trading_lib.latency import LatencyHistogram
+
+# Stages timed by an instrumented engine
+LATENCY_STAGES = ("signal", "execution", "recording", "tick")
 
 
 class ExecutionEngine:
@@ -13,7 +22,7 @@ class ExecutionEngine:
 
     Processing flow:
     1. Iterate through MarketDataPoint objects in timestamp order
-    2. For each tick, invoke strategies to generate signals
+    2. For each tick, invoke strategies to emit signals into a reusable buffer
     3. Instantiate and validate Order objects from signals
     4. Execute orders by updating the portfolio
     """
@@ -23,23 +32,49 @@ class ExecutionEngine:
         strategy: Strategy, 
         portfolio: Portfolio, 
         failure_rate: float = 0.0, 
-        recording_interval: RecordingInterval = RecordingInterval.SECOND
+        recording_interval: RecordingInterval = RecordingInterval.SECOND,
+        keep_history: bool = True,
+        history_memory_budget: Optional[int] = None,
+        history_spill_dir: Optional[str] = None,
+        verbose: bool = True,
+        instrument: bool = False
     ):
         self.strategy = strategy
         self.portfolio = portfolio
         self.failure_rate = failure_rate  # Simulate 5% failure rate by default
         self.recording_interval = recording_interval
-        self.portfolio_history: List[Tuple[datetime, float, float]] = []
+        # Log every executed order; benchmarks turn this off to keep I/O out of timings
+        self.verbose = verbose
+        # (timestamp, cash, holdings) rows in typed columns; past the memory
+        # budget (bytes) older rows are spilled to a memory-mapped file
+        if recording_interval == RecordingInterval.MULTI_RESOLUTION:
+            self.portfolio_history = MultiResolutionHistory()
+        else:
+            self.portfolio_history = ColumnarHistory(history_memory_budget, history_spill_dir)
+        # Running metrics are always available; the full history is optional
+        # so long or live runs can be monitored in constant memory
+        self.keep_history = keep_history
+        self.metrics = StreamingMetrics()
         self.last_recorded_period: Optional[tuple] = None
         self.current_prices: dict[str, float] = {}
+        # Reused for every tick so signal emission does not allocate
+        self._signals = SignalBuffer()
+        # Per-stage latency histograms (ns). The timed step replaces `step` on
+        # this instance only, so an uninstrumented engine runs no timing code
+        self.latency: Optional[dict[str, LatencyHistogram]] = None
+        if instrument:
+            self.latency = {stage: LatencyHistogram() for stage in LATENCY_STAGES}
+            self.step = self._instrumented_step
 
     def record_portfolio_value(self, timestamp: datetime, cash: float, holdings: float):
-        self.portfolio_history.append((timestamp, cash, holdings))
+        self.metrics.update(timestamp, cash + holdings)
+        if self.keep_history:
+            self.portfolio_history.append((timestamp, cash, holdings))
     
     def _get_period(self, timestamp: datetime) -> tuple:
         """Extract period identifier from timestamp based on recording_interval."""
         match self.recording_interval:
-            case RecordingInterval.TICK:
+            case RecordingInterval.TICK | RecordingInterval.MULTI_RESOLUTION:
                 return (timestamp,)  # Every single tick
             case RecordingInterval.SECOND:
                 return (timestamp.year, timestamp.month, timestamp.day, timestamp.hour, timestamp.minute, timestamp.second)
@@ -56,35 +91,92 @@ class ExecutionEngine:
             case _:
                 raise ValueError(f"Unknown recording interval: {self.recording_interval}")
     
+    # The stages of a tick, shared by `step` and `_instrumented_step` so the
+    # timed path cannot drift from the plain one
+
+    def _emit_signals(self, tick: MarketDataPoint) -> SignalBuffer:
+        """Collect the strategy's signals for `tick` and update its symbol's price."""
+        signals = self._signals
+        signals.clear()
+        self.strategy.emit_signals(tick, signals)
+        self.current_prices[tick.symbol] = tick.price
+        return signals
+
+    def _execute_signals(self, signals: SignalBuffer):
+        for i in range(signals.count):
+            if signals.actions[i] != HOLD:
+                order = Order(
+                    signals.symbols[i],
+                    signals.quantities[i],
+                    signals.prices[i],
+                    status=OrderStatus.PENDING,
+                )
+                self.execute_order(order)
+
+    def _tick_failed(self, tick: MarketDataPoint, error: Exception):
+        print(f"Error processing tick {tick} with strategy {self.strategy}: {error}")
+
+    def _record_period(self, tick: MarketDataPoint) -> bool:
+        """Record the portfolio value if `tick` starts a new period; returns whether it did."""
+        current_period = self._get_period(tick.timestamp)
+        if self.last_recorded_period is None or current_period != self.last_recorded_period:
+            self.record_portfolio_value(tick.timestamp, self.portfolio.get_cash(), self.portfolio.get_holdings_value(self.current_prices))
+            self.last_recorded_period = current_period
+            return True
+        return False
+
     def process_tick(self, tick: MarketDataPoint):
         try:
-            signals = self.strategy.generate_signals(tick)
-            self.current_prices[tick.symbol] = tick.price
-            for symbol, quantity, price, action in signals:
-                if action != Action.HOLD:
-                    order = Order(
-                        symbol,
-                        quantity,
-                        price,
-                        status=OrderStatus.PENDING,
-                    )
-                    self.execute_order(order)
+            signals = self._emit_signals(tick)
+            if signals.count:
+                self._execute_signals(signals)
+        except Exception as e:
+            self._tick_failed(tick, e)
+
+    def step(self, tick: MarketDataPoint):
+        """Process a single tick and record the portfolio value if the period changed."""
+        self.process_tick(tick)
+        self._record_period(tick)
+
+    def _instrumented_step(self, tick: MarketDataPoint):
+        """`step` with signal generation, order execution and recording timed separately.
+
+        Execution is timed only on ticks that emit signals and recording only
+        on ticks that record a value, so their histograms describe those events.
+        """
+        latency = self.latency
+        start = perf_counter_ns()
+        executed = start
+        try:
+            signals = self._emit_signals(tick)
+            emitted = perf_counter_ns()
+            latency["signal"].record(emitted - start)
+            if signals.count:
+                self._execute_signals(signals)
+                executed = perf_counter_ns()
+                latency["execution"].record(executed - emitted)
+            else:
+                executed = emitted
         except Exception as e:
-            print(f"Error processing tick {tick} with strategy {self.strategy}: {e}")
+            self._tick_failed(tick, e)
+
+        recorded = self._record_period(tick)
+        end = perf_counter_ns()
+        if recorded:
+            latency["recording"].record(end - executed)
+        latency["tick"].record(end - start)
+
+    def get_latency_summary(self) -> dict:
+        """{stage: p50/p90/p99/p99.9/max summary in microseconds}, empty unless instrumented."""
+        if self.latency is None:
+            return {}
+        return {stage: histogram.summary() for stage, histogram in self.latency.items()}
 
     def process_ticks(self, ticks: Iterable[MarketDataPoint]):
     
         # use a generator to process ticks in order
         for tick in ticks:
-            self.process_tick(tick)
-            
-            # Determine current period
-            current_period = self._get_period(tick.timestamp)
-            
-            # Record portfolio value when period changes
-            if self.last_recorded_period is None or current_period != self.last_recorded_period:
-                self.record_portfolio_value(tick.timestamp, self.portfolio.get_cash(), self.portfolio.get_holdings_value(self.current_prices))
-                self.last_recorded_period = current_period
+            self.step(tick)
 
     def execute_order(self, order: Order):
         try:
@@ -104,26 +196,45 @@ class ExecutionEngine:
             # Execute order
             order.status = OrderStatus.COMPLETED
             self.portfolio.apply_order(order)
-            print(
-                f"Executed order: {order.symbol}, Quantity: {order.quantity}, Price: {order.price}, Status: {order.status}"
-            )
+            if self.verbose:
+                print(
+                    f"Executed order: {order.symbol}, Quantity: {order.quantity}, Price: {order.price}, Status: {order.status}"
+                )
 
         except ExecutionError as e:
             # Log execution failures but continue processing
-            print(e)
+            if self.verbose:
+                print(e)
             order.status = OrderStatus.FAILED
 
         except OrderError as e:
-            print(e)
+            if self.verbose:
+                print(e)
             order.status = OrderStatus.FAILED
 
     def get_portfolio_history(self):
+        """Lazy sequence view of the recorded (timestamp, cash, holdings) rows."""
         return self.portfolio_history
     
+    def get_metrics(self) -> dict:
+        """Performance metrics over the values recorded so far."""
+        return self.metrics.snapshot()
+
     def get_current_prices(self):
         return self.current_prices
     
     def record_final_state(self, final_timestamp: datetime):
         """Record the final portfolio state after all ticks are processed."""
         holdings_value = self.portfolio.get_holdings_value(self.current_prices)
-        self.record_portfolio_value(final_timestamp, self.portfolio.get_cash(), holdings_value)
\ No newline at end of file
+        self.record_portfolio_value(final_timestamp, self.portfolio.get_cash(), holdings_value)
+
+
+def process_ticks_lockstep(engines: List[ExecutionEngine], ticks: Iterable[MarketDataPoint]):
+    """Feed every tick to all engines before moving on to the next one.
+
+    Strategies sharing an IndicatorRegistry must be driven this way so each
+    indicator is updated exactly once per tick.
+    """
+    for tick in ticks:
+        for engine in engines:
+            engine.step(tick)
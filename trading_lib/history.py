@@ -0,0 +1,172 @@
+"""Compact portfolio history storage.
+
+`ColumnarHistory` records (timestamp, cash, holdings) rows in typed columns:
+int64 nanoseconds since the epoch and two float64 values, 24 bytes per row
+instead of ~150 for a tuple of Python objects. Rows beyond an optional
+in-memory budget are spilled in chunks to a memory-mapped file.
+"""
+
+import os
+import tempfile
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional, Tuple
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Bytes per recorded row: int64 timestamp + float64 cash + float64 holdings
+ROW_BYTES = 24
+
+
+def _to_ns(timestamp: datetime) -> int:
+    """Nanoseconds since the epoch; naive datetimes are taken as wall-clock UTC."""
+    epoch = _EPOCH if timestamp.tzinfo is None else _EPOCH_UTC
+    return (timestamp - epoch) // _ONE_MICROSECOND * 1000
+
+
+class ColumnarHistory(Sequence):
+    """Append-only (timestamp, cash, holdings) history in typed columns.
+
+    Behaves like the list of tuples it replaces: `append`, `len`, indexing,
+    slicing and iteration all work on (datetime, float, float) rows, which
+    are rebuilt lazily on access. `as_arrays()` returns the columns as NumPy
+    arrays without building any tuples.
+
+    With `memory_budget` (bytes) set, whole chunks of `chunk_size` rows are
+    appended to a spill file once the in-memory columns exceed the budget,
+    and read back through a memory map. Timestamps keep microsecond
+    precision; timezone-aware timestamps are returned in the timezone of the
+    first recorded row.
+    """
+
+    def __init__(self, memory_budget: Optional[int] = None, spill_dir: Optional[str] = None, chunk_size: int = 65536):
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        self.chunk_size = chunk_size
+        self._timestamps = array("q")
+        self._cash = array("d")
+        self._holdings = array("d")
+        self._tz = None
+        self._tz_known = False
+        self._spill_file = None
+        self._spilled = 0
+        self._spill_map = None
+
+    def append(self, row: Tuple[datetime, float, float]):
+        timestamp, cash, holdings = row
+        if not self._tz_known:
+            self._tz = timestamp.tzinfo
+            self._tz_known = True
+        self._timestamps.append(_to_ns(timestamp))
+        self._cash.append(cash)
+        self._holdings.append(holdings)
+        if self.memory_budget is not None and len(self._timestamps) * ROW_BYTES > self.memory_budget:
+            self._spill()
+
+    def _spill(self):
+        """Move whole chunks of the in-memory rows to the spill file."""
+        import numpy as np
+
+        count = len(self._timestamps) // self.chunk_size * self.chunk_size
+        if count == 0:
+            return
+        if self._spill_file is None:
+            if self.spill_dir is not None:
+                os.makedirs(self.spill_dir, exist_ok=True)
+            self._spill_file = tempfile.TemporaryFile(prefix="portfolio_history_", dir=self.spill_dir)
+
+        rows = np.empty((count, 3), dtype=np.float64)
+        rows[:, 0] = np.frombuffer(self._timestamps, dtype=np.int64, count=count).view(np.float64)
+        rows[:, 1] = np.frombuffer(self._cash, dtype=np.float64, count=count)
+        rows[:, 2] = np.frombuffer(self._holdings, dtype=np.float64, count=count)
+        self._spill_file.seek(0, os.SEEK_END)
+        self._spill_file.write(rows.tobytes())
+        self._spill_file.flush()
+        self._spilled += count
+        self._spill_map = None
+
+        del self._timestamps[:count]
+        del self._cash[:count]
+        del self._holdings[:count]
+
+    def _spilled_rows(self):
+        """(n, 3) float64 memory map of the spilled rows (column 0 holds int64 bits)."""
+        import numpy as np
+
+        if self._spill_map is None:
+            self._spill_map = np.memmap(self._spill_file, dtype=np.float64, mode="r", shape=(self._spilled, 3))
+        return self._spill_map
+
+    def _row(self, ns: int, cash: float, holdings: float) -> Tuple[datetime, float, float]:
+        if self._tz is None:
+            timestamp = _EPOCH + timedelta(microseconds=ns // 1000)
+        else:
+            timestamp = (_EPOCH_UTC + timedelta(microseconds=ns // 1000)).astimezone(self._tz)
+        return timestamp, cash, holdings
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._timestamps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        if index < self._spilled:
+            ns_bits, cash, holdings = self._spilled_rows()[index]
+            return self._row(int(ns_bits.view("int64")), float(cash), float(holdings))
+        index -= self._spilled
+        return self._row(self._timestamps[index], self._cash[index], self._holdings[index])
+
+    def __iter__(self) -> Iterator[Tuple[datetime, float, float]]:
+        if self._spilled:
+            spilled = self._spilled_rows()
+            for start in range(0, self._spilled, self.chunk_size):
+                chunk = spilled[start:start + self.chunk_size]
+                timestamps = chunk[:, 0].copy().view("int64").tolist()
+                for ns, cash, holdings in zip(timestamps, chunk[:, 1].tolist(), chunk[:, 2].tolist()):
+                    yield self._row(ns, cash, holdings)
+        for ns, cash, holdings in zip(self._timestamps, self._cash, self._holdings):
+            yield self._row(ns, cash, holdings)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ColumnarHistory, list, tuple)):
+            return len(self) == len(other) and all(a == tuple(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ColumnarHistory({len(self)} rows, {self._spilled} spilled)"
+
+    def as_arrays(self):
+        """(int64 ns timestamps, float64 cash, float64 holdings) NumPy arrays."""
+        import numpy as np
+
+        timestamps = np.frombuffer(self._timestamps, dtype=np.int64) if self._timestamps else np.empty(0, np.int64)
+        cash = np.frombuffer(self._cash, dtype=np.float64) if self._cash else np.empty(0)
+        holdings = np.frombuffer(self._holdings, dtype=np.float64) if self._holdings else np.empty(0)
+        if self._spilled:
+            spilled = self._spilled_rows()
+            timestamps = np.concatenate((spilled[:, 0].view(np.int64), timestamps))
+            cash = np.concatenate((spilled[:, 1], cash))
+            holdings = np.concatenate((spilled[:, 2], holdings))
+        else:
+            # copies, so later appends cannot resize memory the arrays still use
+            timestamps, cash, holdings = timestamps.copy(), cash.copy(), holdings.copy()
+        return timestamps, cash, holdings
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes held in memory by the columns (spilled rows excluded)."""
+        return len(self._timestamps) * ROW_BYTES
+
+    def close(self):
+        """Release the spill file; spilled rows are no longer readable afterwards."""
+        self._spill_map = None
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
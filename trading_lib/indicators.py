@@ -0,0 +1,257 @@
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from trading_lib.models import MarketDataPoint
+
+
+class RollingWindow:
+    """Fixed-size ring buffer of the most recent values with a running sum.
+
+    Memory is O(capacity) however many values are appended. The running sum is
+    recomputed exactly each time the buffer wraps around, which bounds the
+    floating-point drift at O(1) amortized cost per append.
+    """
+
+    __slots__ = ("capacity", "_values", "_head", "_count", "_sum")
+
+    def __init__(self, capacity: int):
+        assert capacity > 0
+        self.capacity = capacity
+        self._values = [0.0] * capacity
+        self._head = 0  # next slot to overwrite
+        self._count = 0
+        self._sum = 0.0
+
+    def append(self, value: float):
+        head = self._head
+        if self._count == self.capacity:
+            self._sum += value - self._values[head]
+        else:
+            self._sum += value
+            self._count += 1
+        self._values[head] = value
+        head += 1
+        if head == self.capacity:
+            head = 0
+            if self._count == self.capacity:
+                self._sum = sum(self._values)
+        self._head = head
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> float:
+        """Index from the oldest (0) or, with negative indexes, the newest (-1) value."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("RollingWindow index out of range")
+        return self._values[(self._head - self._count + index) % self.capacity]
+
+    @property
+    def full(self) -> bool:
+        return self._count == self.capacity
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+
+class SimpleMovingAverage:
+    """Incremental simple moving average over the last `window` prices."""
+
+    def __init__(self, window: int):
+        assert window > 0
+        self.window = window
+        self._prices = RollingWindow(window)
+
+    def update(self, price: float):
+        self._prices.append(price)
+
+    @property
+    def value(self) -> Optional[float]:
+        """Average of the last `window` prices, or None while warming up."""
+        if not self._prices.full:
+            return None
+        return self._prices.sum / self.window
+
+
+class ExponentialMovingAverage:
+    """Incremental EMA seeded with the first price, smoothing 2 / (window + 1)."""
+
+    def __init__(self, window: int):
+        assert window > 0
+        self.window = window
+        self._alpha = 2 / (window + 1)
+        self._ema = 0.0
+        self._count = 0
+
+    def update(self, price: float):
+        if self._count == 0:
+            self._ema = price
+        else:
+            self._ema = self._alpha * price + (1 - self._alpha) * self._ema
+        self._count += 1
+
+    @property
+    def value(self) -> Optional[float]:
+        """Current EMA, or None until `window` prices have been seen."""
+        if self._count < self.window:
+            return None
+        return self._ema
+
+
+class RelativeStrengthIndex:
+    """Incremental RSI using simple averages of the last `window` price changes."""
+
+    def __init__(self, window: int):
+        assert window > 0
+        self.window = window
+        self._changes: deque = deque(maxlen=window)
+        self._last_price: Optional[float] = None
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        # number of non-zero losses in the window, so an all-gain window gives
+        # an exact zero loss instead of accumulated rounding error
+        self._loss_count = 0
+
+    def update(self, price: float):
+        if self._last_price is not None:
+            if len(self._changes) == self.window:
+                self._remove(self._changes[0])
+            change = price - self._last_price
+            self._changes.append(change)
+            if change > 0:
+                self._gain_sum += change
+            elif change < 0:
+                self._loss_sum -= change
+                self._loss_count += 1
+        self._last_price = price
+
+    def _remove(self, change: float):
+        if change > 0:
+            self._gain_sum -= change
+        elif change < 0:
+            self._loss_sum += change
+            self._loss_count -= 1
+            if self._loss_count == 0:
+                self._loss_sum = 0.0
+
+    @property
+    def value(self) -> Optional[float]:
+        """RSI over the last `window` changes, or None while warming up."""
+        if len(self._changes) < self.window:
+            return None
+        if self._loss_count == 0:
+            return 100.0
+        rs = self._gain_sum / self._loss_sum
+        return 100 - (100 / (1 + rs))
+
+
+class RollingVolatility:
+    """Sample standard deviation of the last `window` simple returns."""
+
+    def __init__(self, window: int):
+        assert window > 1
+        self.window = window
+        self._returns: deque = deque(maxlen=window)
+        self._last_price: Optional[float] = None
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, price: float):
+        if self._last_price is not None:
+            ret = (price / self._last_price) - 1
+            if len(self._returns) == self.window:
+                # Welford update replacing the oldest return with the newest
+                old = self._returns[0]
+                old_mean = self._mean
+                self._mean += (ret - old) / self.window
+                self._m2 += (ret - old) * (ret - self._mean + old - old_mean)
+            else:
+                delta = ret - self._mean
+                self._mean += delta / (len(self._returns) + 1)
+                self._m2 += delta * (ret - self._mean)
+            self._returns.append(ret)
+        self._last_price = price
+
+    @property
+    def value(self) -> Optional[float]:
+        """Rolling volatility, or None until `window` returns have been seen."""
+        if len(self._returns) < self.window:
+            return None
+        return (max(self._m2, 0.0) / (self.window - 1)) ** 0.5
+
+
+INDICATORS = {
+    "sma": SimpleMovingAverage,
+    "ema": ExponentialMovingAverage,
+    "rsi": RelativeStrengthIndex,
+    "volatility": RollingVolatility,
+}
+
+
+class IndicatorRegistry:
+    """Computes each distinct (indicator, params, symbol) series once per tick.
+
+    Strategies call `update(tick)` before reading indicator values. The update
+    is a no-op when the tick was already applied, so several strategies can
+    share one registry and the work scales with the number of unique
+    indicators rather than the number of strategies.
+
+    A shared registry must only be used by strategies that see the same ticks
+    in lockstep (see `process_ticks_lockstep` in the engine module).
+    """
+
+    def __init__(self):
+        self._by_symbol: Dict[str, Dict[Tuple, object]] = {}
+        self._last_tick: Optional[MarketDataPoint] = None
+
+    def update(self, tick: MarketDataPoint):
+        if tick is self._last_tick:
+            return
+        self._last_tick = tick
+        indicators = self._by_symbol.get(tick.symbol)
+        if indicators:
+            for indicator in indicators.values():
+                indicator.update(tick.price)
+
+    def indicator(self, name: str, symbol: str, *params):
+        """The indicator object for (name, params, symbol), created on first request.
+
+        A newly created indicator is seeded with the current tick when it
+        belongs to `symbol`, so strategies that ask on every tick see the
+        same series no matter which of them asked first. Strategies may keep
+        the returned object and read its `value` after each `update(tick)`.
+        """
+        indicators = self._by_symbol.setdefault(symbol, {})
+        key = (name, *params)
+        indicator = indicators.get(key)
+        if indicator is None:
+            if name not in INDICATORS:
+                raise ValueError(f"Unknown indicator: {name}")
+            indicator = INDICATORS[name](*params)
+            indicators[key] = indicator
+            if self._last_tick is not None and self._last_tick.symbol == symbol:
+                indicator.update(self._last_tick.price)
+        return indicator
+
+    def get(self, name: str, symbol: str, *params) -> Optional[float]:
+        """Current value of an indicator, creating it on first request."""
+        return self.indicator(name, symbol, *params).value
+
+    def sma(self, symbol: str, window: int) -> Optional[float]:
+        return self.get("sma", symbol, window)
+
+    def ema(self, symbol: str, window: int) -> Optional[float]:
+        return self.get("ema", symbol, window)
+
+    def rsi(self, symbol: str, window: int) -> Optional[float]:
+        return self.get("rsi", symbol, window)
+
+    def volatility(self, symbol: str, window: int) -> Optional[float]:
+        return self.get("volatility", symbol, window)
+
+    def __len__(self) -> int:
+        """Number of distinct (indicator, params, symbol) series maintained."""
+        return sum(len(indicators) for indicators in self._by_symbol.values())
@@ -0,0 +1,95 @@
+"""Log-bucketed latency histograms.
+
+`LatencyHistogram` records integer durations (nanoseconds from
+`time.perf_counter_ns`) in HDR-style log-linear buckets: values below
+2 ** sub_bucket_bits are exact, and every power of two above is split into
+2 ** sub_bucket_bits equal buckets, so any recorded value is known to within
+1 / 2 ** sub_bucket_bits of itself (about 3% by default) in a few hundred
+counters, however many values are recorded.
+"""
+
+from typing import Dict
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """Constant-memory histogram of non-negative integer durations."""
+
+    __slots__ = ("sub_bucket_bits", "_sub_count", "counts", "count", "total", "min", "max")
+
+    def __init__(self, sub_bucket_bits: int = 5):
+        assert sub_bucket_bits >= 1
+        self.sub_bucket_bits = sub_bucket_bits
+        self._sub_count = 1 << sub_bucket_bits
+        self.counts = [0] * (2 * self._sub_count)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        if value < self._sub_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits - 1
+        # (value >> shift) lies in [sub_count, 2 * sub_count)
+        return shift * self._sub_count + (value >> shift)
+
+    def _upper_bound(self, index: int) -> int:
+        """Largest value that falls in bucket `index`."""
+        if index < self._sub_count:
+            return index
+        shift, top = divmod(index, self._sub_count)
+        return ((top + self._sub_count + 1) << (shift - 1)) - 1
+
+    def record(self, value: int):
+        if value < 0:
+            value = 0
+        index = self._index(value)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add the counts of `other` (same `sub_bucket_bits`) to this histogram."""
+        assert other.sub_bucket_bits == self.sub_bucket_bits
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p: float) -> int:
+        """Upper bound of the bucket holding the p-th percentile (never above the max)."""
+        if self.count == 0:
+            return 0
+        rank = max(1, int(-(-self.count * p // 100)))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self, scale: float = 1e-3) -> Dict[str, float]:
+        """count, mean, p50/p90/p99/p99.9 and max, multiplied by `scale` (ns -> us by default)."""
+        result = {"count": self.count, "mean": self.mean * scale}
+        for p in PERCENTILES:
+            result[f"p{p:g}"] = self.percentile(p) * scale
+        result["max"] = self.max * scale
+        return result
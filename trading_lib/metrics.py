@@ -0,0 +1,206 @@
+"""Vectorized performance metrics over equity series.
+
+Every function takes portfolio values as an array whose last axis is time, so
+a (n_runs, n_periods) array scores a whole parameter sweep in one call. Values
+are total portfolio values (cash + holdings, see `history_to_arrays`), the
+same values `trading_lib.reporting` scores, and the conventions follow it:
+per-period (not annualized) Sharpe
+unless `periods_per_year` is given, population stdev, and drawdowns as
+negative percentages. A return after a zero portfolio value is undefined and
+is left out of every statistic instead of producing inf/NaN.
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from trading_lib.models import RecordingInterval
+
+# Recorded periods per year, assuming 252 sessions of 6.5 hours
+PERIODS_PER_YEAR = {
+    RecordingInterval.SECOND: 252 * 6.5 * 3600,
+    RecordingInterval.MINUTE: 252 * 6.5 * 60,
+    RecordingInterval.HOURLY: 252 * 6.5,
+    RecordingInterval.DAILY: 252,
+    RecordingInterval.WEEKLY: 52,
+    RecordingInterval.MONTHLY: 12,
+}
+
+
+def history_to_arrays(portfolio_history: Sequence[Tuple]) -> Tuple[np.ndarray, np.ndarray]:
+    """Timestamps (datetime64[ns]) and total values from (timestamp, cash, holdings) rows.
+
+    Columnar histories (anything with `as_arrays()`) are converted without
+    building per-row tuples.
+    """
+    if hasattr(portfolio_history, "as_arrays"):
+        timestamps, cash, holdings = portfolio_history.as_arrays()
+        return timestamps.view("datetime64[ns]"), cash + holdings
+    if len(portfolio_history) == 0:
+        return np.array([], dtype="datetime64[ns]"), np.array([], dtype=np.float64)
+    timestamps, cash, holdings = zip(*portfolio_history)
+    values = np.asarray(cash, dtype=np.float64) + np.asarray(holdings, dtype=np.float64)
+    return np.array(timestamps, dtype="datetime64[ns]"), values
+
+
+def returns(values: np.ndarray) -> np.ndarray:
+    """Simple periodic returns along the last axis; NaN where the previous value is 0."""
+    values = np.asarray(values, dtype=np.float64)
+    prev = values[..., :-1]
+    out = np.full(prev.shape, np.nan)
+    np.divide(values[..., 1:] - prev, prev, out=out, where=prev != 0)
+    return out
+
+
+def _sharpe_from_returns(rets: np.ndarray, periods_per_year: Optional[float]) -> np.ndarray:
+    valid = ~np.isnan(rets)
+    count = valid.sum(axis=-1)
+    filled = np.where(valid, rets, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = filled.sum(axis=-1) / count
+        var = np.where(valid, (filled - mean[..., None]) ** 2, 0.0).sum(axis=-1) / count
+        std = np.sqrt(var)
+        sharpe = np.where(std > 0, mean / std, 0.0)
+    if periods_per_year:
+        sharpe = sharpe * np.sqrt(periods_per_year)
+    return sharpe
+
+
+def sharpe_ratio(values: np.ndarray, periods_per_year: Optional[float] = None) -> np.ndarray:
+    """Mean over population stdev of the periodic returns (0 when flat)."""
+    return _sharpe_from_returns(returns(values), periods_per_year)
+
+
+def _sortino_from_returns(rets: np.ndarray, periods_per_year: Optional[float]) -> np.ndarray:
+    valid = ~np.isnan(rets)
+    count = valid.sum(axis=-1)
+    filled = np.where(valid, rets, 0.0)
+    downside = np.minimum(filled, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = filled.sum(axis=-1) / count
+        downside_dev = np.sqrt((downside * downside).sum(axis=-1) / count)
+        sortino = np.where(downside_dev > 0, mean / downside_dev, 0.0)
+    if periods_per_year:
+        sortino = sortino * np.sqrt(periods_per_year)
+    return sortino
+
+
+def sortino_ratio(values: np.ndarray, periods_per_year: Optional[float] = None) -> np.ndarray:
+    """Mean return over downside deviation (target return 0; 0 with no losses)."""
+    return _sortino_from_returns(returns(values), periods_per_year)
+
+
+def drawdown_series(values: np.ndarray) -> np.ndarray:
+    """Percent below the running peak at each period (<= 0)."""
+    values = np.asarray(values, dtype=np.float64)
+    peak = np.maximum.accumulate(values, axis=-1)
+    out = np.zeros(values.shape)
+    np.divide((values - peak) * 100, peak, out=out, where=peak > 0)
+    return out
+
+
+def max_drawdown(values: np.ndarray) -> np.ndarray:
+    """Largest percent drop from a running peak (<= 0)."""
+    return drawdown_series(values).min(axis=-1, initial=0.0)
+
+
+def total_return(values: np.ndarray) -> np.ndarray:
+    """Percent change from the first to the last value (0 from a zero start)."""
+    values = np.asarray(values, dtype=np.float64)
+    first, last = values[..., 0], values[..., -1]
+    out = np.zeros(np.shape(first))
+    np.divide((last - first) * 100, first, out=out, where=first != 0)
+    return out
+
+
+def annualized_return(values: np.ndarray, periods_per_year: float) -> np.ndarray:
+    """Compound annual growth rate in percent."""
+    values = np.asarray(values, dtype=np.float64)
+    years = (values.shape[-1] - 1) / periods_per_year
+    growth = 1 + total_return(values) / 100
+    if years <= 0:
+        return np.zeros(np.shape(growth))
+    return (np.sign(growth) * np.abs(growth) ** (1 / years) - 1) * 100
+
+
+def calmar_ratio(values: np.ndarray, periods_per_year: float) -> np.ndarray:
+    """Annualized return over the magnitude of the max drawdown (0 with no drawdown)."""
+    cagr = annualized_return(values, periods_per_year)
+    mdd = np.abs(max_drawdown(values))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(mdd > 0, cagr / mdd, 0.0)
+
+
+def rolling_sharpe(values: np.ndarray, window: int, periods_per_year: Optional[float] = None) -> np.ndarray:
+    """Sharpe ratio of the last `window` returns, aligned with `values` (NaN while warming up).
+
+    Uses running sums of the returns and their squares, so the cost is
+    O(n) regardless of the window.
+    """
+    rets = returns(values)
+    valid = ~np.isnan(rets)
+    filled = np.where(valid, rets, 0.0)
+    zeros = np.zeros(filled.shape[:-1] + (1,))
+    s0 = np.concatenate((zeros, np.cumsum(valid, axis=-1)), axis=-1)
+    s1 = np.concatenate((zeros, np.cumsum(filled, axis=-1)), axis=-1)
+    s2 = np.concatenate((zeros, np.cumsum(filled * filled, axis=-1)), axis=-1)
+
+    out = np.full(np.shape(values), np.nan)
+    if rets.shape[-1] < window:
+        return out
+    count = s0[..., window:] - s0[..., :-window]
+    total = s1[..., window:] - s1[..., :-window]
+    total_sq = s2[..., window:] - s2[..., :-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        second = total_sq / count
+        var = second - mean * mean
+        # Differences of running sums carry rounding noise; treat it as a flat window
+        sharpe = np.where(var > 1e-10 * second, mean / np.sqrt(np.maximum(var, 0.0)), 0.0)
+        sharpe = np.where(count > 0, sharpe, np.nan)
+    if periods_per_year:
+        sharpe = sharpe * np.sqrt(periods_per_year)
+    out[..., window:] = sharpe
+    return out
+
+
+def period_returns(timestamps: np.ndarray, values: np.ndarray, period: str = "M") -> Tuple[np.ndarray, np.ndarray]:
+    """Percent return of each calendar period ("D", "W", "M" or "Y").
+
+    Each period is measured from the last value of the previous period (the
+    first value for the first period) to its own last value. Returns the
+    period start dates and the returns along the last axis of `values`.
+    """
+    periods = np.asarray(timestamps, dtype="datetime64[ns]").astype(f"datetime64[{period}]")
+    values = np.asarray(values, dtype=np.float64)
+    if len(periods) == 0:
+        return periods, values[..., :0]
+    ends = np.flatnonzero(np.append(periods[1:] != periods[:-1], True))
+    closes = values[..., ends]
+    opens = np.concatenate((values[..., :1], closes[..., :-1]), axis=-1)
+    out = np.full(closes.shape, np.nan)
+    np.divide((closes - opens) * 100, opens, out=out, where=opens != 0)
+    return periods[ends], out
+
+
+def compute_metrics(values: np.ndarray, periods_per_year: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """Full metric set, sharing the return and drawdown arrays between metrics."""
+    values = np.asarray(values, dtype=np.float64)
+    rets = returns(values)
+    drawdowns = drawdown_series(values)
+    metrics = {
+        "total_return": total_return(values),
+        "pnl": values[..., -1] - values[..., 0],
+        "sharpe_ratio": _sharpe_from_returns(rets, periods_per_year),
+        "sortino_ratio": _sortino_from_returns(rets, periods_per_year),
+        "max_drawdown": drawdowns.min(axis=-1, initial=0.0),
+        "final_value": values[..., -1],
+        "starting_value": values[..., 0],
+    }
+    if periods_per_year:
+        cagr = annualized_return(values, periods_per_year)
+        mdd = np.abs(metrics["max_drawdown"])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            metrics["annualized_return"] = cagr
+            metrics["calmar_ratio"] = np.where(mdd > 0, cagr / mdd, 0.0)
+    return metrics
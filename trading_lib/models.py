@@ -3,7 +3,7 @@ from datetime import datetime
 from enum import Enum
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MarketDataPoint:
     """Frozen dataclass representing a market data point."""
 
@@ -21,6 +21,8 @@ class OrderStatus(str, Enum):
 class Order:
     """Mutable class representing a trade order."""
 
+    __slots__ = ("symbol", "quantity", "price", "status")
+
     def __init__(self, symbol: str, quantity: int, price: float, status: OrderStatus):
         self.symbol = symbol
         self.quantity = quantity
@@ -44,3 +46,4 @@ class RecordingInterval(str, Enum):
     DAILY = "1d"            # Once per day
     WEEKLY = "1w"           # Once per week
     MONTHLY = "1mo"         # Once per month
+    MULTI_RESOLUTION = "multi"  # Every tick, in fixed memory: older ticks kept at coarser resolution
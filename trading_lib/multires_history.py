@@ -0,0 +1,143 @@
+"""Fixed-memory portfolio history at decreasing resolution with age.
+
+`MultiResolutionHistory` keeps the newest rows exactly and folds older ones
+into coarser segments, so memory stays constant however long the run is.
+Each segment keeps the rows that matter for drawdowns (its highest and
+lowest values and its own worst peak-to-trough pair), which keeps the max
+drawdown of the retained rows equal to that of the full history. Values
+are totals (cash + holdings), the values `trading_lib.reporting` scores, so
+a report's max drawdown is exact too; its Sharpe ratio, computed from the
+coarser retained rows, is only an approximation.
+"""
+
+from collections import deque
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+Row = Tuple[datetime, float, float]
+
+
+def _value(row: Row) -> float:
+    return row[1] + row[2]
+
+
+class _Segment:
+    """Summary of a run of consecutive rows.
+
+    `high` and `low` are the rows with the highest and lowest total value,
+    and (`dd_peak`, `dd_trough`) the pair with the largest drop from an
+    earlier row to a later one within the segment (`drawdown`, a fraction).
+    """
+
+    __slots__ = ("count", "high", "low", "dd_peak", "dd_trough", "drawdown")
+
+    def __init__(self, row: Row):
+        self.count = 1
+        self.high = self.low = self.dd_peak = self.dd_trough = row
+        self.drawdown = 0.0
+
+    @staticmethod
+    def merge(older: "_Segment", newer: "_Segment") -> "_Segment":
+        merged = _Segment.__new__(_Segment)
+        merged.count = older.count + newer.count
+        merged.high = newer.high if _value(newer.high) > _value(older.high) else older.high
+        merged.low = newer.low if _value(newer.low) < _value(older.low) else older.low
+
+        # The worst drop is within one half, or from the older high to the newer low
+        merged.dd_peak, merged.dd_trough, merged.drawdown = older.dd_peak, older.dd_trough, older.drawdown
+        if newer.drawdown > merged.drawdown:
+            merged.dd_peak, merged.dd_trough, merged.drawdown = newer.dd_peak, newer.dd_trough, newer.drawdown
+        peak = _value(older.high)
+        if peak > 0:
+            across = 1 - _value(newer.low) / peak
+            if across > merged.drawdown:
+                merged.dd_peak, merged.dd_trough, merged.drawdown = older.high, newer.low, across
+        return merged
+
+    def rows(self) -> List[Row]:
+        """The retained rows of the segment in time order."""
+        if self.count == 1:
+            return [self.high]
+        unique = {id(row): row for row in (self.high, self.low, self.dd_peak, self.dd_trough)}
+        return sorted(unique.values(), key=lambda row: row[0])
+
+
+class MultiResolutionHistory(Sequence):
+    """(timestamp, cash, holdings) history with a fixed memory budget.
+
+    Level 0 holds the newest `segments_per_level` rows exactly. When a level
+    overflows, its two oldest segments are merged into one segment of the
+    next level, so each level covers twice the time span per segment of the
+    one below. When the last of the `levels` levels overflows, its segments
+    are merged pairwise in place. At most `levels * segments_per_level`
+    segments are kept, each retaining up to four rows.
+
+    The sequence view yields the retained rows in time order, so it can be
+    used anywhere a list of history rows is expected. The max drawdown of
+    those rows equals that of every row ever appended; other statistics
+    (Sharpe ratio, returns between rows) become approximate once rows are
+    folded into coarser segments.
+    """
+
+    def __init__(self, segments_per_level: int = 1024, levels: int = 8):
+        assert segments_per_level >= 2 and levels >= 1
+        self.segments_per_level = segments_per_level
+        self._levels: List[deque] = [deque() for _ in range(levels)]
+        self.recorded = 0
+        self._rows: Optional[List[Row]] = None
+
+    def append(self, row: Row):
+        self._levels[0].append(_Segment(tuple(row)))
+        self.recorded += 1
+        self._rows = None
+        capacity = self.segments_per_level
+        for level, segments in enumerate(self._levels):
+            if len(segments) <= capacity:
+                break
+            if level + 1 < len(self._levels):
+                older = segments.popleft()
+                self._levels[level + 1].append(_Segment.merge(older, segments.popleft()))
+            else:
+                self._coarsen(segments)
+
+    @staticmethod
+    def _coarsen(segments: deque):
+        """Merge adjacent segment pairs in place, halving the level's resolution."""
+        items = list(segments)
+        segments.clear()
+        for i in range(0, len(items) - 1, 2):
+            segments.append(_Segment.merge(items[i], items[i + 1]))
+        if len(items) % 2:
+            segments.append(items[-1])
+
+    def _segments(self) -> Iterator[_Segment]:
+        """All segments, oldest first."""
+        for segments in reversed(self._levels):
+            yield from segments
+
+    def _retained_rows(self) -> List[Row]:
+        if self._rows is None:
+            self._rows = [row for segment in self._segments() for row in segment.rows()]
+        return self._rows
+
+    def __len__(self) -> int:
+        return len(self._retained_rows())
+
+    def __getitem__(self, index):
+        return self._retained_rows()[index]
+
+    def __iter__(self) -> Iterator[Row]:
+        return iter(self._retained_rows())
+
+    @property
+    def segment_count(self) -> int:
+        return sum(len(segments) for segments in self._levels)
+
+    @property
+    def max_drawdown(self) -> float:
+        """Max drawdown of the full history in percent (<= 0), like `calculate_max_drawdown`."""
+        combined = None
+        for segment in self._segments():
+            combined = segment if combined is None else _Segment.merge(combined, segment)
+        return -combined.drawdown * 100 if combined is not None else 0.0
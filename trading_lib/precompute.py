@@ -0,0 +1,220 @@
+"""Whole-series indicator precomputation for offline backtests.
+
+When every price is known up front, each indicator can be computed once per
+symbol over the full price array with NumPy. `PrecomputedIndicators` then
+serves the values by tick index behind the same interface as
+`IndicatorRegistry`, so strategies only do the comparison step per tick.
+"""
+
+import hashlib
+import math
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from trading_lib.models import MarketDataPoint
+
+
+def rolling_mean(prices: np.ndarray, window: int) -> np.ndarray:
+    """Mean of the last `window` prices at each index (NaN while warming up)."""
+    prices = np.asarray(prices, dtype=np.float64)
+    out = np.full(len(prices), np.nan)
+    if len(prices) < window:
+        return out
+    # Offsetting by the first price keeps the running sums small and precise
+    base = prices[0]
+    csum = np.concatenate(([0.0], np.cumsum(prices - base)))
+    out[window - 1:] = base + (csum[window:] - csum[:-window]) / window
+    return out
+
+
+def ema(prices: np.ndarray, window: int) -> np.ndarray:
+    """EMA seeded with the first price (NaN until `window` prices are seen).
+
+    The recursion ema[t] = a * x[t] + d * ema[t - 1] is evaluated block by
+    block in closed form, d^k * (d * ema[s - 1] + a * cumsum(x[s + i] * d^-i)),
+    with blocks short enough that d^-i stays far from overflow.
+    """
+    x = np.asarray(prices, dtype=np.float64)
+    n = len(x)
+    out = np.empty(n)
+    if n == 0:
+        return out
+    alpha = 2 / (window + 1)
+    decay = 1 - alpha
+    if decay == 0:
+        out[:] = x
+    else:
+        block = max(1, int(500 / -math.log2(decay)))
+        growth = decay ** -np.arange(block, dtype=np.float64)
+        shrink = decay ** np.arange(block, dtype=np.float64)
+        out[0] = x[0]
+        prev = x[0]
+        for start in range(1, n, block):
+            chunk = x[start:start + block]
+            k = len(chunk)
+            acc = decay * prev + alpha * np.cumsum(chunk * growth[:k])
+            out[start:start + k] = shrink[:k] * acc
+            prev = out[start + k - 1]
+    out[:window - 1] = np.nan
+    return out
+
+
+def rsi(prices: np.ndarray, window: int) -> np.ndarray:
+    """RSI from simple averages of the last `window` changes at each index."""
+    prices = np.asarray(prices, dtype=np.float64)
+    out = np.full(len(prices), np.nan)
+    if len(prices) < window + 1:
+        return out
+    changes = np.diff(prices)
+    gains = np.concatenate(([0.0], np.cumsum(np.where(changes > 0, changes, 0.0))))
+    losses = np.concatenate(([0.0], np.cumsum(np.where(changes < 0, -changes, 0.0))))
+    gain_sum = gains[window:] - gains[:-window]
+    loss_sum = losses[window:] - losses[:-window]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100 - (100 / (1 + gain_sum / loss_sum))
+    out[window:] = np.where(loss_sum == 0, 100.0, values)
+    return out
+
+
+def rolling_volatility(prices: np.ndarray, window: int) -> np.ndarray:
+    """Sample stdev of the last `window` simple returns at each index."""
+    prices = np.asarray(prices, dtype=np.float64)
+    out = np.full(len(prices), np.nan)
+    if len(prices) < window + 1:
+        return out
+    returns = prices[1:] / prices[:-1] - 1
+    # Shift by the mean return to limit cancellation in the sum of squares
+    returns = returns - returns.mean()
+    s1 = np.concatenate(([0.0], np.cumsum(returns)))
+    s2 = np.concatenate(([0.0], np.cumsum(returns * returns)))
+    win_sum = s1[window:] - s1[:-window]
+    win_sq = s2[window:] - s2[:-window]
+    var = (win_sq - win_sum * win_sum / window) / (window - 1)
+    out[window:] = np.sqrt(np.maximum(var, 0.0))
+    return out
+
+
+PRECOMPUTED_INDICATORS = {
+    "sma": rolling_mean,
+    "ema": ema,
+    "rsi": rsi,
+    "volatility": rolling_volatility,
+}
+
+
+class _Cursor:
+    """Index of the current tick within one symbol's price series."""
+
+    __slots__ = ("index",)
+
+    def __init__(self):
+        self.index = -1
+
+
+class _PrecomputedIndicator:
+    """Read-only view of one precomputed series at its symbol's current tick."""
+
+    __slots__ = ("_series", "_cursor")
+
+    def __init__(self, series: List[Optional[float]], cursor: _Cursor):
+        self._series = series
+        self._cursor = cursor
+
+    @property
+    def value(self) -> Optional[float]:
+        index = self._cursor.index
+        return self._series[index] if index >= 0 else None
+
+
+class PrecomputedIndicators:
+    """Registry-compatible indicator lookups backed by whole-series arrays.
+
+    Each (indicator, params, symbol) series is computed once over the symbol's
+    full price history on first request, optionally cached on disk under
+    `cache_dir` keyed by a hash of the prices and the parameters. `update(tick)`
+    only advances the symbol's tick index, so lookups are O(1).
+
+    `ticks` must be the exact sequence later fed to the strategies. Values
+    match the incremental indicators up to floating-point rounding, so a value
+    that lands exactly on a strategy threshold may resolve either way.
+    """
+
+    def __init__(self, ticks: Sequence[MarketDataPoint], cache_dir: Optional[str] = None):
+        prices: Dict[str, List[float]] = {}
+        for tick in ticks:
+            prices.setdefault(tick.symbol, []).append(tick.price)
+        self._prices = {sym: np.array(p, dtype=np.float64) for sym, p in prices.items()}
+        self._digests: Dict[str, str] = {}
+        self._series: Dict[Tuple, List[Optional[float]]] = {}
+        self._cursors: Dict[str, _Cursor] = {}
+        self._last_tick: Optional[MarketDataPoint] = None
+        self.cache_dir = cache_dir
+
+    def update(self, tick: MarketDataPoint):
+        if tick is self._last_tick:
+            return
+        self._last_tick = tick
+        cursor = self._cursors.get(tick.symbol)
+        if cursor is None:
+            cursor = self._cursors[tick.symbol] = _Cursor()
+        cursor.index += 1
+
+    def indicator(self, name: str, symbol: str, *params) -> "_PrecomputedIndicator":
+        key = (name, *params, symbol)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = self._compute(name, symbol, params)
+        cursor = self._cursors.get(symbol)
+        if cursor is None:
+            cursor = self._cursors[symbol] = _Cursor()
+        return _PrecomputedIndicator(series, cursor)
+
+    def get(self, name: str, symbol: str, *params) -> Optional[float]:
+        return self.indicator(name, symbol, *params).value
+
+    def sma(self, symbol: str, window: int) -> Optional[float]:
+        return self.get("sma", symbol, window)
+
+    def ema(self, symbol: str, window: int) -> Optional[float]:
+        return self.get("ema", symbol, window)
+
+    def rsi(self, symbol: str, window: int) -> Optional[float]:
+        return self.get("rsi", symbol, window)
+
+    def volatility(self, symbol: str, window: int) -> Optional[float]:
+        return self.get("volatility", symbol, window)
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def _compute(self, name: str, symbol: str, params: tuple) -> List[Optional[float]]:
+        if name not in PRECOMPUTED_INDICATORS:
+            raise ValueError(f"Unknown indicator: {name}")
+
+        cache_file = None
+        if self.cache_dir is not None:
+            cache_file = os.path.join(self.cache_dir, self._cache_name(name, symbol, params))
+        if cache_file is not None and os.path.exists(cache_file):
+            values = np.load(cache_file)
+        else:
+            values = PRECOMPUTED_INDICATORS[name](self._prices[symbol], *params)
+            if cache_file is not None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                np.save(cache_file, values)
+
+        # Python floats make per-tick lookups cheap; warm-up NaNs become None
+        series = values.tolist()
+        missing = np.isnan(values)
+        warmup = len(values) if missing.all() else int(np.argmax(~missing))
+        series[:warmup] = [None] * warmup
+        return series
+
+    def _cache_name(self, name: str, symbol: str, params: tuple) -> str:
+        digest = self._digests.get(symbol)
+        if digest is None:
+            digest = hashlib.sha1(self._prices[symbol].tobytes()).hexdigest()[:16]
+            self._digests[symbol] = digest
+        param_str = "_".join(str(p) for p in params)
+        return f"{digest}_{name}_{param_str}.npy"
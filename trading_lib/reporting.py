@@ -1,16 +1,24 @@
 from typing import List, Dict
+import hashlib
+import json
 import statistics
-import matplotlib.pyplot as plt
 import os
 
 from trading_lib.engine import ExecutionEngine
 from trading_lib.models import MarketDataPoint
 from trading_lib.portfolio import Portfolio
 
+# Per-directory index of the content hashes of generated reports
+REPORT_CACHE_FILE = ".report_cache.json"
+
+
+def _total_values(periodic_returns) -> List[float]:
+    """Total portfolio value (cash + holdings) of each (timestamp, cash, holdings) row."""
+    return [row[1] + row[2] for row in periodic_returns]
 
 def calculate_max_drawdown(periodic_returns) -> float:
-    """Calculate Sharpe ratio using periodic"""
-    values = [value[1] for value in periodic_returns]
+    """Calculate Max Drawdown of the total portfolio value"""
+    values = _total_values(periodic_returns)
     peak = values[0]
     max_dd = 0.0
 
@@ -24,8 +32,8 @@ def calculate_max_drawdown(periodic_returns) -> float:
     return max_dd
 
 def calculate_sharpe_ratio(periodic_returns) -> float:
-    """Calculate Max Drawdown using periodic returns"""
-    values = [value[1] for value in periodic_returns]
+    """Calculate Sharpe ratio using periodic returns of the total portfolio value"""
+    values = _total_values(periodic_returns)
     returns = [
         (values[i] - values[i - 1]) / values[i - 1]
         for i in range(1, len(values))
@@ -59,11 +67,60 @@ def calc_performance_metrics(portfolio: Portfolio, starting_cash: float, ticks:
         "starting_value": starting_cash
     }
 
-def equity_curve_plot(portfolio_history, file_name = "equity_curve.png"):
-    """Generate equity curve plot from portfolio history."""
-    portfolio_history_agg = [(date, cash + holdings) for date, cash, holdings in portfolio_history]
-    dates, values = zip(*portfolio_history_agg)
-    plt.figure(figsize=(10, 6))
+def load_pyplot():
+    """Import pyplot on first use, with the non-interactive Agg backend.
+
+    matplotlib is slow to import, so modules only load it when a chart is
+    actually rendered.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+def downsample_minmax(x, y, n_buckets: int):
+    """Shape-preserving downsampling to at most ~2 * n_buckets points.
+
+    The series is split into equal-size index buckets and only each bucket's
+    minimum and maximum (in time order) are kept, plus the first and last
+    points, so every spike that would be visible at one bucket per pixel
+    survives. Runs in O(n) with NumPy, without Python-level loops.
+    """
+    import numpy as np
+
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_buckets < 1 or n <= 2 * n_buckets:
+        return x, y
+
+    size = -(-n // n_buckets)
+    rows = -(-n // size)
+    # pad the last bucket with its final value so every bucket has `size` points
+    padded = np.concatenate((y, np.full(rows * size - n, y[-1])))
+    buckets = padded.reshape(rows, size)
+    base = np.arange(rows) * size
+    lows = np.minimum(base + buckets.argmin(axis=1), n - 1)
+    highs = np.minimum(base + buckets.argmax(axis=1), n - 1)
+
+    keep = np.empty(2 * rows + 2, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    keep[1:-1:2] = np.minimum(lows, highs)
+    keep[2:-1:2] = np.maximum(lows, highs)
+    keep = np.unique(keep)
+    return x[keep], y[keep]
+
+def equity_curve_points(portfolio_history, figsize = (10, 6), dpi = 300):
+    """Dates and total values to plot, reduced to the chart's pixel width."""
+    from trading_lib.metrics import history_to_arrays
+
+    dates, values = history_to_arrays(portfolio_history)
+    return downsample_minmax(dates, values, int(figsize[0] * dpi))
+
+def render_equity_curve(dates, values, file_name, figsize = (10, 6), dpi = 300):
+    """Render already prepared equity curve points to `file_name`."""
+    plt = load_pyplot()
+    plt.figure(figsize=figsize)
     plt.plot(dates, values, label='Portfolio Value', color='blue')
     plt.xlabel('Date')
     plt.ylabel('Portfolio Value ($)')
@@ -72,8 +129,18 @@ def equity_curve_plot(portfolio_history, file_name = "equity_curve.png"):
     plt.tight_layout()
     
     # Save BEFORE show, otherwise the figure will be cleared
-    plt.savefig(file_name, dpi=300, bbox_inches='tight')
+    plt.savefig(file_name, dpi=dpi, bbox_inches='tight')
     plt.close()
+    return file_name
+
+def equity_curve_plot(portfolio_history, file_name = "equity_curve.png", figsize = (10, 6), dpi = 300):
+    """Generate equity curve plot from portfolio history.
+
+    Histories longer than the chart is wide in pixels are reduced with
+    `downsample_minmax` first, which looks the same but renders much faster.
+    """
+    dates, values = equity_curve_points(portfolio_history, figsize, dpi)
+    render_equity_curve(dates, values, file_name, figsize, dpi)
 
     link = f"! [Equity Curve](Path{file_name}))"
     return link
@@ -95,12 +162,147 @@ def narrative_interpretation(metrics):
     return interpretation
 
 
-def generate_performance_report(metrics, portfolio_history, output_file="performance.md"):
-    """Generate a complete performance.md report with metrics, chart, and narrative."""
-    
-    # Generate equity curve plot
-    chart_filename = "equity_curve.png"
-    equity_curve_plot(portfolio_history, chart_filename)
+def confidence_table(metrics) -> str:
+    """Markdown table of bootstrap confidence intervals, if they were computed."""
+    intervals = metrics.get("confidence_intervals")
+    if not intervals:
+        return ""
+    return f"""
+## Bootstrap 95% Confidence Intervals
+
+Computed from block-bootstrap resamples of the total portfolio value returns.
+
+| Metric | Estimate | Low | High |
+|--------|----------|-----|------|
+| Sharpe Ratio | {intervals['sharpe_ratio'][0]:.4f} | {intervals['sharpe_ratio'][1]:.4f} | {intervals['sharpe_ratio'][2]:.4f} |
+| Total Return | {intervals['total_return'][0]:.2f}% | {intervals['total_return'][1]:.2f}% | {intervals['total_return'][2]:.2f}% |
+| Max Drawdown | {intervals['max_drawdown'][0]:.2f}% | {intervals['max_drawdown'][1]:.2f}% | {intervals['max_drawdown'][2]:.2f}% |
+"""
+
+
+def latency_table(summary: dict) -> str:
+    """Markdown table of per-stage latency percentiles from `ExecutionEngine.get_latency_summary`."""
+    lines = [
+        "| Stage | Count | Mean (us) | p50 (us) | p90 (us) | p99 (us) | p99.9 (us) | Max (us) |",
+        "|-------|-------|-----------|----------|----------|----------|------------|----------|",
+    ]
+    for stage, s in summary.items():
+        lines.append(
+            f"| {stage} | {s['count']} | {s['mean']:.2f} | {s['p50']:.2f} | {s['p90']:.2f} "
+            f"| {s['p99']:.2f} | {s['p99.9']:.2f} | {s['max']:.2f} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def chart_file_for(output_file: str) -> str:
+    """Per-report chart path, next to the report: X_performance.md -> X_equity_curve.png."""
+    stem = os.path.splitext(output_file)[0]
+    if stem.endswith("_performance"):
+        stem = stem[:-len("_performance")]
+    return stem + "_equity_curve.png"
+
+
+def report_digest(metrics, portfolio_history, charts=True) -> str:
+    """sha256 of everything a performance report and its chart are rendered from."""
+    from trading_lib.metrics import history_to_arrays
+
+    dates, values = history_to_arrays(portfolio_history)
+    digest = hashlib.sha256()
+    digest.update(json.dumps(metrics, sort_keys=True, default=str).encode())
+    digest.update(dates.view("int64").tobytes())
+    digest.update(values.tobytes())
+    digest.update(b"charts" if charts else b"no-charts")
+    return digest.hexdigest()
+
+
+def _cache_index_path(output_file: str) -> str:
+    return os.path.join(os.path.dirname(output_file), REPORT_CACHE_FILE)
+
+
+def _load_cache_index(index_path: str) -> dict:
+    try:
+        with open(index_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _is_cached(output_file: str, digest: str, charts: bool) -> bool:
+    if _load_cache_index(_cache_index_path(output_file)).get(os.path.basename(output_file)) != digest:
+        return False
+    return os.path.exists(output_file) and (not charts or os.path.exists(chart_file_for(output_file)))
+
+
+def _store_cache_digests(digests: dict):
+    """Record {output_file: digest} in each report directory's cache index."""
+    by_dir: Dict[str, dict] = {}
+    for output_file, digest in digests.items():
+        by_dir.setdefault(_cache_index_path(output_file), {})[os.path.basename(output_file)] = digest
+    for index_path, entries in by_dir.items():
+        index = _load_cache_index(index_path)
+        index.update(entries)
+        with open(index_path, "w") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+
+
+def generate_performance_report(metrics, portfolio_history, output_file="performance.md", charts=True):
+    """Generate a complete performance.md report with metrics, chart, and narrative.
+
+    The report is skipped when the same metrics and history were already
+    rendered to `output_file` (see `generate_performance_reports`).
+    """
+    generate_performance_reports([(metrics, portfolio_history, output_file)], charts=charts, workers=1)
+    return output_file
+
+
+def generate_performance_reports(reports, charts=True, workers=None):
+    """Generate reports for several (metrics, portfolio_history, output_file) triples.
+
+    Each report and its chart are keyed by a content hash of their inputs,
+    stored in a `.report_cache.json` index next to the reports, and skipped
+    when unchanged. Charts that do need rendering are drawn in a process
+    pool of `workers` processes (default: one per chart, up to the CPU
+    count); `workers=1` renders in this process.
+    """
+    pending = []
+    for metrics, portfolio_history, output_file in reports:
+        digest = report_digest(metrics, portfolio_history, charts)
+        if _is_cached(output_file, digest, charts):
+            print(f"Performance report unchanged: {output_file}")
+            continue
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        pending.append((metrics, portfolio_history, output_file, digest))
+
+    if charts and pending:
+        # Downsample here so workers only receive a few thousand points each
+        charts_to_render = [
+            (*equity_curve_points(history), chart_file_for(output_file))
+            for _, history, output_file, _ in pending
+        ]
+        if workers is None:
+            workers = min(len(charts_to_render), os.cpu_count() or 1)
+        if workers > 1 and len(charts_to_render) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(render_equity_curve, *zip(*charts_to_render)))
+        else:
+            for dates, values, chart_file in charts_to_render:
+                render_equity_curve(dates, values, chart_file)
+
+    for metrics, _, output_file, _ in pending:
+        chart_section = "Chart rendering was disabled for this run."
+        if charts:
+            chart_section = f"![Equity Curve]({os.path.basename(chart_file_for(output_file))})"
+        with open(output_file, "w") as f:
+            f.write(performance_report_markdown(metrics, chart_section))
+        print(f"Performance report generated: {output_file}")
+
+    _store_cache_digests({output_file: digest for _, _, output_file, digest in pending})
+
+
+def performance_report_markdown(metrics, chart_section: str) -> str:
+    """Markdown text of a performance report with metrics, chart, and narrative."""
     
     # Get narrative interpretation
     narrative = narrative_interpretation(metrics)
@@ -118,10 +320,10 @@ def generate_performance_report(metrics, portfolio_history, output_file="perform
 | P&L | ${metrics['pnl']:,.2f} |
 | Sharpe Ratio | {metrics['sharpe_ratio']:.2f} |
 | Max Drawdown | {metrics['max_drawdown']:.2f}% |
-
+{confidence_table(metrics)}
 ## Equity Curve
 
-![Equity Curve]({chart_filename})
+{chart_section}
 
 ## Performance Analysis
 
@@ -162,11 +364,4 @@ def generate_performance_report(metrics, portfolio_history, output_file="perform
         report += "- **Negative**: Strategy lost money. Requires significant adjustments.\n"
     
     report += "\n---\n*Report generated automatically from backtesting results*\n"
-    
-    # Write to file
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    with open(output_file, "w") as f:
-        f.write(report)
-    
-    print(f"Performance report generated: {output_file}")
-    return output_file
\ No newline at end of file
+    return report
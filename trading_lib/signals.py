@@ -0,0 +1,54 @@
+from trading_lib.models import Action
+
+# Integer action codes used on the allocation-free emission path
+HOLD = 0
+BUY = 1
+SELL = 2
+
+ACTIONS = (Action.HOLD, Action.BUY, Action.SELL)
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+
+class SignalBuffer:
+    """Reusable, engine-owned buffer that strategies write signals into.
+
+    Signals are stored in parallel slot lists that are overwritten rather than
+    reallocated, and actions are integer codes (HOLD, BUY, SELL), so a tick
+    that produces no signal allocates nothing.
+    """
+
+    __slots__ = ("symbols", "quantities", "prices", "actions", "count")
+
+    def __init__(self, capacity: int = 4):
+        self.symbols: list = [None] * capacity
+        self.quantities: list = [0] * capacity
+        self.prices: list = [0.0] * capacity
+        self.actions: list = [HOLD] * capacity
+        self.count = 0
+
+    def emit(self, symbol: str, quantity: int, price: float, action: int):
+        i = self.count
+        if i == len(self.symbols):
+            self.symbols.append(symbol)
+            self.quantities.append(quantity)
+            self.prices.append(price)
+            self.actions.append(action)
+        else:
+            self.symbols[i] = symbol
+            self.quantities[i] = quantity
+            self.prices[i] = price
+            self.actions[i] = action
+        self.count = i + 1
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def to_tuples(self) -> list[tuple]:
+        """Signals in the (symbol, quantity, price, Action) tuple form."""
+        return [
+            (self.symbols[i], self.quantities[i], self.prices[i], ACTIONS[self.actions[i]])
+            for i in range(self.count)
+        ]
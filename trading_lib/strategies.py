@@ -1,5 +1,20 @@
+from typing import Dict
+
 from trading_lib.strategy import Strategy
-from trading_lib.models import MarketDataPoint, Action
+from trading_lib.indicators import RollingWindow
+from trading_lib.models import MarketDataPoint
+from trading_lib.signals import BUY, SELL, HOLD, SignalBuffer
+
+
+class _CrossoverState:
+    """Per-symbol state: fixed-size price windows and the open position."""
+
+    __slots__ = ("short", "long", "position")
+
+    def __init__(self, short_window: int, long_window: int):
+        self.short = RollingWindow(short_window)
+        self.long = RollingWindow(long_window)
+        self.position = 0
 
 
 class MovingAverageCrossoverStrategy(Strategy):
@@ -7,6 +22,9 @@ class MovingAverageCrossoverStrategy(Strategy):
 
     Analyzes short-term and long-term moving averages to generate buy/sell signals.
     Buy when short MA crosses above long MA, sell when crosses below.
+
+    Prices are kept per symbol in ring buffers with running sums, so memory is
+    O(symbols x long_window) and each tick costs O(1).
     """
 
     def __init__(
@@ -16,31 +34,42 @@ class MovingAverageCrossoverStrategy(Strategy):
         assert short_window < long_window and short_window > 0 and long_window > 0
         self.short_window = short_window
         self.long_window = long_window
-        self.position = 0
-        self.max_position = quantity * max_position_multiplier  # Max shares we can hold
+        self.max_position = quantity * max_position_multiplier  # Max shares we can hold per symbol
+        self._state: Dict[str, _CrossoverState] = {}
 
-    def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
-        self._prices.append(tick.price)
-        if len(self._prices) < self.long_window:
-            return []
+    def emit_signals(self, tick: MarketDataPoint, signals: SignalBuffer):
+        state = self._state.get(tick.symbol)
+        if state is None:
+            state = self._state[tick.symbol] = _CrossoverState(self.short_window, self.long_window)
+        state.short.append(tick.price)
+        state.long.append(tick.price)
+        if not state.long.full:
+            return
 
-        short_ma = sum(self._prices[-self.short_window :]) / self.short_window
-        long_ma = sum(self._prices[-self.long_window :]) / self.long_window
-
-        signals = []
+        short_ma = state.short.sum / self.short_window
+        long_ma = state.long.sum / self.long_window
 
         # Buy when short MA > long MA and position below max
-        if short_ma > long_ma and self.position < self.max_position:
-            signals.append((tick.symbol, self.quantity, tick.price, Action.BUY))
-            self.position += self.quantity
+        if short_ma > long_ma and state.position < self.max_position:
+            signals.emit(tick.symbol, self.quantity, tick.price, BUY)
+            state.position += self.quantity
         # Sell when short MA < long MA and we have a position
-        elif short_ma < long_ma and self.position > 0:
-            signals.append((tick.symbol, -self.position, tick.price, Action.SELL))
-            self.position = 0
+        elif short_ma < long_ma and state.position > 0:
+            signals.emit(tick.symbol, -state.position, tick.price, SELL)
+            state.position = 0
         else:
-            signals.append((tick.symbol, 0, tick.price, Action.HOLD))
+            signals.emit(tick.symbol, 0, tick.price, HOLD)
+
 
-        return signals
+class _MomentumState:
+    """Per-symbol state: the lookback price window, hold countdown and position."""
+
+    __slots__ = ("prices", "hold", "position")
+
+    def __init__(self, lookback: int):
+        self.prices = RollingWindow(lookback)
+        self.hold = 0
+        self.position = 0
 
 
 class MomentumStrategy(Strategy):
@@ -54,35 +83,35 @@ class MomentumStrategy(Strategy):
         self.lookback = lookback
         self.holding_period = holding_period
         self.momentum_threshold = momentum_threshold  # 2% default threshold
-        self.hold = 0
-        self.position = 0  # Track current position
-        self.max_position = quantity * max_position_multiplier  # Max shares we can hold
-
-    def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
-        self._prices.append(tick.price)
-        if len(self._prices) < self.lookback:
-            return []
-
-        momentum = tick.price - self._prices[-self.lookback]
-        momentum_pct = momentum / self._prices[-self.lookback]  
-
-        if self.hold > 0:
-            self.hold -= 1
-            return []
-
-        signals = []
+        self.max_position = quantity * max_position_multiplier  # Max shares we can hold per symbol
+        self._state: Dict[str, _MomentumState] = {}
+
+    def emit_signals(self, tick: MarketDataPoint, signals: SignalBuffer):
+        state = self._state.get(tick.symbol)
+        if state is None:
+            state = self._state[tick.symbol] = _MomentumState(self.lookback)
+        state.prices.append(tick.price)
+        if not state.prices.full:
+            return
+
+        # Oldest price in the window is `lookback` ticks back, counting this one
+        lookback_price = state.prices[0]
+        momentum = tick.price - lookback_price
+        momentum_pct = momentum / lookback_price
+
+        if state.hold > 0:
+            state.hold -= 1
+            return
 
         # Buy on strong positive momentum if below max position
-        if momentum_pct > self.momentum_threshold and self.position < self.max_position:
-            signals.append((tick.symbol, self.quantity, tick.price, Action.BUY))
-            self.hold = self.holding_period
-            self.position += self.quantity
+        if momentum_pct > self.momentum_threshold and state.position < self.max_position:
+            signals.emit(tick.symbol, self.quantity, tick.price, BUY)
+            state.hold = self.holding_period
+            state.position += self.quantity
         # Sell on strong negative momentum if we have a position
-        elif momentum_pct < -self.momentum_threshold and self.position > 0:
-            signals.append((tick.symbol, -self.position, tick.price, Action.SELL))
-            self.hold = self.holding_period
-            self.position = 0
+        elif momentum_pct < -self.momentum_threshold and state.position > 0:
+            signals.emit(tick.symbol, -state.position, tick.price, SELL)
+            state.hold = self.holding_period
+            state.position = 0
         else:
-            signals.append((tick.symbol, 0, tick.price, Action.HOLD))
-
-        return signals
+            signals.emit(tick.symbol, 0, tick.price, HOLD)
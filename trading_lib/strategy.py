@@ -1,19 +1,39 @@
-from abc import ABC, abstractmethod
+from abc import ABC
 
+from trading_lib.indicators import IndicatorRegistry
 from trading_lib.models import MarketDataPoint
+from trading_lib.signals import ACTION_CODES, SignalBuffer
 
 class Strategy(ABC):
     """Base class for trading strategies.
 
-    Enforces a common interface for trading strategies by defining methods
-    that all subclasses must implement.
+    Enforces a common interface for trading strategies. Subclasses implement
+    either `generate_signals`, returning a list of
+    (symbol, quantity, price, Action) tuples, or the allocation-free
+    `emit_signals`, writing into an engine-owned SignalBuffer. Each one
+    defaults to an adapter around the other.
     """
 
     def __init__(self, quantity: int = 100):
         super().__init__()
         self._prices = [] 
         self.quantity = quantity 
+        self.indicators = IndicatorRegistry()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.generate_signals is Strategy.generate_signals and cls.emit_signals is Strategy.emit_signals:
+            raise TypeError(f"{cls.__name__} must implement generate_signals or emit_signals")
+
+    def bind_indicators(self, registry: IndicatorRegistry):
+        """Share an indicator registry with other strategies run in lockstep."""
+        self.indicators = registry
 
-    @abstractmethod
     def generate_signals(self, tick: MarketDataPoint) -> list[tuple]:
-        raise NotImplementedError("Subclasses must implement generate_signals method")
\ No newline at end of file
+        signals = SignalBuffer()
+        self.emit_signals(tick, signals)
+        return signals.to_tuples()
+
+    def emit_signals(self, tick: MarketDataPoint, signals: SignalBuffer):
+        for symbol, quantity, price, action in self.generate_signals(tick):
+            signals.emit(symbol, quantity, price, ACTION_CODES[action])
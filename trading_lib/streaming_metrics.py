@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+class StreamingMetrics:
+    """Online performance metrics over the recorded portfolio values.
+
+    Each `update` costs O(1) time and memory: returns go through Welford's
+    mean/variance recurrence, and the running peak gives the drawdown and time
+    under water. Values are total portfolio values (cash + holdings), the
+    same values `trading_lib.reporting` scores, and the Sharpe ratio and max
+    drawdown follow its conventions: population stdev, returns after a zero
+    value are skipped, and drawdowns are negative percentages.
+    """
+
+    __slots__ = (
+        "count", "first_value", "last_value", "peak", "max_drawdown",
+        "_returns", "_mean", "_m2",
+        "_peak_time", "_peak_index", "_last_time",
+        "max_periods_under_water", "max_time_under_water",
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.first_value: Optional[float] = None
+        self.last_value: Optional[float] = None
+        self.peak: Optional[float] = None
+        self.max_drawdown = 0.0
+        self._returns = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._peak_time: Optional[datetime] = None
+        self._peak_index = 0
+        self._last_time: Optional[datetime] = None
+        self.max_periods_under_water = 0
+        self.max_time_under_water = timedelta(0)
+
+    def update(self, timestamp: datetime, value: float):
+        """Add the portfolio value recorded at `timestamp`."""
+        last = self.last_value
+        if last is None:
+            self.first_value = value
+        elif last != 0:
+            ret = (value - last) / last
+            self._returns += 1
+            delta = ret - self._mean
+            self._mean += delta / self._returns
+            self._m2 += delta * (ret - self._mean)
+
+        if self.peak is None or value >= self.peak:
+            self.peak = value
+            self._peak_time = timestamp
+            self._peak_index = self.count
+        else:
+            drawdown = (value - self.peak) / self.peak * 100 if self.peak else 0.0
+            if drawdown < self.max_drawdown:
+                self.max_drawdown = drawdown
+            periods = self.count - self._peak_index
+            if periods > self.max_periods_under_water:
+                self.max_periods_under_water = periods
+            duration = timestamp - self._peak_time
+            if duration > self.max_time_under_water:
+                self.max_time_under_water = duration
+
+        self.last_value = value
+        self._last_time = timestamp
+        self.count += 1
+
+    @property
+    def mean_return(self) -> float:
+        return self._mean
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the periodic returns."""
+        return self._m2 / self._returns if self._returns else 0.0
+
+    @property
+    def sharpe_ratio(self) -> float:
+        stddev = self.variance ** 0.5
+        if stddev == 0:
+            return 0.0
+        return self._mean / stddev
+
+    @property
+    def total_return(self) -> float:
+        """Return since the first recorded value, in percent."""
+        if not self.first_value:
+            return 0.0
+        return (self.last_value - self.first_value) / self.first_value * 100
+
+    @property
+    def drawdown(self) -> float:
+        """Current drawdown from the running peak, in percent (<= 0)."""
+        if not self.peak:
+            return 0.0
+        return (self.last_value - self.peak) / self.peak * 100
+
+    @property
+    def periods_under_water(self) -> int:
+        """Recorded periods since the running peak was last reached."""
+        return self.count - 1 - self._peak_index if self.count else 0
+
+    @property
+    def time_under_water(self) -> timedelta:
+        """Time since the running peak was last reached."""
+        if self._last_time is None:
+            return timedelta(0)
+        return self._last_time - self._peak_time
+
+    def snapshot(self) -> dict:
+        """Current metrics as a dict, for logging or monitoring."""
+        return {
+            "periods": self.count,
+            "total_return": self.total_return,
+            "sharpe_ratio": self.sharpe_ratio,
+            "max_drawdown": self.max_drawdown,
+            "drawdown": self.drawdown,
+            "periods_under_water": self.periods_under_water,
+            "max_periods_under_water": self.max_periods_under_water,
+            "time_under_water": self.time_under_water,
+            "max_time_under_water": self.max_time_under_water,
+        }
@@ -0,0 +1,71 @@
+"""Columnar tick sequences.
+
+`TickSeries` holds ticks as three aligned NumPy columns (datetime64
+timestamps, integer symbol codes into a symbol dictionary, float64 prices)
+and builds `MarketDataPoint`s only when they are accessed, so converting a
+price DataFrame costs a few array copies instead of one Python object per
+row up front.
+"""
+
+from collections.abc import Sequence
+from typing import Iterator
+
+from trading_lib.models import MarketDataPoint
+
+
+class TickSeries(Sequence):
+    """Read-only sequence of MarketDataPoints backed by columns.
+
+    Behaves like the list of ticks it replaces: `len`, indexing, iteration
+    and comparison with a list work on MarketDataPoints, which are rebuilt
+    on access (in chunks of `chunk_size` when iterating). Slicing returns
+    another TickSeries over views of the same columns. Timestamps are naive
+    and keep microsecond precision.
+    """
+
+    def __init__(self, timestamps, codes, prices, symbols: Sequence, chunk_size: int = 65536):
+        import numpy as np
+
+        assert len(timestamps) == len(codes) == len(prices)
+        self.timestamps = np.asarray(timestamps, dtype="datetime64[us]")
+        self.codes = np.asarray(codes)
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.symbols = tuple(symbols)
+        self.chunk_size = chunk_size
+        self._names = np.array(self.symbols, dtype=object)
+
+    def _rows(self, start: int, stop: int) -> Iterator[MarketDataPoint]:
+        return map(
+            MarketDataPoint,
+            self.timestamps[start:stop].tolist(),
+            self._names[self.codes[start:stop]].tolist(),
+            self.prices[start:stop].tolist(),
+        )
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TickSeries(self.timestamps[index], self.codes[index], self.prices[index], self.symbols,
+                              self.chunk_size)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("tick index out of range")
+        return next(self._rows(index, index + 1))
+
+    def __iter__(self) -> Iterator[MarketDataPoint]:
+        for start in range(0, len(self), self.chunk_size):
+            yield from self._rows(start, start + self.chunk_size)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (TickSeries, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TickSeries({len(self)} ticks, {len(self.symbols)} symbols)"
+
+    def to_list(self) -> list:
+        return list(self)